@@ -0,0 +1,183 @@
+"""
+HTML fixture corpus for the benchmarks.
+
+Pages recorded with ``python -m benchmarks.record`` are read from
+``benchmarks/corpus/<kind>/``. Kinds with no recorded pages fall back to
+generated pages that follow the markup of the real sites (Wikipedia
+article chrome, bogotarealestate listing cards and detail blocks) at
+realistic sizes. Generation is seeded, so every run parses the same bytes.
+"""
+import os
+import random
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+KINDS = ("wiki", "listing", "detail")
+SEED = 20240601
+
+WORDS = (
+    "the of and in to a is was for on as by with from that at his an were which "
+    "are this also be has or had first one their its new after who they two her "
+    "she been other when time during there into school more may years over only "
+    "year most would world city some where between later three state such used "
+    "many national under known university while data web page content system "
+    "extraction server client request response structure information software"
+).split()
+
+DETAIL_FIELDS = (
+    ("País", lambda r: "Colombia"),
+    ("Departamento", lambda r: "Cundinamarca"),
+    ("Ciudad", lambda r: "Bogotá D.C."),
+    ("Localidad", lambda r: r.choice(["Chapinero", "Usaquén", "Suba", "Teusaquillo"])),
+    ("Zona / Barrio", lambda r: r.choice(["Chicó", "Rosales", "Cedritos", "Galerías"])),
+    ("Estado", lambda r: r.choice(["Usado", "Nuevo"])),
+    ("Área construida", lambda r: f"{r.randint(40, 400)} m²"),
+    ("Área terreno", lambda r: f"{r.randint(40, 600)} m²"),
+    ("Alcobas", lambda r: str(r.randint(1, 5))),
+    ("Baños", lambda r: str(r.randint(1, 5))),
+    ("Garajes", lambda r: str(r.randint(0, 3))),
+    ("Estrato", lambda r: str(r.randint(1, 6))),
+    ("Piso", lambda r: str(r.randint(1, 20))),
+    ("Año construcción", lambda r: str(r.randint(1970, 2024))),
+    ("Tipo de inmueble", lambda r: r.choice(["Apartamento", "Casa", "Oficina"])),
+    ("Valor administración", lambda r: f"$ {r.randint(100, 900)}.000"),
+)
+
+
+def _sentence(rng, words=18) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(words // 2, words)))
+    return text.capitalize() + "."
+
+
+def _paragraph(rng, sentences=6) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(2, sentences)))
+
+
+def _site_chrome(rng, links=150) -> str:
+    items = "".join(
+        f"<li><a href='/wiki/Topic_{rng.randint(1, 99999)}'>{_sentence(rng, 4)}</a></li>"
+        for _ in range(links)
+    )
+    return f"<div class='vector-menu'><ul>{items}</ul></div>"
+
+
+def wiki_page(index: int) -> str:
+    """A Wikipedia-like article of roughly 250-400 KB."""
+    rng = random.Random(SEED + index)
+    title = f"Article {index}"
+    infobox = "".join(
+        f"<tr><th>{_sentence(rng, 3)}</th><td>{_sentence(rng, 6)}</td></tr>"
+        for _ in range(25)
+    )
+    sections = []
+    for section in range(rng.randint(10, 16)):
+        paragraphs = "".join(
+            f"<p>{_paragraph(rng)}<sup class='reference'><a href='#cite_note-{section}'>"
+            f"[{section}]</a></sup></p>"
+            for _ in range(rng.randint(4, 9))
+        )
+        sections.append(
+            f"<div class='mw-heading'><h2 id='s{section}'>{_sentence(rng, 4)}</h2></div>"
+            f"{paragraphs}"
+        )
+    references = "".join(
+        f"<li id='cite_note-{i}'><cite>{_sentence(rng, 12)}</cite></li>"
+        for i in range(120)
+    )
+    navbox = "".join(
+        f"<td><a href='/wiki/Nav_{i}'>{_sentence(rng, 3)}</a></td>" for i in range(200)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>{title} - Wikipedia</title>"
+        f"<script>{'var x=1;' * 2000}</script></head><body>"
+        f"<header>{_site_chrome(rng)}</header>"
+        f"<main><h1 id='firstHeading' class='firstHeading'>{title}</h1>"
+        f"<div id='mw-content-text'><div class='mw-content-ltr mw-parser-output'>"
+        f"<table class='infobox'>{infobox}</table>{''.join(sections)}"
+        f"<ol class='references'>{references}</ol>"
+        f"<table class='navbox'><tr>{navbox}</tr></table></div></div></main>"
+        f"<footer>{_site_chrome(rng, 60)}</footer></body></html>"
+    )
+
+
+def listing_page(index: int, cards: int = 24) -> str:
+    """A search results page with ``cards`` property cards."""
+    rng = random.Random(SEED * 2 + index)
+    items = []
+    for card in range(cards):
+        listing = index * 1000 + card
+        kind = rng.choice(["apartamento", "casa"])
+        items.append(
+            f"<div class='property-item'>"
+            f"<div class='images'>{''.join(f'<img src=/img/{listing}_{i}.jpg>' for i in range(6))}</div>"
+            f"<a class='property-link' href='/{kind}/{listing}'>Ver inmueble</a>"
+            f"<h2 class='t8-ellipsis'>{kind.title()} en venta {_sentence(rng, 5)}</h2>"
+            f"<span class='price'>$ {rng.randint(100, 2000)}.{rng.randint(0, 999):03d}.000</span>"
+            f"<ul class='features'><li>{rng.randint(1, 5)} alcobas</li>"
+            f"<li>{rng.randint(1, 4)} baños</li><li>{rng.randint(40, 300)} m²</li></ul>"
+            f"<p>{_paragraph(rng, 3)}</p></div>"
+        )
+    return (
+        f"<!DOCTYPE html><html><head><title>Inmuebles en Bogotá</title>"
+        f"<script>{'var y=2;' * 3000}</script></head><body>"
+        f"<nav>{_site_chrome(rng, 80)}</nav>"
+        f"<section class='results'>{''.join(items)}</section>"
+        f"<footer>{_site_chrome(rng, 40)}</footer></body></html>"
+    )
+
+
+def detail_page(index: int) -> str:
+    """A property detail page with a characteristics list and description."""
+    rng = random.Random(SEED * 3 + index)
+    fields = "".join(
+        f"<dt>{label}:</dt><dd>{value(rng)}</dd>" for label, value in DETAIL_FIELDS
+    )
+    amenities = "".join(f"<li>{_sentence(rng, 3)}</li>" for _ in range(20))
+    similar = "".join(
+        f"<div class='card'><a href='/apartamento/{rng.randint(1, 99999)}'>"
+        f"{_sentence(rng, 5)}</a><span class='price'>$ {rng.randint(100, 900)}.000.000"
+        f"</span></div>"
+        for _ in range(12)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Inmueble {index}</title>"
+        f"<script>{'var z=3;' * 3000}</script></head><body>"
+        f"<nav>{_site_chrome(rng, 80)}</nav>"
+        f"<h1>Apartamento en venta {index}</h1>"
+        f"<div class='property-info'><dl>{fields}</dl></div>"
+        f"<div class='description'>{''.join(f'<p>{_paragraph(rng)}</p>' for _ in range(6))}</div>"
+        f"<ul class='amenities'>{amenities}</ul>"
+        f"<section class='similar'>{similar}</section>"
+        f"<footer>{_site_chrome(rng, 40)}</footer></body></html>"
+    )
+
+
+GENERATORS = {"wiki": wiki_page, "listing": listing_page, "detail": detail_page}
+
+
+def recorded_pages(kind: str) -> list:
+    """Return the recorded pages of ``kind``, sorted by file name."""
+    folder = os.path.join(CORPUS_DIR, kind)
+    if not os.path.isdir(folder):
+        return []
+    pages = []
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".html"):
+            with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                pages.append(f.read())
+    return pages
+
+
+def load_corpus(counts: dict = None) -> dict:
+    """
+    Return ``{kind: [html, ...]}``, using recorded pages where available
+    and ``counts[kind]`` generated pages otherwise.
+    """
+    counts = counts or {}
+    corpus = {}
+    for kind in KINDS:
+        pages = recorded_pages(kind)
+        if not pages:
+            pages = [GENERATORS[kind](i) for i in range(counts.get(kind, 10))]
+        corpus[kind] = pages
+    return corpus
@@ -0,0 +1,69 @@
+"""
+Record live pages into the benchmark corpus.
+
+    python -m benchmarks.record --wiki Web_scraping Python_(programming_language)
+    python -m benchmarks.record --listing-pages 3 --details 20
+
+Wikipedia articles are saved to ``benchmarks/corpus/wiki``; bogotarealestate
+search pages and the detail pages they link to are saved to ``listing`` and
+``detail``. Detail pages are fetched over plain HTTP, like the scraper's
+HTTP-first path, so they hold whatever the server renders without
+JavaScript.
+"""
+import argparse
+import os
+import sys
+
+from src.models.realestate_scraper import PropertyListScraper, build_page_url_from_template
+from src.models.transport import build_session, DEFAULT_TIMEOUT
+
+from benchmarks.corpus import CORPUS_DIR
+
+
+WIKI_BASE = "https://en.wikipedia.org/wiki/"
+SALES_SEARCH = (
+    "https://bogotarealestate.com.co/search"
+    "?business_type%5B0%5D=for_sale&order_by=created_at"
+)
+
+
+def save(kind: str, name: str, html: str):
+    folder = os.path.join(CORPUS_DIR, kind)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{name}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"Saved {path} ({len(html)} characters)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--wiki", nargs="*", default=[], help="article names")
+    parser.add_argument("--listing-pages", type=int, default=0)
+    parser.add_argument("--details", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    session = build_session()
+    for article in args.wiki:
+        response = session.get(WIKI_BASE + article, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        save("wiki", article.replace("/", "_"), response.text)
+
+    detail_urls = []
+    list_scraper = PropertyListScraper(None)
+    for page in range(1, args.listing_pages + 1):
+        url = build_page_url_from_template(SALES_SEARCH, page)
+        response = session.get(url, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        save("listing", f"page_{page:03d}", response.text)
+        detail_urls += [prop["URL"] for prop in list_scraper.parse_listing(response.text, url)]
+
+    for i, url in enumerate(detail_urls[:args.details]):
+        response = session.get(url, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        save("detail", f"detail_{i:03d}", response.text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+Offline throughput benchmarks for the scrapers.
+
+    python -m benchmarks.run                         # all scenarios
+    python -m benchmarks.run --latency 0.05 --workers 8 --output bench.json
+    python -m benchmarks.run --baseline bench.json   # exit 1 on regressions
+    python -m benchmarks.run --parse-workers 4       # parse in a process pool
+
+Each scenario fetches pages from a local StandInServer and parses them
+with the real scraper code, in its own process so peak RSS is per
+scenario. Reported per scenario: pages/sec, p50/p99 fetch latency, parse
+CPU time (thread CPU spent inside the parse calls) and peak RSS.
+
+With ``--parse-workers`` pages are parsed in a ParsePool; parse CPU is then
+the time spent in the worker processes, and peak RSS covers the parent only.
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from benchmarks.corpus import load_corpus
+from benchmarks.server import StandInServer
+from src.models.wiki_scraper import WikiScraper
+
+
+SCENARIOS = ("wiki", "listing", "detail")
+DEFAULT_PAGES = {"wiki": 40, "listing": 40, "detail": 200}
+CORPUS_COUNTS = {"wiki": 8, "listing": 40, "detail": 30}
+# Metric -> True when a higher value is better
+COMPARED_METRICS = {
+    "pages_per_sec": True,
+    "parse_cpu_ms_per_page": False,
+    "peak_rss_mb": False,
+}
+DEFAULT_TOLERANCE = 0.2
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+class Recorder:
+    """Collect fetch latencies and parse CPU time from worker threads."""
+
+    def __init__(self):
+        self.latencies = []
+        self.parse_cpu = 0.0
+        self._lock = threading.Lock()
+
+    def fetch(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latencies.append(elapsed)
+
+    def parse(self, parse, *args):
+        start = time.thread_time()
+        try:
+            return parse(*args)
+        finally:
+            elapsed = time.thread_time() - start
+            with self._lock:
+                self.parse_cpu += elapsed
+
+
+class RecordedWikiScraper(WikiScraper):
+    """
+    WikiScraper reporting to class-level recorders, so instances stay
+    picklable for a ParsePool (whose workers see no recorders).
+    """
+
+    fetch_recorder = None
+    parse_recorder = None
+
+    def fetch_html(self, endpoint):
+        return self.fetch_recorder.fetch(super().fetch_html, endpoint)
+
+    def parse(self, html):
+        if self.parse_recorder is None:
+            return super().parse(html)
+        return self.parse_recorder.parse(super().parse, html)
+
+
+def _run_wiki(base_url, pages, workers, parser, recorder, parse_workers=None):
+    RecordedWikiScraper.fetch_recorder = recorder
+    RecordedWikiScraper.parse_recorder = None if parse_workers else recorder
+    scraper = RecordedWikiScraper(
+        base_url=base_url,
+        endpoints=[f"/wiki/Article_{i}" for i in range(pages)],
+        max_workers=workers,
+        parser=parser,
+        parse_workers=parse_workers,
+    )
+    scraper.run()
+    return len(scraper.data)
+
+
+def _run_pages(urls, workers, parse_page, recorder, pool=None, method=None):
+    from src.models.transport import build_session
+
+    session = build_session(pool_maxsize=max(workers, 10))
+
+    def get(url):
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
+        return response.text
+
+    def scrape(url):
+        html = recorder.fetch(get, url)
+        if pool is not None:
+            # parse_page only builds the arguments; the pool does the parsing
+            return pool.call(method, *parse_page(html, url))
+        return recorder.parse(parse_page, html, url)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(1 for result in executor.map(scrape, urls) if result)
+
+
+def _run_parsed(parser_object, urls, workers, recorder, method, arguments, parse_workers):
+    """
+    Fetch ``urls`` and parse each with ``parser_object.<method>``, in a
+    ParsePool when ``parse_workers`` is set.
+    """
+    if not parse_workers:
+        parse = getattr(parser_object, method)
+        return _run_pages(
+            urls, workers, lambda html, url: parse(*arguments(html, url)), recorder
+        )
+    from src.models.parse_pool import ParsePool
+
+    with ParsePool(parser_object, parse_workers) as pool:
+        return _run_pages(urls, workers, arguments, recorder, pool, method)
+
+
+def _run_listing(base_url, pages, workers, parser, recorder, parse_workers=None):
+    from src.models.realestate_scraper import PropertyListScraper
+
+    list_scraper = PropertyListScraper(None, parser=parser)
+    urls = [f"{base_url}/search?page={i % CORPUS_COUNTS['listing'] + 1}" for i in range(pages)]
+    return _run_parsed(
+        list_scraper, urls, workers, recorder, "parse_listing",
+        lambda html, url: (html, url), parse_workers,
+    )
+
+
+def _run_detail(base_url, pages, workers, parser, recorder, parse_workers=None):
+    from src.models.realestate_scraper import PropertyDetailScraper
+
+    detail_scraper = PropertyDetailScraper(None, parser=parser)
+    urls = [f"{base_url}/apartamento/{i}" for i in range(pages)]
+    return _run_parsed(
+        detail_scraper, urls, workers, recorder, "parse_detail",
+        lambda html, url: (html, detail_scraper.empty_item(url, "", "")), parse_workers,
+    )
+
+
+def _pool_parse_seconds() -> float:
+    """Parse time reported back by ParsePool workers."""
+    from src.models.metrics import metrics
+
+    histograms = metrics.snapshot()["histograms"].get("parse_seconds", [])
+    return sum(entry["value"]["sum"] for entry in histograms)
+
+
+RUNNERS = {"wiki": _run_wiki, "listing": _run_listing, "detail": _run_detail}
+
+
+def run_scenario(name: str, base_url: str, pages: int, workers: int,
+                 parser: str = None, parse_workers: int = None) -> dict:
+    """Run one scenario in the current process and return its metrics."""
+    from src.models.metrics import metrics
+
+    recorder = Recorder()
+    metrics.reset()
+    start = time.perf_counter()
+    parsed = RUNNERS[name](base_url, pages, workers, parser, recorder, parse_workers)
+    wall = time.perf_counter() - start
+    if parse_workers:
+        recorder.parse_cpu = _pool_parse_seconds()
+    return {
+        "scenario": name,
+        "pages": pages,
+        "parsed": parsed,
+        "workers": workers,
+        "parse_workers": parse_workers or 0,
+        "wall_s": round(wall, 3),
+        "pages_per_sec": round(pages / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(recorder.latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(recorder.latencies, 99) * 1000, 2),
+        "parse_cpu_s": round(recorder.parse_cpu, 3),
+        "parse_cpu_ms_per_page": round(recorder.parse_cpu * 1000 / max(pages, 1), 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def _scenario_in_child(args):
+    import logging
+    logging.disable(logging.INFO)
+    return run_scenario(*args)
+
+
+def run_all(scenarios=SCENARIOS, pages: dict = None, workers: int = 4,
+            latency: float = 0.0, jitter: float = 0.0, parser: str = None,
+            isolate: bool = True, parse_workers: int = None) -> list:
+    """
+    Serve the corpus locally and run ``scenarios``, each in a fresh process
+    when ``isolate`` is set (so peak RSS is not shared between them).
+    """
+    pages = dict(DEFAULT_PAGES, **(pages or {}))
+    corpus = load_corpus(CORPUS_COUNTS)
+    results = []
+    with StandInServer(corpus, latency=latency, jitter=jitter) as server:
+        for name in scenarios:
+            args = (name, server.base_url, pages[name], workers, parser, parse_workers)
+            if isolate:
+                # Executor workers are not daemonic, so --parse-workers can
+                # start its own pool inside the scenario process
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(1, mp_context=context) as pool:
+                    results.append(pool.submit(_scenario_in_child, args).result())
+            else:
+                results.append(run_scenario(*args))
+    return results
+
+
+def compare(results: list, baseline: list, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """Return a message for every metric worse than ``baseline`` by more than ``tolerance``."""
+    previous = {result["scenario"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get(result["scenario"])
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(
+                    f"{result['scenario']}: {metric} {old} -> {new} ({change:+.0%})"
+                )
+    return regressions
+
+
+def format_table(results: list) -> str:
+    columns = ("scenario", "pages", "pages_per_sec", "p50_ms", "p99_ms",
+               "parse_cpu_s", "parse_cpu_ms_per_page", "peak_rss_mb")
+    rows = [columns] + [tuple(str(result[c]) for c in columns) for result in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    return "\n".join(
+        "  ".join(value.rjust(width) for value, width in zip(row, widths)) for row in rows
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks")
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append",
+                        help="run only this scenario (repeatable)")
+    parser.add_argument("--pages", type=int, help="pages per scenario")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="up to this many extra seconds per response")
+    parser.add_argument("--parser", help="HTML parser backend (html.parser, lxml)")
+    parser.add_argument("--parse-workers", type=int,
+                        help="parse in this many processes instead of the fetch threads")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="compare against a previous --output")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or SCENARIOS
+    pages = {name: args.pages for name in scenarios} if args.pages else None
+    results = run_all(scenarios, pages, args.workers, args.latency, args.jitter,
+                      args.parser, parse_workers=args.parse_workers)
+    print(format_table(results))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Local stand-in for the scraped sites, serving the benchmark corpus.
+
+Routes mirror the real ones so the scrapers run unchanged:
+
+- ``/wiki/<anything>``: wiki pages, chosen by a stable hash of the path
+- ``/search?page=N``: listing page N (an empty results page past the end)
+- anything else, e.g. ``/apartamento/<id>``: a detail page, chosen by hash
+
+Every response is delayed by ``latency`` seconds plus up to ``jitter``
+seconds of uniform noise, to stand in for a remote server.
+"""
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+EMPTY_LISTING = "<html><body><section class='results'></section></body></html>"
+REAL_SITE = "https://bogotarealestate.com.co"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _pick(self, pages: list, key: str) -> str:
+        return pages[zlib.crc32(key.encode("utf-8")) % len(pages)]
+
+    def _route(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/wiki/"):
+            return self._pick(server.corpus["wiki"], parts.path)
+        if parts.path == "/search":
+            page = int(parse_qs(parts.query).get("page", ["1"])[0])
+            listings = server.corpus["listing"]
+            if 1 <= page <= len(listings):
+                return listings[page - 1]
+            return EMPTY_LISTING
+        if parts.path == "/":
+            return None
+        return self._pick(server.corpus["detail"], parts.path)
+
+    def do_GET(self):
+        server = self.server
+        delay = server.latency + (server.rng.uniform(0, server.jitter) if server.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        html = self._route()
+        if html is None:
+            self.send_error(404)
+            return
+        # Recorded pages link to the real site; keep the scrapers local
+        body = html.replace(REAL_SITE, server.base_url).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer:
+    """
+    Threaded HTTP server for the corpus, used as a context manager::
+
+        with StandInServer(corpus, latency=0.05) as server:
+            WikiScraper(base_url=server.base_url, ...)
+    """
+
+    def __init__(self, corpus: dict, latency: float = 0.0, jitter: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), StandInHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.corpus = corpus
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self.httpd.rng = random.Random(0)
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+        self.httpd.base_url = self.base_url
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
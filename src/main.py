@@ -1,36 +1,212 @@
+"""
+Run a scraper from the interactive menu or as a batch job.
+
+    python -m src.main                                  # interactive menu
+    python -m src.main run wiki --urls urls.txt --output data/wiki --shard 0/4
+    python -m src.main merge --output data/wiki --shards 4
+    python -m src.main run realestate
+
+    python -m src.main enqueue --queue data/queue.sqlite --urls urls.txt
+    python -m src.main work wiki --queue data/queue.sqlite --output data/wiki
+    python -m src.main merge --output data/wiki
+
+Batch runs stream the URL file and keep only the lines whose canonical URL
+hashes to their shard, so N processes or machines started with shards
+0/N .. N-1/N split one crawl without coordinating. Each shard writes
+``<output>.shard-i-of-N.jsonl``; ``merge`` joins them into ``<output>.jsonl``.
+
+With a work queue, any number of ``work`` processes (on one host, sharing
+the SQLite file) lease URLs until the queue is drained; items of a worker
+that dies are leased again once their visibility timeout passes. Each
+worker writes ``<output>.worker-<id>.jsonl``; ``merge`` without
+``--shards`` joins those.
+"""
+import argparse
 import logging
-from src.models.wiki_scraper import WikiScraper
-from src.models.realestate_scraper import RealEstateScraper
+import os
+import sys
+from src.models.metrics import METRICS_PORT_ENV, start_metrics_server
+from src.models.registry import SCRAPERS, load_scraper
 
 
 def run_wiki_scraper():
     logging.info("Starting WikiScraper...")
-    scraper = WikiScraper()
+    WikiScraper = load_scraper("wiki")
+    scraper = WikiScraper(report_path=os.path.join("data", "wiki_run_report.json"))
     scraper.run()
     scraper.save_data("wiki_data.json", folder="data")
 
 
+def run_wiki_crawler():
+    logging.info("Starting WikiCrawler...")
+    WikiCrawler = load_scraper("wikicrawl")
+    scraper = WikiCrawler(
+        max_workers=4, report_path=os.path.join("data", "wiki_crawl_report.json")
+    )
+    scraper.run()
+    scraper.save_data("wiki_crawl.json", folder="data")
+
+
 def run_realestate_scraper():
     logging.info("Starting RealEstateScraper...")
-    scraper = RealEstateScraper()
-    scraper.run()
-    scraper.save_data()
+    RealEstateScraper = load_scraper("realestate")
+    # run() streams the CSV/JSONL/JSON outputs itself
+    RealEstateScraper().run()
 
 
-if __name__ == "__main__":
+RUNNERS = {
+    "wiki": run_wiki_scraper,
+    "wikicrawl": run_wiki_crawler,
+    "realestate": run_realestate_scraper,
+}
+
+
+def interactive():
+    names = list(SCRAPERS)
+    print("Select scraper to run:")
+    for number, name in enumerate(names, start=1):
+        print(f"{number}. {SCRAPERS[name].label}")
+    choice = input(f"Enter 1-{len(names)}: ").strip()
+
+    if choice.isdigit() and 1 <= int(choice) <= len(names):
+        RUNNERS[names[int(choice) - 1]]()
+    else:
+        print("Invalid choice.")
+
+
+def shard_arg(text: str) -> tuple:
+    from src.models.batch import parse_shard
+
+    try:
+        return parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.main", description="Run a scraper as a batch job"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="scrape a URL list (or one full crawl)")
+    run.add_argument("scraper", choices=list(SCRAPERS))
+    run.add_argument("--urls", help="file with one endpoint or URL per line (- for stdin)")
+    run.add_argument("--output", help="output prefix, e.g. data/wiki")
+    run.add_argument("--shard", type=shard_arg, default=(0, 1), metavar="i/N",
+                     help="only scrape the URLs whose hash falls in shard i of N")
+    run.add_argument("--workers", type=int, default=1)
+    run.add_argument("--append", action="store_true",
+                     help="add to an existing shard output instead of replacing it")
+
+    merge = commands.add_parser("merge", help="join the shard or worker outputs")
+    merge.add_argument("--output", required=True, help="output prefix used by run/work")
+    merge.add_argument("--shards", type=int, help="N in i/N (omit to merge queue workers)")
+    merge.add_argument("--allow-missing", action="store_true")
+
+    enqueue = commands.add_parser("enqueue", help="add a URL list to a work queue")
+    enqueue.add_argument("--queue", required=True, help="queue database file")
+    enqueue.add_argument("--urls", required=True, help="file with one endpoint or URL per line")
+    enqueue.add_argument("--name", default="default", help="queue name inside the file")
+
+    work = commands.add_parser("work", help="scrape URLs leased from a work queue")
+    work.add_argument("scraper", choices=[n for n, e in SCRAPERS.items() if e.shardable])
+    work.add_argument("--queue", required=True)
+    work.add_argument("--name", default="default")
+    work.add_argument("--output", required=True, help="output prefix, e.g. data/wiki")
+    work.add_argument("--workers", type=int, default=1, help="fetch threads")
+    work.add_argument("--visibility-timeout", type=float,
+                      help="seconds before an unacked item is leased again")
+    return parser
+
+
+def batch_run(parser, args) -> int:
+    entry = SCRAPERS[args.scraper]
+    if not entry.url_input:
+        if args.urls or args.shard != (0, 1):
+            parser.error(f"{args.scraper} crawls its own listings; --urls/--shard do not apply")
+        RUNNERS[args.scraper]()
+        return 0
+    if not args.urls or not args.output:
+        parser.error(f"{args.scraper} needs --urls and --output")
+    if not entry.shardable and args.shard != (0, 1):
+        parser.error(f"{args.scraper} follows links from its seeds; run it as one process")
+
+    from src.models.batch import run_batch
+
+    scraper = run_batch(
+        entry.load(), args.urls, args.output, args.shard, append=args.append,
+        max_workers=args.workers,
+    )
+    logging.info(f"Shard {args.shard[0]}/{args.shard[1]} wrote {scraper.sink.written} records")
+    return 0
+
+
+def batch_merge(parser, args) -> int:
+    from src.models.batch import merge_shards, merge_workers
+
+    try:
+        if args.shards:
+            result = merge_shards(args.output, args.shards, args.allow_missing)
+        else:
+            result = merge_workers(args.output)
+    except ValueError as e:
+        parser.error(str(e))
+    logging.info(f"Merged {result['records']} records into {result['path']}")
+    return 0
+
+
+def batch_enqueue(parser, args) -> int:
+    from src.models.batch import iter_targets
+    from src.models.work_queue import WorkQueue
+
+    with WorkQueue(args.queue, args.name) as queue:
+        added = queue.enqueue(iter_targets(args.urls))
+        logging.info(f"Enqueued {added} new items; queue now {queue.stats()}")
+    return 0
+
+
+def batch_work(parser, args) -> int:
+    from src.models.batch import run_queue_worker
+    from src.models.work_queue import WorkQueue, VISIBILITY_TIMEOUT
+
+    with WorkQueue(args.queue, args.name,
+                   visibility_timeout=args.visibility_timeout or VISIBILITY_TIMEOUT) as queue:
+        scraper = run_queue_worker(
+            load_scraper(args.scraper), queue, args.output, max_workers=args.workers
+        )
+        logging.info(
+            f"Worker {queue.worker_id} wrote {scraper.sink.written} records; "
+            f"queue now {queue.stats()}"
+        )
+    return 0
+
+
+COMMANDS = {
+    "run": batch_run, "merge": batch_merge, "enqueue": batch_enqueue, "work": batch_work,
+}
+
+
+def main(argv=None) -> int:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
     )
 
-    print("Select scraper to run:")
-    print("1. Wikipedia Scraper")
-    print("2. Real Estate Scraper (BogotaRealEstate)")
-    choice = input("Enter 1 or 2: ").strip()
-
-    if choice == "1":
-        run_wiki_scraper()
-    elif choice == "2":
-        run_realestate_scraper()
-    else:
-        print("Invalid choice.")
+    # Expose /metrics and /metrics.json while the crawl runs
+    if os.environ.get(METRICS_PORT_ENV):
+        start_metrics_server(int(os.environ[METRICS_PORT_ENV]))
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        interactive()
+        return 0
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return COMMANDS[args.command](parser, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import glob
+import hashlib
+import os
+import sys
+from urllib.parse import urljoin
+
+from src.models.sinks import AppendOnlyFile, BatchSink, JsonlWriter
+from src.models.urls import canonicalize_url
+
+
+BATCH_SIZE = 50  # Records per committed write to a shard's output
+MERGE_CHUNK = 1 << 20  # Bytes copied per commit while merging
+
+
+def parse_shard(text: str) -> tuple:
+    """Parse ``"i/N"`` into ``(i, N)`` with ``0 <= i < N``."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {text!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in 0..N-1, got {text!r}")
+    return index, count
+
+
+def shard_of(url: str, count: int) -> int:
+    """
+    Shard that owns ``url``: a hash of its canonical form modulo ``count``.
+
+    The hash is independent of the process (unlike ``hash()``), so every
+    worker on every machine agrees without talking to the others.
+    """
+    digest = hashlib.sha1(canonicalize_url(url).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def iter_targets(path: str, base_url: str = "", shard: tuple = (0, 1)):
+    """
+    Stream endpoints or URLs from ``path`` (``-`` reads stdin), one per
+    line, keeping those owned by ``shard``. Blank lines and ``#`` comments
+    are skipped.
+    """
+    index, count = shard
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in f:
+            target = line.strip()
+            if not target or target.startswith("#"):
+                continue
+            if count == 1 or shard_of(urljoin(base_url, target), count) == index:
+                yield target
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def shard_path(output: str, shard: tuple) -> str:
+    """Output file of one shard, e.g. ``data/wiki.shard-002-of-008.jsonl``."""
+    index, count = shard
+    if count == 1:
+        return output + ".jsonl"
+    return f"{output}.shard-{index:03d}-of-{count:03d}.jsonl"
+
+
+def worker_path(output: str, worker_id: str) -> str:
+    """Output file of one queue worker, e.g. ``data/wiki.worker-host-42.jsonl``."""
+    return f"{output}.worker-{worker_id}.jsonl"
+
+
+def _report_path(path: str) -> str:
+    return path[:-len(".jsonl")] + ".report.json"
+
+
+def run_batch(scraper_cls, source: str, output: str, shard: tuple = (0, 1),
+              append: bool = False, batch_size: int = BATCH_SIZE, **options):
+    """
+    Scrape this shard's share of the URL file ``source`` with
+    ``scraper_cls`` into its JSONL file.
+
+    The file is read lazily and results are streamed to disk as they are
+    parsed; a run report is written next to the output. Returns the scraper.
+    """
+    path = shard_path(output, shard)
+    sink = BatchSink([JsonlWriter(path, append=append)], batch_size=batch_size)
+    scraper = scraper_cls(
+        sink=sink, report_path=_report_path(path), **options
+    )
+    # Relative endpoints are hashed against the scraper's own base URL
+    scraper.endpoints = iter_targets(source, scraper.base_url, shard)
+    scraper.run()
+    return scraper
+
+
+def merge_shards(output: str, count: int, allow_missing: bool = False) -> dict:
+    """
+    Concatenate the ``count`` shard files of ``output`` into
+    ``<output>.jsonl``, in shard order. Raises ValueError if a shard has no
+    output yet, unless ``allow_missing`` is set.
+    """
+    parts = [shard_path(output, (index, count)) for index in range(count)]
+    missing = [part for part in parts if not os.path.exists(part)]
+    if missing and not allow_missing:
+        raise ValueError(f"Missing shard outputs: {', '.join(missing)}")
+
+    result = merge_files([part for part in parts if part not in missing], output)
+    result.update(shards=count - len(missing), missing=missing)
+    return result
+
+
+def run_queue_worker(scraper_cls, queue, output: str,
+                     batch_size: int = BATCH_SIZE, **options):
+    """
+    Scrape endpoints leased from ``queue`` (a WorkQueue) with
+    ``scraper_cls`` into this worker's JSONL file. Returns the scraper.
+    """
+    path = worker_path(output, queue.worker_id)
+    sink = BatchSink([JsonlWriter(path)], batch_size=batch_size)
+    scraper = scraper_cls(sink=sink, report_path=_report_path(path), **options)
+    scraper.run_queue(queue)
+    return scraper
+
+
+def merge_workers(output: str) -> dict:
+    """Concatenate every ``<output>.worker-*.jsonl`` file into ``<output>.jsonl``."""
+    parts = sorted(glob.glob(glob.escape(output) + ".worker-*.jsonl"))
+    if not parts:
+        raise ValueError(f"No worker outputs found for {output}")
+    result = merge_files(parts, output)
+    result["workers"] = len(parts)
+    return result
+
+
+def merge_files(parts: list, output: str) -> dict:
+    """
+    Concatenate the JSONL files ``parts`` into ``<output>.jsonl``.
+
+    The merge is written next to the target and moved over it at the end,
+    so a part may be the target itself (a single shard run).
+    """
+    path = output + ".jsonl"
+    merged = AppendOnlyFile(path + ".merging", append=False)
+    records = 0
+    for part in parts:
+        # Opening through AppendOnlyFile drops a batch torn by a crash
+        AppendOnlyFile(part, append=True)
+        with open(part, "rb") as f:
+            while True:
+                chunk = f.read(MERGE_CHUNK)
+                if not chunk:
+                    break
+                records += chunk.count(b"\n")
+                merged.append(chunk)
+    # Sidecar first: a commit offset past the end of the file is harmless
+    os.replace(merged.commit_path, path + ".commit")
+    os.replace(merged.path, path)
+    return {"path": path, "records": records}
@@ -0,0 +1,311 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from src.models.metrics import metrics
+
+
+# Request URL patterns (CDP wildcard syntax) blocked by resource kind
+IMAGE_PATTERNS = (
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.svg*",
+    "*.ico*", "*.bmp*",
+)
+FONT_PATTERNS = ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*")
+MEDIA_PATTERNS = ("*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*", "*.ogg*", "*.wav*")
+STYLESHEET_PATTERNS = ("*.css*",)
+TRACKER_PATTERNS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*facebook.com/tr*",
+    "*hotjar.com*", "*clarity.ms*", "*tiktok.com*", "*analytics.*",
+    "*adservice.*", "*criteo.*", "*taboola.*", "*outbrain.*",
+)
+# With measure=True, every n-th page loads unblocked so the run report can
+# show the savings
+SAVINGS_SAMPLE_EVERY = 50
+PAGE_BYTES_BUCKETS = tuple(2 ** power * 1024 for power in range(4, 16))  # 16 KB - 32 MB
+DRIVER_CACHE_PATH = os.path.join(".cache", "chromedriver.json")
+DRIVER_CACHE_TTL = 7 * 24 * 60 * 60  # Look for a new chromedriver once a week
+RECYCLE_AFTER_PAGES = 500  # Restart the browser after this many pages
+RECYCLE_RSS_MB = 1500  # ... or once Chrome's processes use this much memory
+RSS_CHECK_EVERY = 25  # Pages between memory checks
+
+_driver_paths = {}
+_driver_lock = threading.Lock()
+
+
+class ScrapeProfile:
+    """
+    How WebDriverController starts Chrome.
+
+    The default profile is built for scraping DOM text: headless, ``eager``
+    page loads (DOMContentLoaded, without waiting for subresources) and
+    images, fonts, media and known trackers blocked through CDP
+    ``Network.setBlockedURLs``. Blocking is done by URL pattern only, so it
+    can be lifted for the occasional baseline page when ``measure`` is set.
+    ``ScrapeProfile.full()`` restores a visible browser that loads
+    everything.
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        page_load_strategy: str = "eager",
+        block_images: bool = True,
+        block_fonts: bool = True,
+        block_media: bool = True,
+        block_stylesheets: bool = False,
+        blocked_url_patterns=TRACKER_PATTERNS,
+        window_size: str = "1366,900",
+        measure: bool = False,
+        sample_every: int = SAVINGS_SAMPLE_EVERY,
+        recycle_after_pages: int = RECYCLE_AFTER_PAGES,
+        recycle_rss_mb: float = RECYCLE_RSS_MB,
+    ):
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.block_images = block_images
+        self.block_fonts = block_fonts
+        self.block_media = block_media
+        self.block_stylesheets = block_stylesheets
+        self.blocked_url_patterns = tuple(blocked_url_patterns or ())
+        self.window_size = window_size
+        # Opt-in: record per-page bytes from Chrome's performance log and load
+        # every sample_every-th page unblocked as a baseline
+        self.measure = measure
+        self.sample_every = sample_every
+        # Restart long-lived browsers before they slow down (None disables)
+        self.recycle_after_pages = recycle_after_pages
+        self.recycle_rss_mb = recycle_rss_mb
+
+    @classmethod
+    def full(cls) -> "ScrapeProfile":
+        """The previous behaviour: a maximized window that loads every resource."""
+        return cls(
+            headless=False, page_load_strategy="normal", block_images=False,
+            block_fonts=False, block_media=False, blocked_url_patterns=(),
+            window_size=None, measure=False,
+        )
+
+    def blocked_patterns(self) -> list:
+        patterns = list(self.blocked_url_patterns)
+        for enabled, kind in (
+            (self.block_images, IMAGE_PATTERNS),
+            (self.block_fonts, FONT_PATTERNS),
+            (self.block_media, MEDIA_PATTERNS),
+            (self.block_stylesheets, STYLESHEET_PATTERNS),
+        ):
+            if enabled:
+                patterns.extend(kind)
+        return patterns
+
+    def chrome_arguments(self) -> list:
+        arguments = [
+            "--disable-blink-features=AutomationControlled",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+        ]
+        if self.headless:
+            arguments.append("--headless=new")
+        if self.window_size:
+            arguments.append(f"--window-size={self.window_size}")
+        else:
+            arguments.append("--start-maximized")
+        return arguments
+
+    def chrome_options(self):
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        for argument in self.chrome_arguments():
+            options.add_argument(argument)
+        options.page_load_strategy = self.page_load_strategy
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        if self.measure:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return options
+
+
+class PageWeightMeter:
+    """
+    Apply a profile's URL blocklist to a driver and measure every page.
+
+    Bytes come from ``Network.loadingFinished`` events in Chrome's
+    performance log, blocked requests from ``Network.loadingFailed``. Every
+    ``sample_every``-th page is loaded with the blocklist lifted, giving the
+    baseline that ``page_weight_savings()`` compares against.
+    """
+
+    def __init__(self, driver, profile: ScrapeProfile):
+        self.driver = driver
+        self.profile = profile
+        self.patterns = profile.blocked_patterns()
+        self.pages = 0
+        self._baseline = False
+        self._started = None
+        self._cdp("Network.enable", {})
+        self._block(True)
+
+    def _cdp(self, command: str, params: dict):
+        try:
+            self.driver.execute_cdp_cmd(command, params)
+        except Exception as e:
+            logging.debug(f"CDP {command} failed: {e}")
+
+    def _block(self, enabled: bool):
+        if self.patterns:
+            self._cdp(
+                "Network.setBlockedURLs", {"urls": self.patterns if enabled else []}
+            )
+
+    def before_page(self):
+        self.pages += 1
+        every = self.profile.sample_every
+        self._baseline = bool(
+            self.patterns and self.profile.measure and every
+            and self.pages % every == 0
+        )
+        if self._baseline:
+            self._block(False)
+        self._drain()
+        self._started = time.perf_counter()
+
+    def _drain(self) -> list:
+        if not self.profile.measure:
+            return []
+        try:
+            return self.driver.get_log("performance")
+        except Exception as e:
+            logging.debug(f"Performance log unavailable: {e}")
+            return []
+
+    def after_page(self):
+        elapsed = time.perf_counter() - (self._started or time.perf_counter())
+        mode = "baseline" if self._baseline else "profiled"
+        total_bytes = 0
+        blocked = 0
+        for entry in self._drain():
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            params = message.get("params", {})
+            if message.get("method") == "Network.loadingFinished":
+                total_bytes += params.get("encodedDataLength") or 0
+            elif (message.get("method") == "Network.loadingFailed"
+                  and params.get("blockedReason")):
+                blocked += 1
+
+        if self.profile.measure:
+            metrics.observe(
+                "page_bytes", total_bytes, buckets=PAGE_BYTES_BUCKETS, mode=mode
+            )
+            metrics.observe("page_seconds", elapsed, mode=mode)
+            metrics.inc("requests_blocked_total", blocked)
+        if self._baseline:
+            self._block(True)
+            self._baseline = False
+
+
+def resolve_chromedriver(cache_path: str = DRIVER_CACHE_PATH,
+                         ttl: float = DRIVER_CACHE_TTL, install=None) -> str:
+    """
+    Return the chromedriver path, asking webdriver-manager only when the
+    path cached in ``cache_path`` is missing, older than ``ttl`` or gone.
+
+    The result is also kept in memory, so browsers started later in the
+    same process (pool workers, recycled browsers) skip the file as well.
+    """
+    with _driver_lock:
+        path = _driver_paths.get(cache_path)
+        if path and os.path.exists(path):
+            return path
+
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if (time.time() - cached["resolved_at"] < ttl
+                    and os.path.exists(cached["path"])):
+                _driver_paths[cache_path] = cached["path"]
+                return cached["path"]
+        except (IOError, ValueError, KeyError, TypeError):
+            pass
+
+        if install is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            install = lambda: ChromeDriverManager().install()
+        path = install()
+
+        folder = os.path.dirname(cache_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"path": path, "resolved_at": time.time()}, f)
+        os.replace(tmp_path, cache_path)
+        _driver_paths[cache_path] = path
+        return path
+
+
+def process_tree_rss_mb(root_pid: int):
+    """
+    Resident memory of ``root_pid`` and all its descendants in MB, read
+    from ``/proc`` (None where that is unavailable).
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as f:
+                # The command name may contain spaces; fields follow the ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (IOError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    total_kb = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except (IOError, ValueError):
+            continue
+    return total_kb / 1024.0
+
+
+def page_weight_savings(registry=metrics):
+    """
+    Average bytes and seconds saved per page by the profile, from pages
+    measured with and without the blocklist (None until both exist).
+    """
+    summary = {}
+    for mode in ("profiled", "baseline"):
+        page_bytes = registry.histogram("page_bytes", mode=mode)
+        page_seconds = registry.histogram("page_seconds", mode=mode)
+        if not page_bytes or not page_bytes.count:
+            return None
+        summary[mode] = {
+            "pages": page_bytes.count,
+            "mean_bytes": page_bytes.sum / page_bytes.count,
+            "mean_seconds": page_seconds.sum / page_seconds.count,
+        }
+    baseline, profiled = summary["baseline"], summary["profiled"]
+    summary["bytes_saved_per_page"] = round(
+        baseline["mean_bytes"] - profiled["mean_bytes"]
+    )
+    summary["seconds_saved_per_page"] = round(
+        baseline["mean_seconds"] - profiled["mean_seconds"], 3
+    )
+    return summary
@@ -0,0 +1,210 @@
+import json
+import os
+import sqlite3
+import time
+
+from src.models.urls import canonicalize_url
+
+
+class CrawlStateStore:
+    """
+    Persistent crawl progress used to resume an interrupted run.
+
+    Completed listing pages, finished sections and processed detail URLs
+    (with their failures) live in a SQLite database in WAL mode. Updates
+    are buffered in memory and written in one transaction by ``flush()``;
+    callers flush right after the matching records reach the output files,
+    so the stored state never claims more than what was saved.
+
+    The ``listings`` table outlives individual runs: it keeps the listing
+    card fingerprint and last detail record of every URL, so unchanged
+    listings can be carried forward by the next run. Detail and listing
+    rows are keyed by ``canonicalize_url()``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                section TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                url TEXT,
+                completed_at REAL,
+                PRIMARY KEY (section, page)
+            );
+            CREATE TABLE IF NOT EXISTS sections (
+                section TEXT PRIMARY KEY,
+                completed_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS details (
+                url TEXT PRIMARY KEY,
+                section TEXT,
+                status TEXT NOT NULL,
+                error TEXT,
+                updated_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS listings (
+                url TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                record TEXT NOT NULL,
+                seen_at REAL
+            );
+            """
+        )
+        self._conn.commit()
+        self._pending_pages = []
+        self._pending_sections = []
+        self._pending_details = []
+        self._pending_listings = []
+
+    def _get_meta(self, key: str):
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def is_interrupted(self) -> bool:
+        """True if the last run started but never finished."""
+        return self._get_meta("status") == "running"
+
+    def start(self, resume: bool = True) -> bool:
+        """
+        Begin a run. Returns True when resuming an interrupted run; otherwise
+        the previous progress is cleared and a fresh run is recorded.
+        """
+        resuming = resume and self.is_interrupted()
+        if not resuming:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM sections")
+            self._conn.execute("DELETE FROM details")
+        self._set_meta("status", "running")
+        self._set_meta("started_at", str(time.time()))
+        self._conn.commit()
+        return resuming
+
+    def completed_urls(self):
+        """Iterate over detail URLs already processed (done or failed)."""
+        for (url,) in self._conn.execute("SELECT url FROM details"):
+            yield url
+
+    def failed_urls(self) -> list:
+        return [
+            url for (url,) in self._conn.execute(
+                "SELECT url FROM details WHERE status = 'failed' ORDER BY updated_at"
+            )
+        ]
+
+    def last_page(self, section: str) -> int:
+        """Highest listing page of ``section`` fully processed (0 if none)."""
+        row = self._conn.execute(
+            "SELECT MAX(page) FROM pages WHERE section = ?", (section,)
+        ).fetchone()
+        return row[0] or 0
+
+    def section_done(self, section: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM sections WHERE section = ?", (section,)
+        ).fetchone()
+        return row is not None
+
+    def mark_page(self, section: str, page: int, url: str):
+        self._pending_pages.append((section, page, url, time.time()))
+
+    def mark_section(self, section: str):
+        self._pending_sections.append((section, time.time()))
+
+    def mark_details(self, records):
+        """Buffer the outcome of each detail record (uses URL/Section/Error)."""
+        now = time.time()
+        for record in records:
+            error = record.get("Error")
+            self._pending_details.append((
+                canonicalize_url(record["URL"]),
+                record.get("Section"),
+                "failed" if error else "done",
+                error,
+                now,
+            ))
+
+    def previous_listing(self, url: str):
+        """Return ``(fingerprint, record)`` stored for ``url``, or None."""
+        row = self._conn.execute(
+            "SELECT fingerprint, record FROM listings WHERE url = ?",
+            (canonicalize_url(url),),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def remember_listings(self, records, fingerprint):
+        """
+        Buffer the detail records to carry forward on the next run, keyed by
+        ``fingerprint(record)``. Records with an error are not remembered so
+        they are fetched again.
+        """
+        now = time.time()
+        for record in records:
+            if record.get("Error"):
+                continue
+            self._pending_listings.append((
+                canonicalize_url(record["URL"]),
+                fingerprint(record),
+                json.dumps(record, ensure_ascii=False),
+                now,
+            ))
+
+    def flush(self):
+        """Write all buffered updates in a single transaction."""
+        if not (self._pending_pages or self._pending_sections
+                or self._pending_details or self._pending_listings):
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO listings "
+                "(url, fingerprint, record, seen_at) VALUES (?, ?, ?, ?)",
+                self._pending_listings,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO details "
+                "(url, section, status, error, updated_at) VALUES (?, ?, ?, ?, ?)",
+                self._pending_details,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages "
+                "(section, page, url, completed_at) VALUES (?, ?, ?, ?)",
+                self._pending_pages,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sections (section, completed_at) VALUES (?, ?)",
+                self._pending_sections,
+            )
+        self._pending_pages = []
+        self._pending_sections = []
+        self._pending_details = []
+        self._pending_listings = []
+
+    def finish(self):
+        """Flush and mark the run as complete so the next run starts fresh."""
+        self.flush()
+        self._set_meta("status", "complete")
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
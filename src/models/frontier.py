@@ -0,0 +1,109 @@
+import heapq
+import itertools
+import os
+import sqlite3
+
+
+FRONTIER_MEMORY = 10_000  # Entries kept in memory before spilling to SQLite
+FRONTIER_REFILL = 1_000  # Entries read back from SQLite at a time
+
+
+class Frontier:
+    """
+    Priority queue of URLs to crawl, lowest priority value first (ties in
+    insertion order), that spills to SQLite past ``memory_limit`` entries.
+
+    The in-memory heap only ever holds entries that come before everything
+    on disk: a spill moves the worst half of the heap to disk, and while
+    the disk holds entries, new ones that do not beat the best of them go
+    straight there. ``pop()`` is therefore exact across both tiers.
+    """
+
+    def __init__(self, path: str, memory_limit: int = FRONTIER_MEMORY,
+                 refill: int = FRONTIER_REFILL):
+        self.path = path
+        self.memory_limit = max(2, memory_limit)
+        self.refill = max(1, min(refill, self.memory_limit // 2))
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.executescript(
+            """
+            DROP TABLE IF EXISTS frontier;
+            CREATE TABLE frontier (
+                priority REAL NOT NULL,
+                seq INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (priority, seq)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._heap = []
+        self._seq = itertools.count()
+        self._on_disk = 0
+        # (priority, seq) of the best entry on disk, None while it is empty
+        self._disk_min = None
+
+    def __len__(self) -> int:
+        return len(self._heap) + self._on_disk
+
+    def push(self, url: str, depth: int, priority: float = None):
+        entry = (depth if priority is None else priority, next(self._seq), url, depth)
+        if self._disk_min is not None and entry[:2] > self._disk_min:
+            self._write([entry])
+            return
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > self.memory_limit:
+            self._spill()
+
+    def pop(self):
+        """Return ``(url, depth)`` of the best entry, or None when empty."""
+        if not self._heap and self._on_disk:
+            self._load()
+        if not self._heap:
+            return None
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    def _write(self, entries):
+        self._conn.executemany(
+            "INSERT INTO frontier (priority, seq, url, depth) VALUES (?, ?, ?, ?)",
+            entries,
+        )
+        self._conn.commit()
+        self._on_disk += len(entries)
+        best = min(entry[:2] for entry in entries)
+        if self._disk_min is None or best < self._disk_min:
+            self._disk_min = best
+
+    def _spill(self):
+        entries = sorted(self._heap)
+        keep = len(entries) // 2
+        self._heap = entries[:keep]
+        heapq.heapify(self._heap)
+        self._write(entries[keep:])
+
+    def _load(self):
+        rows = self._conn.execute(
+            "SELECT priority, seq, url, depth FROM frontier "
+            "ORDER BY priority, seq LIMIT ?", (self.refill,)
+        ).fetchall()
+        self._conn.execute(
+            "DELETE FROM frontier WHERE (priority, seq) <= (?, ?)", rows[-1][:2]
+        )
+        self._conn.commit()
+        self._on_disk -= len(rows)
+        self._heap = [tuple(row) for row in rows]
+        heapq.heapify(self._heap)
+        best = self._conn.execute(
+            "SELECT priority, seq FROM frontier ORDER BY priority, seq LIMIT 1"
+        ).fetchone()
+        self._disk_min = tuple(best) if best else None
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,58 @@
+import importlib.util
+import os
+
+from bs4 import BeautifulSoup
+
+
+PARSER_ENV = "SCRAPER_PARSER"
+DEFAULT_PARSER = "html.parser"
+
+# Backend name -> (BeautifulSoup tree builder, module that must be installed)
+PARSER_BACKENDS = {
+    "html.parser": ("html.parser", None),  # Pure Python, always available
+    "lxml": ("lxml", "lxml"),  # libxml2, several times faster
+}
+
+_default_parser = os.environ.get(PARSER_ENV) or DEFAULT_PARSER
+
+
+def available_backends() -> list:
+    """Return the backends whose dependencies are installed."""
+    return [
+        name for name, (_, module) in PARSER_BACKENDS.items()
+        if module is None or importlib.util.find_spec(module) is not None
+    ]
+
+
+def resolve_backend(name: str = None) -> str:
+    """
+    Return the backend to use for ``name``.
+
+    ``None`` selects the process default, which is ``html.parser`` unless
+    overridden by ``set_default_parser`` or the ``SCRAPER_PARSER``
+    environment variable.
+    """
+    name = name or _default_parser
+    if name not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend '{name}'. "
+            f"Choose one of: {', '.join(PARSER_BACKENDS)}"
+        )
+    if name not in available_backends():
+        raise ImportError(
+            f"Parser backend '{name}' requires the "
+            f"'{PARSER_BACKENDS[name][1]}' package"
+        )
+    return name
+
+
+def set_default_parser(name: str):
+    """Select the backend used when a scraper does not ask for one."""
+    global _default_parser
+    _default_parser = resolve_backend(name)
+
+
+def make_soup(html: str, backend: str = None, parse_only=None) -> BeautifulSoup:
+    """Parse ``html`` with the selected backend."""
+    features, _ = PARSER_BACKENDS[resolve_backend(backend)]
+    return BeautifulSoup(html, features, parse_only=parse_only)
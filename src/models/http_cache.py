@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+
+from src.models.metrics import metrics
+from src.models.urls import canonicalize_url
+
+
+CACHE_PATH = os.path.join(".cache", "http_cache.sqlite")
+CACHE_TTL = 24 * 60 * 60  # Serve without revalidation for one day
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """Raised in cache-only mode when a URL has never been stored."""
+
+
+class ResponseCache:
+    """
+    Persistent HTTP response cache keyed by canonical URL.
+
+    Bodies are stored zlib-compressed in SQLite together with their
+    ``ETag``/``Last-Modified`` validators. Entries younger than ``ttl`` are
+    served without touching the network; older ones are revalidated with a
+    conditional GET, so an unchanged page costs a single 304. Entries older
+    than ``max_age`` are purged, and the least recently used entries are
+    evicted once the stored bodies exceed ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        ttl: float = CACHE_TTL,
+        max_bytes: int = CACHE_MAX_BYTES,
+        max_age: float = None,
+        cache_only: bool = False,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.cache_only = cache_only
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed "
+            "ON responses (accessed_at)"
+        )
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if max_age:
+            self.purge_expired()
+
+    def get(self, url: str):
+        """Return the cached entry for ``url`` as a dict, or None."""
+        key = canonicalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses "
+                "WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+
+        body, etag, last_modified, stored_at = row
+        return {
+            "text": zlib.decompress(body).decode("utf-8"),
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": stored_at,
+        }
+
+    def store(self, url: str, text: str, etag: str = None, last_modified: str = None):
+        """Store (or replace) the body and validators for ``url``."""
+        key = canonicalize_url(url)
+        body = zlib.compress(text.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE url = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, body, etag, last_modified, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, now, now, len(body)),
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._evict_to_size()
+            self._conn.commit()
+
+    def refresh(self, url: str):
+        """Mark ``url`` as freshly validated (after a 304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, canonicalize_url(url)),
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        """Drop entries that have not been validated within ``max_age``."""
+        if not self.max_age:
+            return
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (cutoff,))
+            self._conn.commit()
+            self._total_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    def _evict_to_size(self):
+        """Evict least recently used entries. Caller must hold the lock."""
+        while self._total_bytes > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._total_bytes = 0
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (row[0],))
+            self._total_bytes -= row[1]
+
+    def fetch(self, session, url: str, timeout: float = None) -> str:
+        """
+        Return the body for ``url``, using the network only when needed.
+
+        Fresh entries are returned directly. Stale entries are revalidated
+        with ``If-None-Match``/``If-Modified-Since``; if the request fails the
+        stale body is served instead. In cache-only mode the network is never
+        used and a missing entry raises ``CacheMiss``.
+        """
+        entry = self.get(url)
+        if self.cache_only:
+            if entry is None:
+                metrics.inc("cache_requests_total", result="miss")
+                raise CacheMiss(f"Not in cache: {url}")
+            metrics.inc("cache_requests_total", result="hit")
+            return entry["text"]
+
+        if entry and time.time() - entry["stored_at"] < self.ttl:
+            metrics.inc("cache_requests_total", result="hit")
+            return entry["text"]
+
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+            if response.status_code == 304 and entry:
+                metrics.inc("cache_requests_total", result="revalidated")
+                self.refresh(url)
+                return entry["text"]
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            if entry:
+                metrics.inc("cache_requests_total", result="stale")
+                return entry["text"]
+            raise
+
+        metrics.inc("cache_requests_total", result="miss")
+        self.store(
+            url,
+            response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return response.text
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
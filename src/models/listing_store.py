@@ -0,0 +1,219 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.models.urls import canonicalize_url
+
+
+STORE_PATH = os.path.join("realestate_data", "listings.sqlite")
+
+# Queryable column -> record field; the full record is kept as JSON
+LISTING_COLUMNS = {
+    "section": "Section",
+    "title": "Title",
+    "price": "Price",
+    "city": "City",
+    "locality": "Locality",
+    "neighborhood": "Neighborhood",
+    "stratum": "Stratum",
+    "property_type": "Property Type",
+    "business_type": "Business Type",
+    "built_area": "Built Area",
+    "bedrooms": "Bedrooms",
+    "bathrooms": "Bathrooms",
+}
+# Text columns compared without regard to case by find()
+TEXT_FILTERS = ("section", "city", "locality", "neighborhood", "property_type")
+# SQLite's default limit on bound parameters is 999
+LOOKUP_CHUNK = 500
+
+
+class ListingStore:
+    """
+    SQLite store of every listing ever scraped, keyed by canonical URL.
+
+    ``write_batch`` upserts a batch in one transaction, so it can be used as
+    a BatchSink writer. ``convert`` turns a record into typed values (e.g.
+    integer prices) for the queryable columns. A row is added to
+    ``price_history`` whenever a listing is first seen or its price text
+    changes. Records with an ``Error`` are skipped so a failed scrape never
+    overwrites good data.
+    """
+
+    def __init__(self, path: str = STORE_PATH, convert=None):
+        self.path = path
+        self.convert = convert
+        self._lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS listings (
+                url TEXT PRIMARY KEY,
+                section TEXT COLLATE NOCASE,
+                title TEXT,
+                price INTEGER,
+                price_text TEXT,
+                city TEXT COLLATE NOCASE,
+                locality TEXT COLLATE NOCASE,
+                neighborhood TEXT COLLATE NOCASE,
+                stratum INTEGER,
+                property_type TEXT COLLATE NOCASE,
+                business_type TEXT,
+                built_area REAL,
+                bedrooms INTEGER,
+                bathrooms INTEGER,
+                record TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS price_history (
+                url TEXT NOT NULL,
+                price INTEGER,
+                price_text TEXT,
+                observed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_listings_city ON listings (city, price);
+            CREATE INDEX IF NOT EXISTS idx_listings_locality ON listings (locality, price);
+            CREATE INDEX IF NOT EXISTS idx_listings_neighborhood
+                ON listings (neighborhood, price);
+            CREATE INDEX IF NOT EXISTS idx_listings_stratum ON listings (stratum);
+            CREATE INDEX IF NOT EXISTS idx_listings_section ON listings (section);
+            CREATE INDEX IF NOT EXISTS idx_price_history_url
+                ON price_history (url, observed_at);
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _value(typed, field: str):
+        value = typed.get(field)
+        return None if value == "N/A" else value
+
+    def _row(self, url: str, record, typed, now: float) -> tuple:
+        values = [self._value(typed, field) for field in LISTING_COLUMNS.values()]
+        return (
+            url, *values, record.get("Price"),
+            json.dumps(record, ensure_ascii=False), now, now,
+        )
+
+    def _current_prices(self, urls) -> dict:
+        prices = {}
+        urls = list(urls)
+        for i in range(0, len(urls), LOOKUP_CHUNK):
+            chunk = urls[i:i + LOOKUP_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT url, price_text FROM listings "
+                f"WHERE url IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            prices.update(rows)
+        return prices
+
+    def write_batch(self, records):
+        """Upsert ``records`` and log price changes in one transaction."""
+        now = time.time()
+        rows = {}
+        for record in records:
+            if record.get("Error") or not record.get("URL"):
+                continue
+            rows[canonicalize_url(record["URL"])] = record
+        if not rows:
+            return
+
+        columns = ["url", *LISTING_COLUMNS, "price_text", "record",
+                   "first_seen", "last_seen"]
+        updates = ", ".join(
+            f"{column} = excluded.{column}"
+            for column in columns if column not in ("url", "first_seen")
+        )
+        with self._lock, self._conn:
+            previous = self._current_prices(rows)
+            upserts = []
+            history = []
+            for url, record in rows.items():
+                typed = self.convert(record) if self.convert else record
+                upserts.append(self._row(url, record, typed, now))
+                price_text = record.get("Price")
+                if url not in previous or previous[url] != price_text:
+                    history.append(
+                        (url, self._value(typed, "Price"), price_text, now)
+                    )
+            self._conn.executemany(
+                f"INSERT INTO listings ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(url) DO UPDATE SET {updates}",
+                upserts,
+            )
+            self._conn.executemany(
+                "INSERT INTO price_history (url, price, price_text, observed_at) "
+                "VALUES (?, ?, ?, ?)",
+                history,
+            )
+
+    def get(self, url: str):
+        """Return the stored record for ``url``, or None."""
+        row = self._conn.execute(
+            "SELECT record FROM listings WHERE url = ?", (canonicalize_url(url),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, section: str = None, city: str = None, locality: str = None,
+             neighborhood: str = None, property_type: str = None,
+             stratum: int = None, min_price: int = None, max_price: int = None,
+             limit: int = None) -> list:
+        """
+        Return the records matching every given filter, cheapest first.
+
+        Text filters ignore case; price bounds are inclusive and skip
+        listings without a parsed price.
+        """
+        filters = {
+            "section": section, "city": city, "locality": locality,
+            "neighborhood": neighborhood, "property_type": property_type,
+        }
+        clauses = []
+        params = []
+        for column in TEXT_FILTERS:
+            if filters[column] is not None:
+                clauses.append(f"{column} = ?")
+                params.append(filters[column])
+        if stratum is not None:
+            clauses.append("stratum = ?")
+            params.append(stratum)
+        if min_price is not None:
+            clauses.append("price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            clauses.append("price <= ?")
+            params.append(max_price)
+
+        sql = "SELECT record FROM listings"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY price IS NULL, price, url"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(record) for (record,) in self._conn.execute(sql, params)]
+
+    def price_history(self, url: str) -> list:
+        """Return ``(observed_at, price, price_text)`` tuples, oldest first."""
+        return self._conn.execute(
+            "SELECT observed_at, price, price_text FROM price_history "
+            "WHERE url = ? ORDER BY observed_at, rowid",
+            (canonicalize_url(url),),
+        ).fetchall()
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+METRICS_PORT_ENV = "SCRAPER_METRICS_PORT"
+METRICS_PREFIX = "scraper_"
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels: tuple, extra: tuple = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    """Bucketed distribution of observed values (seconds for timers)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 6),
+        }
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters, gauges and histograms.
+
+    Names may carry labels, e.g. ``inc("fields_found", strategy="dl")``.
+    ``timer()`` records the duration of a block into a histogram. The
+    registry can be exported as a JSON report or in the Prometheus text
+    format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+            self.started_at = time.time()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, buckets=DEFAULT_BUCKETS, **labels):
+        """Add ``value`` to a histogram; ``buckets`` applies on first use."""
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the wall time spent in the ``with`` block, even on errors."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def histogram(self, name: str, **labels):
+        with self._lock:
+            return self._histograms.get(_key(name, labels))
+
+    def snapshot(self) -> dict:
+        """Return every metric as plain data, grouped by kind and name."""
+        def group(items, value):
+            grouped = {}
+            for (name, labels), item in sorted(items, key=lambda entry: entry[0]):
+                grouped.setdefault(name, []).append(
+                    {"labels": dict(labels), "value": value(item)}
+                )
+            return grouped
+
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "elapsed_s": round(time.time() - self.started_at, 3),
+                "counters": group(self._counters.items(), lambda v: v),
+                "gauges": group(self._gauges.items(), lambda v: v),
+                "histograms": group(
+                    self._histograms.items(), lambda h: h.summary()
+                ),
+            }
+
+    def write_report(self, path: str, **extra) -> dict:
+        """Write the snapshot (plus ``extra`` fields) as a JSON run report."""
+        report = dict(self.snapshot(), **extra)
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return report
+
+    def prometheus_text(self) -> str:
+        """Render the registry in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for kind, items in (("counter", self._counters), ("gauge", self._gauges)):
+                typed = set()
+                for (name, labels), value in sorted(items.items()):
+                    metric = METRICS_PREFIX + name
+                    if metric not in typed:
+                        lines.append(f"# TYPE {metric} {kind}")
+                        typed.add(metric)
+                    lines.append(f"{metric}{_label_text(labels)} {value}")
+
+            typed = set()
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                metric = METRICS_PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f"{metric}_bucket{_label_text(labels, (('le', bound),))} {cumulative}"
+                    )
+                lines.append(
+                    f"{metric}_bucket{_label_text(labels, (('le', '+Inf'),))} "
+                    f"{histogram.count}"
+                )
+                lines.append(f"{metric}_sum{_label_text(labels)} {histogram.sum}")
+                lines.append(f"{metric}_count{_label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by the scrapers
+metrics = Metrics()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        registry = self.server.registry
+        if self.path.startswith("/metrics.json"):
+            body = json.dumps(registry.snapshot()).encode("utf-8")
+            content_type = "application/json"
+        elif self.path.startswith("/metrics"):
+            body = registry.prometheus_text().encode("utf-8")
+            content_type = "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", registry: Metrics = None):
+    """
+    Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` from a
+    daemon thread while a crawl runs. Returns the server; call
+    ``shutdown()`` on it to stop.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry or metrics
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
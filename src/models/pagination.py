@@ -0,0 +1,128 @@
+import itertools
+import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src.models.urls import canonicalize_url
+
+
+PAGE_PREFETCH = 4  # Listing pages loaded ahead of the consumer
+PAGE_QUEUE_SIZE = 8  # Parsed pages waiting for the consumer
+
+_DONE = object()
+
+
+class ListingLoadError(Exception):
+    """A listing page could not be loaded; the section ends before it."""
+
+    def __init__(self, page_url: str, error: Exception):
+        super().__init__(f"Error loading {page_url}: {error}")
+        self.page_url = page_url
+        self.error = error
+
+
+class ListingPaginator:
+    """
+    Discover the listing pages of a section ahead of the detail work.
+
+    ``page_url(n)`` builds the URL of page ``n`` and ``load(url)`` returns
+    the listings found on it. A producer thread loads up to ``prefetch``
+    pages at once and puts them, in page order, on a bounded queue that
+    iterating the paginator consumes as ``(page, url, listings)``.
+
+    The section ends at the first page with no listings or whose listings
+    were all seen on earlier pages, compared by canonical URL (sites often
+    repeat the last page for out-of-range numbers), or after ``max_pages`` pages when set. A page
+    that fails to load raises ``ListingLoadError`` in the consumer.
+    """
+
+    def __init__(self, page_url, load, start_page: int = 1,
+                 prefetch: int = PAGE_PREFETCH, max_pages: int = None,
+                 queue_size: int = PAGE_QUEUE_SIZE):
+        self.page_url = page_url
+        self.load = load
+        self.start_page = start_page
+        self.prefetch = max(1, prefetch or 1)
+        self.max_pages = max_pages
+        self.queue_size = queue_size
+
+    def _page_numbers(self):
+        pages = itertools.count(self.start_page)
+        if self.max_pages is None:
+            return pages
+        return itertools.takewhile(lambda page: page <= self.max_pages, pages)
+
+    def _produce(self, results: queue.Queue, stop: threading.Event):
+        def emit(item) -> bool:
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            self._load_pages(emit, stop)
+        except Exception as e:
+            # Surface bugs in the consumer instead of leaving it waiting
+            emit(e)
+            return
+        emit(_DONE)
+
+    def _load_pages(self, emit, stop: threading.Event):
+        seen = set()
+        pages = self._page_numbers()
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.prefetch) as executor:
+            def submit_next():
+                page = next(pages, None)
+                if page is not None:
+                    url = self.page_url(page)
+                    pending.append((page, url, executor.submit(self.load, url)))
+
+            for _ in range(self.prefetch):
+                submit_next()
+            try:
+                while pending and not stop.is_set():
+                    page, url, future = pending.popleft()
+                    try:
+                        listings = future.result()
+                    except Exception as e:
+                        raise ListingLoadError(url, e)
+                    if not listings:
+                        logging.info(f"No properties found on page {page}, ending section")
+                        return
+                    urls = {canonicalize_url(listing["URL"]) for listing in listings}
+                    if urls <= seen:
+                        logging.info(f"Page {page} repeats earlier listings, ending section")
+                        return
+                    seen |= urls
+                    if not emit((page, url, listings)):
+                        return
+                    submit_next()
+            finally:
+                # Pages past the end are not needed
+                for _, _, future in pending:
+                    future.cancel()
+
+    def __iter__(self):
+        results = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce, args=(results, stop), daemon=True
+        )
+        producer.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            producer.join()
@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from src.models.metrics import metrics
+
+
+# Parse jobs (raw HTML) waiting or running per worker process before
+# submit() blocks; this is what bounds memory when fetching outruns parsing
+PENDING_PER_WORKER = 2
+
+_parser = None
+
+
+def _install_parser(parser):
+    global _parser
+    _parser = parser
+
+
+def _call(method: str, args: tuple):
+    start = time.perf_counter()
+    result = getattr(_parser, method)(*args)
+    return result, time.perf_counter() - start
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+class ParsePool:
+    """
+    Run a parser object's methods in worker processes, off the GIL.
+
+    ``parser`` (e.g. a WikiScraper or PropertyDetailScraper) is pickled
+    once into every worker, so it must drop sessions, drivers, locks and
+    sinks in ``__getstate__``. ``submit()`` blocks while ``max_pending``
+    jobs are outstanding, which pushes back on the fetch threads feeding it.
+    Workers are spawned rather than forked because the parent runs threads.
+    """
+
+    def __init__(self, parser, workers: int = None, max_pending: int = None):
+        self.workers = workers or default_workers()
+        self.max_pending = max_pending or self.workers * PENDING_PER_WORKER
+        self.label = type(parser).__name__
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_install_parser,
+            initargs=(parser,),
+        )
+
+    def submit(self, method: str, *args) -> Future:
+        """Queue ``parser.<method>(*args)``; the returned future holds its result."""
+        with metrics.timer("parse_queue_wait_seconds"):
+            self._slots.acquire()
+        outer = Future()
+
+        def finished(future):
+            self._slots.release()
+            try:
+                result, seconds = future.result()
+            except BaseException as e:
+                outer.set_exception(e)
+                return
+            metrics.observe("parse_seconds", seconds, scraper=self.label)
+            outer.set_result(result)
+
+        try:
+            self._executor.submit(_call, method, args).add_done_callback(finished)
+        except BaseException:
+            self._slots.release()
+            raise
+        return outer
+
+    def call(self, method: str, *args):
+        """Run ``parser.<method>(*args)`` in a worker and wait for the result."""
+        return self.submit(method, *args).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
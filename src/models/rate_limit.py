@@ -0,0 +1,60 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from src.models.metrics import metrics
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``rate`` acquisitions per second with bursts of
+    up to ``burst``.
+
+    Callers reserve a token under the lock and sleep outside it, so
+    concurrent threads queue up fairly instead of spinning.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available. Returns the wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Politeness limiter keeping one token bucket per host."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Wait until a request to the host of ``url`` is allowed."""
+        if not self.rate:
+            return 0.0
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        wait = bucket.acquire()
+        metrics.observe("rate_limit_wait_seconds", wait, host=host)
+        return wait
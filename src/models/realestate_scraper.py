@@ -1,47 +1,134 @@
 # realestate_scraper.py
 import os
+import re
+import hashlib
 import time
-import random
 import logging
+import unicodedata
 import sys
-import pandas as pd
+import queue
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse, urljoin
 from typing import List, Dict
 from src.models.scraper_base import Scraper
+from src.models.transport import build_session, DEFAULT_TIMEOUT, retry_count
+from src.models.rate_limit import HostRateLimiter
+from src.models.html_parser import make_soup
+from src.models.sinks import (
+    BatchSink, CsvWriter, FilteredWriter, JsonlWriter, ParquetWriter, parquet_available
+)
+from src.models.crawl_state import CrawlStateStore
+from src.models.dedup import SeenSet
+from src.models.listing_store import ListingStore
+from src.models.urls import canonicalize_url
+from src.models.metrics import metrics
+from src.models.parse_pool import ParsePool
+from src.models.browser_profile import (
+    ScrapeProfile, PageWeightMeter, page_weight_savings, resolve_chromedriver,
+    process_tree_rss_mb, RSS_CHECK_EVERY,
+)
+from src.models.pagination import ListingPaginator, ListingLoadError, PAGE_PREFETCH
 
 
 # Configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
-
 SAVE_BATCH = 5
-PAGE_LOAD_BASE = 3
-RAND_DELAY = (0.5, 1.5)
+PAGE_LOAD_TIMEOUT = 15  # Seconds to wait for <body> before a load counts as failed
+READY_TIMEOUT = 5  # Seconds to wait for the content selector once <body> exists
+REQUESTS_PER_SECOND = 0.5  # Politeness limit per host
+RATE_BURST = 2
+LISTING_CARD_SELECTOR = (
+    "div.property-item, div.listing-card, div.item, "
+    "div.card, div.property, .list-item"
+)
+DETAIL_READY_SELECTOR = (
+    "dl, table, div.property-info, div.details, div.characteristics"
+)
 DATA_FOLDER = "realestate_data"
 MAX_RETRIES = 3
-MAX_PAGES = 1  # Limit pages for testing
+MAX_PAGES = None  # Optional cap on listing pages per section (None = until the last page)
+DETAIL_WORKERS = 1  # Browsers used for detail pages (1 = reuse the main browser)
+LISTING_BROWSERS = 2  # Browsers loading listing pages for the prefetch threads
+HTTP_FIRST = True  # Try a plain GET before opening detail pages in Chrome
+PARSE_WORKERS = 0  # Processes parsing detail pages (0 = parse in the fetch threads)
+HTTP_MIN_FIELDS = 4  # Mapped fields a plain GET must yield to skip the browser
+PATH_STATS_FILE = "fetch_path_stats.json"
+STREAM_FILE = "properties_all.jsonl"  # Crash-safe record stream, one JSON per line
+STATE_FILE = "crawl_state.sqlite"  # Progress of the current run, used to resume
+SEEN_FILE = "seen_urls.sqlite"  # Detail URLs handled in this run (Bloom filter + SQLite)
+LABEL_CACHE_SIZE = 4096
+PARQUET_EXPORT = True  # Also write a typed Parquet dataset (needs pyarrow)
+PARQUET_FOLDER = "properties_parquet"  # Partitioned by Section and extraction_date
+LISTING_STORE_FILE = "listings.sqlite"  # Every listing ever seen, with price history
+RUN_REPORT_FILE = "run_report.json"  # Stage timings and counters of the last run
+
+# Typed columns of the Parquet export; every other field is a string
+PRICE_FIELDS = ("Price", "Administration Fee")
+AREA_FIELDS = ("Built Area", "Land Area")
+INTEGER_FIELDS = ("Bedrooms", "Bathrooms", "Garage", "Stratum", "Floor", "Year Built")
+NUMBER_PATTERN = re.compile(r"\d[\d.,]*")
+INT64_MAX = 2 ** 63 - 1  # Largest value the Parquet and SQLite columns hold
 
+# Detail extraction strategies in priority order (later ones win)
+EXTRACTION_STRATEGIES = ("dl", "table", "list", "div")
+DETAIL_DIV_CLASSES = {"property-info", "details", "characteristics"}
+DETAIL_DIV_PATTERNS = {
+    "Bedrooms": re.compile(
+        r"(\d+)\s*(?:alcoba|habitación|habitaciones|bedroom|bed)", re.IGNORECASE
+    ),
+    "Bathrooms": re.compile(r"(\d+)\s*(?:baño|baños|bathroom|bath)", re.IGNORECASE),
+    "Garage": re.compile(r"(\d+)\s*(?:garaje|garajes|garage|parking)", re.IGNORECASE),
+}
 
-def human_pause():
-    """Simulate human browsing with a random delay."""
-    time.sleep(PAGE_LOAD_BASE + random.uniform(*RAND_DELAY))
 
+def load_page(driver, url: str, ready_selector: str, rate_limiter=None) -> bool:
+    """
+    Open ``url`` once the host's rate limit allows it and wait for content.
 
+    Raises if ``<body>`` never appears. Returns False when the page loaded
+    but ``ready_selector`` did not match within READY_TIMEOUT, which callers
+    treat as a page without the expected content rather than an error.
+    """
+    if rate_limiter is not None:
+        rate_limiter.acquire(url)
+    # Set by WebDriverController for profiles that block or measure
+    meter = getattr(driver, "page_meter", None)
+    if meter is not None:
+        meter.before_page()
+    try:
+        with metrics.timer("browser_get_seconds"):
+            driver.get(url)
+        with metrics.timer("browser_wait_seconds"):
+            WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+            try:
+                WebDriverWait(driver, READY_TIMEOUT).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector))
+                )
+                return True
+            except TimeoutException:
+                metrics.inc("ready_timeouts_total")
+                logging.debug(f"No element matching '{ready_selector}' on {url}")
+                return False
+    finally:
+        if meter is not None:
+            meter.after_page()
+
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
 def normalize_text(s: str) -> str:
     """Normalize text: lowercase, strip, remove accents and extra spaces."""
-    import unicodedata
     if not s:
         return ""
     s2 = s.lower().strip()
@@ -51,6 +138,102 @@ def normalize_text(s: str) -> str:
     return s2
 
 
+def listing_fingerprint(listing: Dict) -> str:
+    """Fingerprint the listing card fields (title and price) of a property."""
+    card = "\x1f".join(
+        normalize_text(listing.get(field) or "") for field in ("Title", "Price")
+    )
+    return hashlib.sha1(card.encode("utf-8")).hexdigest()
+
+
+def _bounded_int(digits: str):
+    value = int(digits)
+    return value if value <= INT64_MAX else None
+
+
+def parse_price(text: str):
+    """
+    Parse a peso amount such as "$ 450.000.000" (None if absent).
+
+    Only the first amount counts, so a range like "Desde $ 300.000.000
+    hasta $ 500.000.000" gives its lower bound.
+    """
+    match = NUMBER_PATTERN.search(text or "")
+    if not match:
+        return None
+    # Dots group thousands; anything after a decimal comma is cents
+    digits = match.group().split(",")[0].replace(".", "")
+    return _bounded_int(digits) if digits else None
+
+
+def parse_area(text: str):
+    """Parse an area such as "85 m²" or "1.250,5 m2" into square metres."""
+    match = NUMBER_PATTERN.search(text or "")
+    if not match:
+        return None
+    number = match.group().rstrip(".,")
+    if "," in number:
+        number = number.replace(".", "").replace(",", ".")
+    elif re.fullmatch(r"\d{1,3}(?:\.\d{3})+", number):
+        number = number.replace(".", "")
+    try:
+        return float(number)
+    except ValueError:
+        # e.g. "10.5.3 m2": not a number we can read
+        return None
+
+
+def parse_integer(text: str):
+    """Parse the first whole number in ``text``, e.g. "3 alcobas" -> 3."""
+    match = re.search(r"\d+", text or "")
+    return _bounded_int(match.group()) if match else None
+
+
+def typed_record(record: Dict) -> Dict:
+    """
+    Convert a detail record into typed values for the Parquet export.
+
+    Prices become integers, areas floats, counts integers and "N/A" None;
+    ``extraction_date`` (the day of "Extraction Date") is added for
+    partitioning.
+    """
+    row = {
+        key: (None if value == "N/A" else value) for key, value in record.items()
+    }
+    for field in PRICE_FIELDS:
+        row[field] = parse_price(record.get(field))
+    for field in AREA_FIELDS:
+        row[field] = parse_area(record.get(field))
+    for field in INTEGER_FIELDS:
+        row[field] = parse_integer(record.get(field))
+
+    extracted = record.get("Extraction Date")
+    row["Extraction Date"] = (
+        datetime.strptime(extracted, "%Y-%m-%d %H:%M") if extracted else None
+    )
+    row["extraction_date"] = extracted[:10] if extracted else None
+    return row
+
+
+def parquet_columns() -> List[tuple]:
+    """Column names and Arrow types of the Parquet export."""
+    columns = [("URL", "string"), ("Title", "string"), ("Price", "int64")]
+    for field in sorted(set(PropertyDetailScraper.FIELD_MAP.values())):
+        if field in PRICE_FIELDS or field in INTEGER_FIELDS:
+            columns.append((field, "int64"))
+        elif field in AREA_FIELDS:
+            columns.append((field, "double"))
+        else:
+            columns.append((field, "string"))
+    columns += [
+        ("Extraction Date", "timestamp[s]"),
+        ("Error", "string"),
+        ("Section", "string"),
+        ("extraction_date", "string"),
+    ]
+    return columns
+
+
 def build_page_url_from_template(template: str, page_num: int) -> str:
     """Replace or add the page parameter in the base URL."""
     if "page=" in template:
@@ -65,12 +248,61 @@ def build_page_url_from_template(template: str, page_num: int) -> str:
         return f"{template}{sep}page={page_num}"
 
 
+class LabelMatcher:
+    """
+    Resolve detail-page labels to field names.
+
+    Exact labels hit a dict. Otherwise the first key (in FIELD_MAP order)
+    that contains, or is contained in, the label wins. A combined regex of
+    all keys and a joined key string reject most labels before the ordered
+    scan runs, and results are memoized per raw label.
+    """
+
+    def __init__(self, normalized_map: Dict):
+        self.normalized_map = normalized_map
+        self._keys = list(normalized_map.items())
+        self._any_key = re.compile(
+            "|".join(re.escape(k) for k in sorted(normalized_map, key=len, reverse=True))
+        )
+        # NUL never appears in a normalized label, so it cannot match across keys
+        self._joined_keys = "\0".join(normalized_map)
+        self.match = lru_cache(maxsize=LABEL_CACHE_SIZE)(self._match)
+
+    def _match(self, label_text: str) -> str:
+        key = normalize_text(label_text)
+        if key in self.normalized_map:
+            return self.normalized_map[key]
+        if not self._any_key.search(key) and key not in self._joined_keys:
+            return None
+        for k_norm, v in self._keys:
+            if k_norm in key or key in k_norm:
+                return v
+        return None
+
+
 class WebDriverController:
-    """Controller for WebDriver initialization and management."""
+    """
+    Controller for WebDriver initialization and management.
+
+    Long-lived Chrome sessions get slower and bigger, so the browser is
+    restarted every ``profile.recycle_after_pages`` pages or once its
+    processes pass ``profile.recycle_rss_mb``. Scrapers registered with
+    ``bind()`` are pointed at the new driver.
+    """
     
-    def __init__(self):
+    def __init__(self, profile: ScrapeProfile = None):
         self.driver = None
+        # Headless, eager and with heavy resources blocked unless overridden
+        self.profile = profile or ScrapeProfile()
+        self.pages_loaded = 0
+        self._bound = []
         self.setup_driver()
+
+    def bind(self, *scrapers):
+        """Keep ``scraper.driver`` in step with this controller's browser."""
+        for scraper in scrapers:
+            scraper.driver = self.driver
+            self._bound.append(scraper)
     
     def setup_driver(self):
         """Setup or reset the web driver."""
@@ -80,29 +312,54 @@ class WebDriverController:
             except Exception:
                 pass
         
-        options = Options()
-        options.add_argument("--start-maximized")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        # Uncomment to run without GUI:
-        # options.add_argument("--headless=new")
-        
+        options = self.profile.chrome_options()
+
         try:
             self.driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()), 
+                service=Service(resolve_chromedriver()), 
                 options=options
             )
             self.driver.execute_script(
                 "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
             )
+            if self.profile.measure or self.profile.blocked_patterns():
+                self.driver.page_meter = PageWeightMeter(self.driver, self.profile)
         except Exception as e:
             logging.error(f"Error setting up driver: {e}")
             raise
+        self.pages_loaded = 0
+        for scraper in self._bound:
+            scraper.driver = self.driver
+
+    def browser_rss_mb(self):
+        """Memory of chromedriver and its Chrome processes (None if unknown)."""
+        try:
+            pid = self.driver.service.process.pid
+        except AttributeError:
+            return None
+        return process_tree_rss_mb(pid)
+
+    def _recycle_reason(self):
+        limit = self.profile.recycle_after_pages
+        if limit and self.pages_loaded >= limit:
+            return "pages"
+        limit = self.profile.recycle_rss_mb
+        if limit and self.pages_loaded and self.pages_loaded % RSS_CHECK_EVERY == 0:
+            rss = self.browser_rss_mb()
+            if rss is not None and rss > limit:
+                return "memory"
+        return None
+
+    def start_page(self):
+        """Count a page about to load, restarting the browser first if it is due."""
+        reason = self._recycle_reason()
+        if reason:
+            logging.info(
+                f"Recycling browser after {self.pages_loaded} pages ({reason})"
+            )
+            metrics.inc("browser_recycles_total", reason=reason)
+            self.setup_driver()
+        self.pages_loaded += 1
 
     def close(self):
         """Close the browser session."""
@@ -117,20 +374,25 @@ class WebDriverController:
 class PropertyListScraper:
     """Scraper for property listing pages."""
     
-    def __init__(self, driver: webdriver.Chrome):
+    def __init__(self, driver: webdriver.Chrome, parser: str = None):
         self.driver = driver
+        self.parser_backend = parser
 
     def extract_links_and_prices(self) -> List[Dict]:
-        """Extract property URLs, titles, and prices from listing pages."""
-        time.sleep(1.0)
-        soup = BeautifulSoup(self.driver.page_source, "html.parser")
+        """Extract property URLs, titles, and prices from the loaded listing page."""
+        return self.parse_listing(self.driver.page_source, self.driver.current_url)
+
+    def parse_listing(self, html: str, page_url: str) -> List[Dict]:
+        """Extract property URLs, titles, and prices from listing page HTML."""
+        with metrics.timer("parse_seconds", scraper="PropertyListScraper"):
+            return self._parse_listing(html, page_url)
+
+    def _parse_listing(self, html: str, page_url: str) -> List[Dict]:
+        soup = make_soup(html, self.parser_backend)
         properties = []
 
         # Specific selectors for the target website
-        cards = soup.select(
-            "div.property-item, div.listing-card, div.item, "
-            "div.card, div.property, .list-item"
-        )
+        cards = soup.select(LISTING_CARD_SELECTOR)
         
         for card in cards:
             # Find links in different ways
@@ -147,13 +409,9 @@ class PropertyListScraper:
             href = link_tag.get("href", "").strip()
             if not href:
                 continue
-                
-            if href.startswith("/"):
-                base = (
-                    f"{urlparse(self.driver.current_url).scheme}://"
-                    f"{urlparse(self.driver.current_url).netloc}"
-                )
-                href = base + href
+
+            # Fetched as linked; canonicalize_url() is only used for lookups
+            href = urljoin(page_url, href)
 
             # Extract title
             title = "N/A"
@@ -229,28 +487,39 @@ class PropertyDetailScraper:
         "valor administración": "Administration Fee",
         "valor administracion": "Administration Fee"
     }
+    _matcher = None
 
-    def __init__(self, driver: webdriver.Chrome):
+    def __init__(self, driver: webdriver.Chrome, rate_limiter: HostRateLimiter = None,
+                 parser: str = None):
         self.driver = driver
+        self.rate_limiter = rate_limiter
+        self.parser_backend = parser
+        # Optional ParsePool; parse_detail() then runs in a worker process
+        self.parse_pool = None
         self.normalized_map = {
             normalize_text(k): v for k, v in self.FIELD_MAP.items()
         }
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(driver=None, rate_limiter=None, parse_pool=None)
+        return state
+
+    @classmethod
+    def _label_matcher(cls) -> "LabelMatcher":
+        """Matcher shared by all instances so its memo survives across pages."""
+        if cls._matcher is None:
+            cls._matcher = LabelMatcher(
+                {normalize_text(k): v for k, v in cls.FIELD_MAP.items()}
+            )
+        return cls._matcher
+
     def _match_label(self, label_text: str) -> str:
         """Match Spanish labels to English field names."""
-        key = normalize_text(label_text)
-        if key in self.normalized_map:
-            return self.normalized_map[key]
-        for k_norm, v in self.normalized_map.items():
-            if k_norm in key or key in k_norm:
-                return v
-        return None
+        return self._label_matcher().match(label_text)
 
-    def extract_detail(self, url: str, title: str, price: str) -> Dict:
-        """Extract detailed information from property page."""
-        logging.info(f"Opening detail page: {url}")
-        
-        # Initialize item with default values
+    def empty_item(self, url: str, title: str, price: str) -> Dict:
+        """Build a detail record with every field set to its default value."""
         item = {v: "N/A" for v in set(self.normalized_map.values())}
         item.update({
             "URL": url,
@@ -259,120 +528,374 @@ class PropertyDetailScraper:
             "Extraction Date": datetime.now().strftime("%Y-%m-%d %H:%M"),
             "Error": None
         })
+        return item
+
+    def extract_detail(self, url: str, title: str, price: str) -> Dict:
+        """Extract detailed information from property page."""
+        logging.info(f"Opening detail page: {url}")
+        
+        # Initialize item with default values
+        item = self.empty_item(url, title, price)
 
         for attempt in range(MAX_RETRIES):
             try:
-                self.driver.get(url)
-                # Wait for relevant content to load
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                human_pause()
+                # Wait for the detail block rather than a fixed delay
+                load_page(self.driver, url, DETAIL_READY_SELECTOR, self.rate_limiter)
                 break
             except Exception as e:
                 logging.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
+                metrics.inc("detail_retries_total")
                 if attempt == MAX_RETRIES - 1:
+                    metrics.inc("detail_failures_total")
                     item["Error"] = (
                         f"Failed to load after {MAX_RETRIES} attempts: {str(e)}"
                     )
                     return item
                 time.sleep(2)
 
-        soup = BeautifulSoup(self.driver.page_source, "html.parser")
+        return self.parse_html(self.driver.page_source, item)
 
-        # Multiple extraction strategies
-        extraction_methods = [
-            self._extract_from_dl,
-            self._extract_from_tables,
-            self._extract_from_lists,
-            self._extract_from_divs
-        ]
+    def parse_html(self, html: str, item: Dict) -> Dict:
+        """``parse_detail()`` in the parse pool when one is attached."""
+        if self.parse_pool is not None:
+            return self.parse_pool.call("parse_detail", html, item)
+        return self.parse_detail(html, item)
+
+    def parse_detail(self, html: str, item: Dict) -> Dict:
+        """Fill ``item`` with the fields found in a detail page's HTML."""
+        with metrics.timer("parse_seconds", scraper="PropertyDetailScraper"):
+            soup = make_soup(html, self.parser_backend)
+            with metrics.timer("label_extraction_seconds"):
+                candidates = self._collect_candidates(soup)
 
-        for method in extraction_methods:
-            extracted_data = method(soup)
-            if extracted_data:
-                for key, value in extracted_data.items():
-                    if value and value != "N/A":
-                        item[key] = value
+        # Later strategies override earlier ones, as in EXTRACTION_STRATEGIES
+        for strategy, extracted_data in zip(EXTRACTION_STRATEGIES, candidates):
+            found = 0
+            for key, value in extracted_data.items():
+                if value and value != "N/A":
+                    item[key] = value
+                    found += 1
+                    logging.debug(f"Found {key}: {value} from {strategy}")
+            if found:
+                metrics.inc("fields_found_total", found, strategy=strategy)
 
         return item
 
-    def _extract_from_dl(self, soup: BeautifulSoup) -> Dict:
-        """Extract data from definition lists (dl > dt + dd)."""
-        data = {}
-        for dl in soup.select("dl"):
-            dts = dl.find_all("dt")
-            for dt in dts:
-                dd = dt.find_next_sibling("dd")
+    def count_fields(self, item: Dict) -> int:
+        """Count the mapped fields that were actually found in ``item``."""
+        return sum(
+            1 for field in set(self.normalized_map.values())
+            if item.get(field, "N/A") != "N/A"
+        )
+
+    def _collect_candidates(self, soup: BeautifulSoup) -> List[Dict]:
+        """
+        Collect label/value pairs for every strategy in one document walk.
+
+        Returns one dict per strategy, in EXTRACTION_STRATEGIES order, mapping
+        each field to its winning value. The winner is the value the old
+        per-strategy loops would have written last: strategies visited
+        containers (dl/table/ul) in document order and every item below them,
+        so the last write comes from the latest-starting container, i.e. the
+        innermost one, and within it from the last item.
+        """
+        winners = [{} for _ in EXTRACTION_STRATEGIES]
+        positions = {}
+
+        def offer(strategy, field, value, rank):
+            current = winners[strategy].get(field)
+            if current is None or rank > current[0]:
+                winners[strategy][field] = (rank, value)
+
+        for position, tag in enumerate(soup.find_all(True)):
+            positions[id(tag)] = position
+            name = tag.name
+
+            if name == "dt":
+                container = tag.find_parent("dl")
+                if container is None:
+                    continue
+                dd = tag.find_next_sibling("dd")
                 if not dd:
                     continue
-                label = dt.get_text(" ", strip=True).replace(":", "")
+                label = tag.get_text(" ", strip=True).replace(":", "")
                 val = dd.get_text(" ", strip=True)
                 mapped = self._match_label(label)
                 if mapped and val:
-                    data[mapped] = val
-                    logging.debug(f"Found {mapped}: {val} from dl")
-        return data
-
-    def _extract_from_tables(self, soup: BeautifulSoup) -> Dict:
-        """Extract data from tables."""
-        data = {}
-        for table in soup.select("table"):
-            rows = table.select("tr")
-            for row in rows:
-                cells = row.select("td, th")
+                    offer(0, mapped, val, (positions[id(container)], position))
+
+            elif name == "tr":
+                container = tag.find_parent("table")
+                if container is None:
+                    continue
+                cells = tag.select("td, th")
                 if len(cells) >= 2:
                     label = cells[0].get_text(" ", strip=True).replace(":", "")
                     val = cells[1].get_text(" ", strip=True)
                     mapped = self._match_label(label)
                     if mapped and val:
-                        data[mapped] = val
-                        logging.debug(f"Found {mapped}: {val} from table")
-        return data
-
-    def _extract_from_lists(self, soup: BeautifulSoup) -> Dict:
-        """Extract data from unordered/ordered lists."""
-        data = {}
-        for ul in soup.select("ul"):
-            items = ul.select("li")
-            for item in items:
-                text = item.get_text(" ", strip=True)
+                        offer(1, mapped, val, (positions[id(container)], position))
+
+            elif name == "li":
+                container = tag.find_parent("ul")
+                if container is None:
+                    continue
+                text = tag.get_text(" ", strip=True)
                 # Look for patterns like "Habitaciones: 3"
                 if ":" in text:
-                    parts = text.split(":", 1)
-                    if len(parts) == 2:
-                        label = parts[0].strip()
-                        val = parts[1].strip()
-                        mapped = self._match_label(label)
-                        if mapped and val:
-                            data[mapped] = val
-                            logging.debug(f"Found {mapped}: {val} from list")
-        return data
-
-    def _extract_from_divs(self, soup: BeautifulSoup) -> Dict:
-        """Extract data from divs with common class patterns."""
-        data = {}
-        # Look for divs that might contain property information
-        property_divs = soup.select(
-            "div.property-info, div.details, div.characteristics"
+                    label, val = text.split(":", 1)
+                    mapped = self._match_label(label.strip())
+                    val = val.strip()
+                    if mapped and val:
+                        offer(2, mapped, val, (positions[id(container)], position))
+
+            elif name == "div" and DETAIL_DIV_CLASSES.intersection(tag.get("class") or ()):
+                text = tag.get_text(" ", strip=True)
+                for field, pattern in DETAIL_DIV_PATTERNS.items():
+                    match = pattern.search(text)
+                    if match:
+                        offer(3, field, match.group(1), (position,))
+
+        return [
+            {field: value for field, (_, value) in strategy.items()}
+            for strategy in winners
+        ]
+
+
+class FetchPathStats:
+    """
+    Per-domain record of which fetch path (HTTP or browser) produced a page.
+
+    While a domain has fewer than ``min_samples`` HTTP attempts, or while
+    HTTP succeeds at least ``http_threshold`` of the time, the HTTP path is
+    tried first. Otherwise only every ``probe_every``-th page probes HTTP so
+    the decision can change if the site starts serving full pages.
+    """
+
+    def __init__(self, min_samples: int = 5, http_threshold: float = 0.5,
+                 probe_every: int = 20):
+        self.min_samples = min_samples
+        self.http_threshold = http_threshold
+        self.probe_every = probe_every
+        self.domains = {}
+        self._lock = threading.Lock()
+
+    def _domain(self, domain: str) -> Dict:
+        return self.domains.setdefault(domain, {
+            "http_ok": 0, "http_failed": 0, "browser_ok": 0,
+            "browser_failed": 0, "requests": 0
+        })
+
+    def prefer_http(self, domain: str) -> bool:
+        """Decide whether the next page of ``domain`` should try HTTP first."""
+        with self._lock:
+            stats = self._domain(domain)
+            stats["requests"] += 1
+            attempts = stats["http_ok"] + stats["http_failed"]
+            if attempts < self.min_samples:
+                return True
+            if stats["http_ok"] / attempts >= self.http_threshold:
+                return True
+            return stats["requests"] % self.probe_every == 0
+
+    def record(self, domain: str, path: str, success: bool):
+        with self._lock:
+            key = f"{path}_{'ok' if success else 'failed'}"
+            self._domain(domain)[key] += 1
+
+    def save(self, path: str):
+        import json
+        with self._lock:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.domains, f, indent=4)
+
+    def load(self, path: str):
+        """Seed the statistics from a previous run, if any were saved."""
+        import json
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (IOError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable fetch stats {path}: {e}")
+            return
+        with self._lock:
+            for domain, stats in saved.items():
+                self._domain(domain).update(stats)
+
+
+class HybridDetailFetcher:
+    """
+    Fetch detail pages over plain HTTP, falling back to a browser.
+
+    The HTTP copy is accepted only when the extraction strategies find at
+    least ``min_fields`` mapped fields in it; otherwise the page is probably
+    rendered client-side and the browser path is used instead.
+    """
+
+    def __init__(self, session=None, stats: FetchPathStats = None,
+                 min_fields: int = HTTP_MIN_FIELDS, timeout: float = DEFAULT_TIMEOUT,
+                 rate_limiter: HostRateLimiter = None):
+        self.session = session or build_session()
+        self.rate_limiter = rate_limiter
+        self.stats = stats or FetchPathStats()
+        self.min_fields = min_fields
+        self.timeout = timeout
+        self.parser = PropertyDetailScraper(None)
+
+    def _try_http(self, url: str, title: str, price: str):
+        """Return a complete item parsed from a plain GET, or None."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url)
+        try:
+            with metrics.timer("fetch_seconds", scraper="HybridDetailFetcher"):
+                response = self.session.get(url, timeout=self.timeout)
+            metrics.inc("http_retries_total", retry_count(response))
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logging.debug(f"HTTP fetch failed for {url}: {e}")
+            return None
+
+        item = self.parser.parse_html(
+            response.text, self.parser.empty_item(url, title, price)
         )
-        for div in property_divs:
-            text = div.get_text(" ", strip=True)
-            # Look for common patterns
-            patterns = {
-                "Bedrooms": r"(\d+)\s*(?:alcoba|habitación|habitaciones|bedroom|bed)",
-                "Bathrooms": r"(\d+)\s*(?:baño|baños|bathroom|bath)",
-                "Garage": r"(\d+)\s*(?:garaje|garajes|garage|parking)"
-            }
-            
-            import re
-            for field, pattern in patterns.items():
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    data[field] = match.group(1)
-                    logging.debug(f"Found {field}: {match.group(1)} from div pattern")
-        
-        return data
+        if self.parser.count_fields(item) < self.min_fields:
+            return None
+        return item
+
+    def extract(self, prop: Dict, browser_extract) -> Dict:
+        """
+        Extract one listing, trying HTTP first when the domain stats allow.
+
+        ``browser_extract`` is called with ``(url, title, price)`` when the
+        HTTP copy is unusable or HTTP is not preferred for the domain.
+        """
+        url, title, price = prop["URL"], prop["Title"], prop["Price"]
+        domain = urlparse(url).netloc
+
+        if self.stats.prefer_http(domain):
+            item = self._try_http(url, title, price)
+            self.stats.record(domain, "http", item is not None)
+            metrics.inc("detail_fetch_total", path="http", ok=item is not None)
+            if item is not None:
+                logging.info(f"Fetched over HTTP: {url}")
+                return item
+
+        item = browser_extract(url, title, price)
+        self.stats.record(domain, "browser", not item.get("Error"))
+        metrics.inc("detail_fetch_total", path="browser", ok=not item.get("Error"))
+        return item
+
+
+class WebDriverPool:
+    """Bounded pool of WebDriverController instances shared by worker threads."""
+
+    def __init__(self, size: int, controller_factory=WebDriverController):
+        self.size = size
+        self._factory = controller_factory
+        self._idle = queue.Queue()
+        self._controllers = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> WebDriverController:
+        """Return an idle controller, starting a new browser while below size."""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if len(self._controllers) < self.size:
+                    ctrl = self._factory()
+                    self._controllers.append(ctrl)
+                    return ctrl
+
+            # Poll so a worker dropped by release() frees a slot for us
+            try:
+                return self._idle.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+    def release(self, ctrl: WebDriverController, broken: bool = False):
+        """
+        Return a controller to the pool.
+
+        A broken controller gets a fresh browser; if that fails too it is
+        dropped so a later acquire() can start a replacement.
+        """
+        if broken:
+            try:
+                ctrl.setup_driver()
+            except Exception as e:
+                logging.error(f"Could not restart browser, dropping worker: {e}")
+                ctrl.close()
+                with self._lock:
+                    self._controllers.remove(ctrl)
+                return
+        self._idle.put(ctrl)
+
+    def close(self):
+        """Close every browser started by the pool."""
+        with self._lock:
+            controllers, self._controllers = self._controllers, []
+        for ctrl in controllers:
+            ctrl.close()
+
+
+class DetailDispatcher:
+    """Spread detail URLs across a WebDriverPool and collect results in order."""
+
+    def __init__(self, pool: WebDriverPool, hybrid: HybridDetailFetcher = None,
+                 rate_limiter: HostRateLimiter = None, parse_pool: ParsePool = None):
+        self.pool = pool
+        self.hybrid = hybrid
+        self.rate_limiter = rate_limiter
+        self.parse_pool = parse_pool
+
+    def _scrape_one(self, prop: Dict) -> Dict:
+        if self.hybrid is not None:
+            return self.hybrid.extract(
+                prop, lambda url, title, price: self._browser_scrape(prop)
+            )
+        return self._browser_scrape(prop)
+
+    def _browser_scrape(self, prop: Dict) -> Dict:
+        """Scrape one listing, retrying once on a fresh browser if the worker fails."""
+        error = None
+        for attempt in range(2):
+            ctrl = None
+            broken = False
+            try:
+                ctrl = self.pool.acquire()
+                ctrl.start_page()
+                detail_scraper = PropertyDetailScraper(ctrl.driver, self.rate_limiter)
+                detail_scraper.parse_pool = self.parse_pool
+                return detail_scraper.extract_detail(
+                    prop["URL"], prop["Title"], prop["Price"]
+                )
+            except Exception as e:
+                broken = True
+                metrics.inc("worker_failures_total")
+                logging.warning(
+                    f"Worker failed on {prop['URL']} (attempt {attempt + 1}): {e}"
+                )
+                error = str(e)
+            finally:
+                if ctrl is not None:
+                    self.pool.release(ctrl, broken=broken)
+
+        item = PropertyDetailScraper(None).empty_item(
+            prop["URL"], prop["Title"], prop["Price"]
+        )
+        item["Error"] = f"Worker failed: {error}"
+        return item
+
+    def scrape(self, props: List[Dict]) -> List[Dict]:
+        """Scrape all listings concurrently; results keep the order of ``props``."""
+        with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            return list(executor.map(self._scrape_one, props))
 
 
 class PropertyExporter:
@@ -388,6 +911,9 @@ class PropertyExporter:
     @staticmethod
     def save_files(sales_data: List[Dict], rentals_data: List[Dict]):
         """Save only CSV files: sales, rentals, and combined."""
+        # pandas is only needed here; importing it lazily keeps startup fast
+        import pandas as pd
+
         PropertyExporter.ensure_folder_exists()
         
         # Save sales data
@@ -422,6 +948,100 @@ class PropertyExporter:
             json.dump(data, f, ensure_ascii=False, indent=4)
         logging.info(f"JSON saved: {path}")
 
+    @staticmethod
+    def open_stream(save_every: int, append: bool = False) -> BatchSink:
+        """
+        Open the incremental outputs: sales/rentals/combined CSVs and the
+        JSONL stream, written every ``save_every`` records.
+        """
+        PropertyExporter.ensure_folder_exists()
+
+        def path(name):
+            return os.path.join(DATA_FOLDER, name)
+
+        writers = [
+            FilteredWriter(
+                CsvWriter(path("properties_sales.csv"), append=append),
+                lambda record: record.get("Section") == "Sales",
+            ),
+            FilteredWriter(
+                CsvWriter(path("properties_rentals.csv"), append=append),
+                lambda record: record.get("Section") != "Sales",
+            ),
+            CsvWriter(path("properties_all.csv"), append=append),
+            JsonlWriter(path(STREAM_FILE), append=append),
+        ]
+        writers.append(PropertyExporter.open_listing_store())
+        if PARQUET_EXPORT:
+            if parquet_available():
+                writers.append(PropertyExporter.open_parquet(append=append))
+            else:
+                logging.warning("pyarrow is not installed, skipping the Parquet export")
+        return BatchSink(writers, batch_size=save_every)
+
+    @staticmethod
+    def open_listing_store() -> ListingStore:
+        """
+        Open the SQLite listing store. Unlike the files it is never reset,
+        so it accumulates every run and can be queried with ``find()``.
+        """
+        PropertyExporter.ensure_folder_exists()
+        return ListingStore(
+            os.path.join(DATA_FOLDER, LISTING_STORE_FILE), convert=typed_record
+        )
+
+    @staticmethod
+    def open_parquet(append: bool = False) -> ParquetWriter:
+        """
+        Open the typed Parquet dataset under PARQUET_FOLDER, one file per
+        batch and partition, partitioned by Section and extraction date.
+        """
+        PropertyExporter.ensure_folder_exists()
+        return ParquetWriter(
+            os.path.join(DATA_FOLDER, PARQUET_FOLDER),
+            parquet_columns(),
+            partition_by=("Section", "extraction_date"),
+            convert=typed_record,
+            append=append,
+        )
+
+    @staticmethod
+    def save_parquet(data: List[Dict]):
+        """Write ``data`` as a fresh Parquet dataset."""
+        writer = PropertyExporter.open_parquet(append=False)
+        writer.write_batch(data)
+        writer.close()
+        logging.info(
+            f"Parquet saved: {os.path.join(DATA_FOLDER, PARQUET_FOLDER)} "
+            f"({len(data)} records)"
+        )
+
+    @staticmethod
+    def save_json_from_stream(filename: str, stream_file: str = STREAM_FILE):
+        """
+        Convert the JSONL stream into the indented JSON array export one
+        record at a time, so memory does not grow with the crawl.
+        """
+        import json
+        PropertyExporter.ensure_folder_exists()
+        source = os.path.join(DATA_FOLDER, stream_file)
+        path = os.path.join(DATA_FOLDER, filename)
+        tmp_path = path + ".tmp"
+        count = 0
+        with open(source, "r", encoding="utf-8") as src, \
+                open(tmp_path, "w", encoding="utf-8") as dst:
+            dst.write("[")
+            for line in src:
+                if not line.strip():
+                    continue
+                record = json.dumps(json.loads(line), ensure_ascii=False, indent=4)
+                dst.write(",\n" if count else "\n")
+                dst.write("\n".join("    " + row for row in record.split("\n")))
+                count += 1
+            dst.write("\n]" if count else "]")
+        os.replace(tmp_path, path)
+        logging.info(f"JSON saved: {path} ({count} records)")
+
 
 class RealEstateScraper(Scraper):
     """
@@ -429,19 +1049,78 @@ class RealEstateScraper(Scraper):
     Uses Selenium for dynamic content scraping.
     """
 
-    def __init__(self, save_every: int = SAVE_BATCH):
+    def __init__(
+        self,
+        save_every: int = SAVE_BATCH,
+        detail_workers: int = DETAIL_WORKERS,
+        http_first: bool = HTTP_FIRST,
+        keep_in_memory: bool = False,
+        resume: bool = True,
+        incremental: bool = True,
+        listing_prefetch: int = PAGE_PREFETCH,
+        listing_browsers: int = LISTING_BROWSERS,
+        profile: ScrapeProfile = None,
+        parse_workers: int = PARSE_WORKERS,
+    ):
         # Initialize parent with empty endpoints since we use Selenium
         super().__init__(
             base_url="https://bogotarealestate.com.co", 
             endpoints=[]
         )
-        self.ctrl = WebDriverController()
+        # Browser settings shared by every browser the scraper starts
+        self.profile = profile or ScrapeProfile()
+        self.ctrl = WebDriverController(self.profile)
+        # Sequential detail pages (and fetch_html) share this browser
+        self._browser_lock = threading.Lock()
+        # Shared by every browser and HTTP request so the site sees one client
+        self.rate_limiter = HostRateLimiter(REQUESTS_PER_SECOND, RATE_BURST)
         self.list_scraper = PropertyListScraper(self.ctrl.driver)
-        self.detail_scraper = PropertyDetailScraper(self.ctrl.driver)
+        self.detail_scraper = PropertyDetailScraper(self.ctrl.driver, self.rate_limiter)
+        # Both follow the main browser when it is recycled
+        self.ctrl.bind(self.list_scraper, self.detail_scraper)
         self.save_every = save_every
+        # Extra browsers for detail pages; sequential details stay on self.ctrl
+        self.detail_pool = (
+            WebDriverPool(detail_workers, lambda: WebDriverController(self.profile))
+            if detail_workers > 1 else None
+        )
+        self.hybrid = None
+        # Listing pages load ahead of the detail work; see ListingPaginator
+        self.listing_prefetch = listing_prefetch
+        # Browsers of their own, so prefetch threads load pages side by side
+        # and never wait on detail scraping; started on first use
+        self.listing_pool = WebDriverPool(
+            max(1, min(listing_browsers, listing_prefetch or 1)),
+            lambda: WebDriverController(self.profile),
+        )
+        self.listing_stats = FetchPathStats()
+        if http_first:
+            stats = FetchPathStats()
+            stats.load(os.path.join(DATA_FOLDER, PATH_STATS_FILE))
+            self.hybrid = HybridDetailFetcher(
+                session=self.session, stats=stats, rate_limiter=self.rate_limiter
+            )
+        # Detail HTML from the browsers and from HTTP is parsed off the GIL
+        self.parse_pool = None
+        if parse_workers:
+            self.parse_pool = ParsePool(PropertyDetailScraper(None), parse_workers)
+            self.detail_scraper.parse_pool = self.parse_pool
+            if self.hybrid is not None:
+                self.hybrid.parser.parse_pool = self.parse_pool
+        # False (the default) keeps memory flat: records only go to the
+        # incremental outputs; True also keeps sales_data/rentals_data
+        self.keep_in_memory = keep_in_memory
+        # Continue an interrupted run from crawl_state.sqlite instead of page 1
+        self.resume = resume
+        # Reuse stored details for listings whose card did not change
+        self.incremental = incremental
+        self.carried_forward = 0
+        self.state = None
+        self.sink = None
         self.sales_data = []
         self.rentals_data = []
-        self.processed_urls = set()
+        # SeenSet of canonical detail URLs, opened by _start_run()
+        self.processed_urls = None
 
     def parse(self, html):
         """
@@ -450,17 +1129,154 @@ class RealEstateScraper(Scraper):
         """
         return []
 
+    def _scrape_details(self, props: List[Dict]) -> List[Dict]:
+        """Scrape detail pages for ``props``, returning results in the same order."""
+        if self.detail_pool is not None:
+            return DetailDispatcher(
+                self.detail_pool, self.hybrid, self.rate_limiter, self.parse_pool
+            ).scrape(props)
+        if self.hybrid is not None:
+            return [
+                self.hybrid.extract(prop, self._extract_in_browser)
+                for prop in props
+            ]
+        return [
+            self._extract_in_browser(prop["URL"], prop["Title"], prop["Price"])
+            for prop in props
+        ]
+
+    def _extract_in_browser(self, url: str, title: str, price: str) -> Dict:
+        with self._browser_lock:
+            self.ctrl.start_page()
+            return self.detail_scraper.extract_detail(url, title, price)
+
+    def _fetch_listing_http(self, page_url: str) -> List[Dict]:
+        """Listings from a plain GET of ``page_url`` (empty if unusable)."""
+        self.rate_limiter.acquire(page_url)
+        try:
+            with metrics.timer("fetch_seconds", scraper="listing"):
+                response = self.session.get(page_url, timeout=self.timeout)
+            metrics.inc("http_retries_total", retry_count(response))
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logging.debug(f"HTTP fetch failed for {page_url}: {e}")
+            return []
+        return self.list_scraper.parse_listing(response.text, page_url)
+
+    def _load_listing(self, page_url: str) -> List[Dict]:
+        """
+        Listings of one page: over HTTP when the site serves them that way
+        (only with ``http_first``), otherwise in a browser leased from
+        ``listing_pool``.
+        """
+        domain = urlparse(page_url).netloc
+        if self.hybrid is not None and self.listing_stats.prefer_http(domain):
+            with metrics.timer("listing_load_seconds", path="http"):
+                props = self._fetch_listing_http(page_url)
+            self.listing_stats.record(domain, "http", bool(props))
+            if props:
+                metrics.inc("listing_pages_total", path="http")
+                return props
+
+        logging.info(f"Loading page: {page_url}")
+        ctrl = self.listing_pool.acquire()
+        broken = False
+        try:
+            with metrics.timer("listing_load_seconds", path="browser"):
+                ctrl.start_page()
+                # Returns as soon as listing cards render
+                load_page(ctrl.driver, page_url, LISTING_CARD_SELECTOR, self.rate_limiter)
+                props = self.list_scraper.parse_listing(
+                    ctrl.driver.page_source, ctrl.driver.current_url
+                )
+        except Exception:
+            # Restart this browser; the paginator reports the failed page
+            broken = True
+            raise
+        finally:
+            self.listing_pool.release(ctrl, broken=broken)
+        metrics.inc("listing_pages_total", path="browser")
+        return props
+
+    def _carry_forward(self, prop: Dict):
+        """Return the stored detail record if the listing card is unchanged."""
+        previous = self.state.previous_listing(prop["URL"])
+        if previous is None:
+            return None
+        fingerprint, record = previous
+        if fingerprint != listing_fingerprint(prop):
+            return None
+        return record
+
+    def _resolve_details(self, props: List[Dict]) -> List[Dict]:
+        """
+        Details for ``props`` in order: unchanged listings are carried
+        forward from the previous run, the rest are scraped.
+        """
+        carried = [
+            self._carry_forward(prop) if self.incremental else None
+            for prop in props
+        ]
+        to_fetch = [prop for prop, record in zip(props, carried) if record is None]
+        with metrics.timer("detail_batch_seconds"):
+            fetched = iter(self._scrape_details(to_fetch))
+        self.carried_forward += len(props) - len(to_fetch)
+        metrics.inc("listings_carried_forward_total", len(props) - len(to_fetch))
+        if len(props) > len(to_fetch):
+            logging.info(
+                f"Carried forward {len(props) - len(to_fetch)} unchanged properties"
+            )
+        return [
+            record if record is not None else next(fetched)
+            for record in carried
+        ]
+
+    def _write_run_report(self):
+        """Write the stage timings and counters of this run as JSON."""
+        cache = PropertyDetailScraper._label_matcher().match.cache_info()
+        metrics.set_gauge("label_cache_hits", cache.hits)
+        metrics.set_gauge("label_cache_misses", cache.misses)
+        PropertyExporter.ensure_folder_exists()
+        path = os.path.join(DATA_FOLDER, RUN_REPORT_FILE)
+        metrics.write_report(
+            path,
+            scraper=type(self).__name__,
+            records_written=self.sink.written if self.sink else 0,
+            carried_forward=self.carried_forward,
+            page_weight=page_weight_savings(),
+        )
+        logging.info(f"Run report saved: {path}")
+
+    def _on_batch_saved(self, batch: List[Dict]):
+        """Record a batch as done only once it is safely in the output files."""
+        self.state.mark_details(batch)
+        self.state.remember_listings(batch, listing_fingerprint)
+        self.state.flush()
+
+    def _start_run(self):
+        """Open the crawl state and outputs, resuming an interrupted run if any."""
+        PropertyExporter.ensure_folder_exists()
+        self.state = CrawlStateStore(os.path.join(DATA_FOLDER, STATE_FILE))
+        resuming = self.state.start(resume=self.resume)
+        self.processed_urls = SeenSet(os.path.join(DATA_FOLDER, SEEN_FILE), fresh=True)
+        if resuming:
+            for url in self.state.completed_urls():
+                self.processed_urls.add(canonicalize_url(url))
+            logging.info(
+                f"Resuming interrupted run: {len(self.processed_urls)} "
+                f"properties already processed"
+            )
+        self.sink = PropertyExporter.open_stream(self.save_every, append=resuming)
+        self.sink.on_flush = self._on_batch_saved
+
     def fetch_html(self, endpoint):
         """
         Override parent method to use Selenium instead of requests.
         """
         url = self.base_url + endpoint
         try:
-            self.ctrl.driver.get(url)
-            WebDriverWait(self.ctrl.driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            human_pause()
+            self.ctrl.start_page()
+            load_page(self.ctrl.driver, url, "body", self.rate_limiter)
             return self.ctrl.driver.page_source
         except Exception as error:
             logging.error(f"Request failed for {url}: {error}")
@@ -471,6 +1287,7 @@ class RealEstateScraper(Scraper):
         Override base run method using Selenium logic.
         This is the main scraping orchestration method.
         """
+        self._start_run()
         try:
             sections = {
                 "Sales": (
@@ -484,101 +1301,124 @@ class RealEstateScraper(Scraper):
             }
 
             for section, template in sections.items():
+                if self.state.section_done(section):
+                    logging.info(f"Section {section} already completed, skipping")
+                    continue
+
                 logging.info(f"Starting section: {section}")
-                page = 1
-                section_new_properties = []
-                
-                while page <= MAX_PAGES:
-                    page_url = build_page_url_from_template(template, page)
-                    logging.info(f"Loading page {page}: {page_url}")
-                    
-                    try:
-                        self.ctrl.driver.get(page_url)
-                        WebDriverWait(self.ctrl.driver, 15).until(
-                            EC.presence_of_element_located((By.TAG_NAME, "body"))
+                section_count = 0
+                section_complete = True
+                pages = ListingPaginator(
+                    lambda page, template=template: build_page_url_from_template(
+                        template, page
+                    ),
+                    self._load_listing,
+                    start_page=self.state.last_page(section) + 1,
+                    prefetch=self.listing_prefetch,
+                    max_pages=MAX_PAGES,
+                )
+
+                try:
+                    for page, page_url, props in pages:
+                        logging.info(
+                            f"Processing {len(props)} properties from page {page}"
                         )
-                        human_pause()
-                    except Exception as e:
-                        logging.error(f"Error loading {page_url}: {e}")
-                        break
 
-                    props = self.list_scraper.extract_links_and_prices()
-                    if not props:
-                        logging.info(f"No properties found on page {page}, ending section")
-                        break
+                        new_props = []
+                        for prop in props:
+                            # Skip if URL already processed
+                            if not self.processed_urls.add(canonicalize_url(prop["URL"])):
+                                metrics.inc("duplicates_skipped_total")
+                                logging.info(
+                                    f"Skipping duplicate: {prop['Title'][:50]}..."
+                                )
+                                continue
+
+                            logging.info(f"Processing: {prop['Title'][:50]}...")
+                            new_props.append(prop)
+
+                        for detail in self._resolve_details(new_props):
+                            detail["Section"] = section
+                            section_count += 1
+                            # Written to disk every save_every records
+                            self.sink.add(detail)
+
+                            if not self.keep_in_memory:
+                                continue
+                            # Add to appropriate list
+                            if section == "Sales":
+                                self.sales_data.append(detail)
+                            else:
+                                self.rentals_data.append(detail)
 
-                    logging.info(f"Processing {len(props)} properties from page {page}")
-                    
-                    for i, prop in enumerate(props):
-                        # Skip if URL already processed
-                        if prop["URL"] in self.processed_urls:
-                            logging.info(f"Skipping duplicate: {prop['Title'][:50]}...")
-                            continue
-                            
-                        logging.info(f"Processing: {prop['Title'][:50]}...")
-                        
-                        detail = self.detail_scraper.extract_detail(
-                            prop["URL"], prop["Title"], prop["Price"]
+                        logging.info(
+                            f"Section {section} progress: "
+                            f"{section_count} new properties on page {page}"
                         )
-                        detail["Section"] = section
-                        
-                        self.processed_urls.add(prop["URL"])
-                        section_new_properties.append(detail)
-                        
-                        # Add to appropriate list
-                        if section == "Sales":
-                            self.sales_data.append(detail)
-                        else:
-                            self.rentals_data.append(detail)
-
-                    # Log progress but don't save intermediate files
-                    logging.info(
-                        f"Section {section} progress: "
-                        f"{len(section_new_properties)} new properties on page {page}"
-                    )
 
-                    page += 1
+                        # Saved with the next batch, after this page's records
+                        self.state.mark_page(section, page, page_url)
+                except ListingLoadError as e:
+                    logging.error(str(e))
+                    section_complete = False
 
+                if section_complete:
+                    self.state.mark_section(section)
                 logging.info(
-                    f"Completed {section} section: {len(section_new_properties)} new properties"
+                    f"Completed {section} section: {section_count} new properties"
                 )
 
-            # Final export - only CSV files and JSON
+            # CSVs are already on disk; finish them and build the JSON export
             logging.info("Saving final data files...")
-            PropertyExporter.save_files(self.sales_data, self.rentals_data)
-            PropertyExporter.save_json(
-                self.sales_data + self.rentals_data, 
-                "properties_all.json"
-            )
+            self.sink.close()
+            self.state.finish()
+            PropertyExporter.save_json_from_stream("properties_all.json")
             
             # Store data in parent class for compatibility
             self.data = self.sales_data + self.rentals_data
             
             logging.info(
                 f"Scraping completed. "
-                f"Sales: {len(self.sales_data)}, "
-                f"Rentals: {len(self.rentals_data)}, "
-                f"Total: {len(self.data)}"
+                f"Total written: {self.sink.written}, "
+                f"Carried forward: {self.carried_forward}, "
+                f"Sales kept in memory: {len(self.sales_data)}, "
+                f"Rentals kept in memory: {len(self.rentals_data)}"
             )
 
         except Exception as e:
             logging.error(f"Critical error in scraper: {e}")
-            # Try to save collected data
-            if self.sales_data or self.rentals_data:
-                PropertyExporter.save_files(self.sales_data, self.rentals_data)
-                logging.info(
-                    f"Saved partial data: "
-                    f"{len(self.sales_data)} sales, "
-                    f"{len(self.rentals_data)} rentals"
-                )
+            # Everything but the pending batch is already on disk
+            self.sink.close()
+            self.state.flush()
+            logging.info(
+                f"Saved partial data: {self.sink.written} properties; "
+                f"the next run resumes from here"
+            )
             raise
         finally:
+            self._write_run_report()
+            self.state.close()
+            self.processed_urls.close()
             self.ctrl.close()
+            self.listing_pool.close()
+            if self.detail_pool is not None:
+                self.detail_pool.close()
+            if self.parse_pool is not None:
+                self.parse_pool.close()
+            if self.hybrid is not None:
+                PropertyExporter.ensure_folder_exists()
+                self.hybrid.stats.save(os.path.join(DATA_FOLDER, PATH_STATS_FILE))
 
     def save_data(self, filename=None, folder=DATA_FOLDER):
         """
         Override parent save method to use our custom exporter.
+
+        Does nothing after run(): its outputs were already streamed to disk,
+        and a resumed run only holds this process's records in memory.
         """
+        if self.sink is not None:
+            logging.info("Outputs were streamed during run(); nothing to re-export")
+            return
         if not self.data:
             logging.warning("No data to save.")
             return
@@ -589,6 +1429,11 @@ class RealEstateScraper(Scraper):
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
     logging.info("Starting RealEstateScraper test run...")
     scraper = RealEstateScraper(save_every=SAVE_BATCH)
     scraper.run()
@@ -0,0 +1,50 @@
+import importlib
+
+
+class ScraperEntry:
+    """Where a scraper lives; its module is imported only when it is used."""
+
+    def __init__(self, name: str, module: str, class_name: str, label: str,
+                 url_input: bool = True, shardable: bool = True):
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+        self.label = label
+        # Whether the scraper takes an endpoint/URL list (batch mode, sharding)
+        self.url_input = url_input
+        # Whether its URL list may be split across shards or queue workers;
+        # a crawler follows links from its seeds, so shards would overlap
+        self.shardable = url_input and shardable
+
+    def load(self) -> type:
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+
+# Menu order; heavy dependencies (selenium, pandas) stay out of wiki runs
+SCRAPERS = {
+    entry.name: entry for entry in (
+        ScraperEntry(
+            "wiki", "src.models.wiki_scraper", "WikiScraper", "Wikipedia Scraper"
+        ),
+        ScraperEntry(
+            "wikicrawl", "src.models.wiki_crawler", "WikiCrawler",
+            "Wikipedia Crawler (follows links from the seed articles)",
+            shardable=False,
+        ),
+        ScraperEntry(
+            "realestate", "src.models.realestate_scraper", "RealEstateScraper",
+            "Real Estate Scraper (BogotaRealEstate)", url_input=False,
+        ),
+    )
+}
+
+
+def load_scraper(name: str) -> type:
+    """Import and return the scraper class registered as ``name``."""
+    try:
+        entry = SCRAPERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown scraper {name!r}; choose from {', '.join(SCRAPERS)}"
+        ) from None
+    return entry.load()
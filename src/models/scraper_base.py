@@ -1,33 +1,122 @@
 import requests
 import json
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from src.models.transport import (
+    build_session,
+    DEFAULT_BACKOFF,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT,
+    retry_count,
+)
+from src.models.metrics import metrics
+from src.models.parse_pool import ParsePool
+
+
+QUEUE_POLL_INTERVAL = 1.0  # Seconds between lease attempts while others hold items
+
+
+class HostLimiter:
+    """Limit how many requests may be in flight against a single host."""
+
+    def __init__(self, per_host=None):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, url):
+        if not self.per_host:
+            yield
+            return
+        semaphore = self._semaphore(urlparse(url).netloc)
+        start = time.perf_counter()
+        with semaphore:
+            metrics.observe("host_slot_wait_seconds", time.perf_counter() - start)
+            yield
 
 
 class Scraper:
-    def __init__(self, base_url=None, endpoints=None):
+    def __init__(
+        self,
+        base_url=None,
+        endpoints=None,
+        max_workers=1,
+        per_host_limit=None,
+        preserve_order=True,
+        retries=DEFAULT_RETRIES,
+        backoff_factor=DEFAULT_BACKOFF,
+        timeout=DEFAULT_TIMEOUT,
+        cache=None,
+        sink=None,
+        report_path=None,
+        parse_workers=None,
+    ):
         self.base_url = base_url or ""
         self.endpoints = endpoints or []
-        self.session = requests.Session()
+        # One pooled connection per worker so threads never wait on the pool
+        self.session = build_session(
+            pool_maxsize=max(max_workers or 1, DEFAULT_POOL_SIZE),
+            retries=retries,
+            backoff_factor=backoff_factor,
+        )
+        self.timeout = timeout
+        # Optional ResponseCache; None always downloads the full page
+        self.cache = cache
+        # Optional BatchSink; when set, parsed items are streamed to disk
+        # instead of being kept in self.data
+        self.sink = sink
+        # Optional path of the JSON run report written at the end of run()
+        self.report_path = report_path
         self.data = []
+        # Concurrency settings: max_workers=1 keeps the sequential behaviour
+        self.max_workers = max_workers
+        self.preserve_order = preserve_order
+        self.host_limiter = HostLimiter(per_host_limit)
+        # Parse in this many processes (see ParsePool); None parses in the
+        # fetch threads
+        self.parse_workers = parse_workers
+
+    def __getstate__(self):
+        """Only the parsing configuration travels to ParsePool workers."""
+        state = self.__dict__.copy()
+        for name in ("session", "cache", "sink", "host_limiter", "endpoints"):
+            state[name] = None
+        state["data"] = []
+        return state
+
+    def build_url(self, endpoint: str) -> str:
+        # Absolute URLs (e.g. from a batch URL file) are used as they are
+        if "://" in endpoint:
+            return endpoint
+        return f"{self.base_url}{endpoint}"
 
     def fetch_html(self, endpoint: str) -> str:
-        url = f"{self.base_url}{endpoint}"
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Connection": "keep-alive",
-        }
+        url = self.build_url(endpoint)
+        scraper = type(self).__name__
 
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            return response.text
+            with metrics.timer("fetch_seconds", scraper=scraper):
+                if self.cache is not None:
+                    return self.cache.fetch(self.session, url, timeout=self.timeout)
+                response = self.session.get(url, timeout=self.timeout)
+                metrics.inc("http_retries_total", retry_count(response))
+                response.raise_for_status()
+                return response.text
         except requests.exceptions.RequestException as e:
+            metrics.inc("fetch_failures_total", scraper=scraper)
             print(f"Request failed: {e}")
             return ""
 
@@ -51,21 +140,177 @@ class Scraper:
         except IOError as error:
             print("Error saving data:", error)
 
+    def _fetch_endpoint(self, endpoint):
+        """Fetch a single endpoint, honouring the per-host limit."""
+        with self.host_limiter.slot(self.build_url(endpoint)):
+            html = self.fetch_html(endpoint)
+        if html:
+            metrics.inc("pages_total", scraper=type(self).__name__)
+        return html
+
+    def _scrape_endpoint(self, endpoint):
+        """Fetch and parse a single endpoint."""
+        html = self._fetch_endpoint(endpoint)
+        if not html:
+            return None
+        with metrics.timer("parse_seconds", scraper=type(self).__name__):
+            return self.parse(html)
+
+    def _fetch_to_pool(self, endpoint, pool):
+        """Fetch an endpoint and queue its parse; blocks while the pool is full."""
+        html = self._fetch_endpoint(endpoint)
+        if not html:
+            return None
+        return pool.submit("parse", html)
+
+    def _collect(self, parsed_items):
+        if parsed_items:
+            if not isinstance(parsed_items, list):
+                parsed_items = [parsed_items]
+            if self.sink is not None:
+                for item in parsed_items:
+                    self.sink.add(item)
+            else:
+                self.data.extend(parsed_items)
+
+    def _iter_concurrent(self, endpoints):
+        """
+        Yield parsed results from a thread pool.
+
+        At most ``2 * max_workers`` endpoints are in flight at once so long
+        endpoint lists are not materialised as futures up front. Results are
+        yielded in input order when ``preserve_order`` is set, otherwise as
+        soon as they complete.
+        """
+        window = self.max_workers * 2
+        endpoints = iter(endpoints)
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def submit_next():
+                endpoint = next(endpoints, None)
+                if endpoint is None:
+                    return False
+                pending.append(executor.submit(self._scrape_endpoint, endpoint))
+                return True
+
+            while len(pending) < window and submit_next():
+                pass
+
+            while pending:
+                if self.preserve_order:
+                    done = [pending.popleft()]
+                else:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    done = [f for f in pending if f in finished]
+                    for future in done:
+                        pending.remove(future)
+
+                for future in done:
+                    submit_next()
+                    yield future.result()
+
+    def _iter_pipeline(self, endpoints, pool):
+        """
+        Yield parsed results in input order, fetching in threads and parsing
+        in ``pool``.
+
+        Fetch threads hand raw HTML to the pool and block while it has
+        ``pool.max_pending`` jobs, so at most ``max_workers + max_pending``
+        pages are held in memory however fast the site responds.
+        """
+        workers = max(self.max_workers or 1, 1)
+        window = workers + pool.max_pending
+        pending = deque()
+
+        def result(future):
+            parse_future = future.result()
+            return None if parse_future is None else parse_future.result()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for endpoint in endpoints:
+                pending.append(executor.submit(self._fetch_to_pool, endpoint, pool))
+                if len(pending) >= window:
+                    yield result(pending.popleft())
+            while pending:
+                yield result(pending.popleft())
+
     def run(self):
         if not self.endpoints:
             print("No endpoints defined.")
             return
 
-        for endpoint in self.endpoints:
-            html = self.fetch_html(endpoint)
-            if not html:
+        if self.parse_workers:
+            with ParsePool(self, self.parse_workers) as pool:
+                for parsed_items in self._iter_pipeline(self.endpoints, pool):
+                    self._collect(parsed_items)
+        elif self.max_workers and self.max_workers > 1:
+            for parsed_items in self._iter_concurrent(self.endpoints):
+                self._collect(parsed_items)
+        else:
+            for endpoint in self.endpoints:
+                self._collect(self._scrape_endpoint(endpoint))
+        self._finish()
+
+    def run_queue(self, queue, lease_size=None):
+        """
+        Scrape endpoints leased from a WorkQueue until none are left.
+
+        A leased batch is acked only once its results are in the sink (or
+        ``self.data``), and its leases are extended while it runs; endpoints
+        that could not be downloaded are handed back for a delayed retry.
+        While items are held by other workers or waiting for a retry the
+        loop keeps polling, so items of a worker that died are picked up
+        when their lease expires.
+        """
+        lease_size = lease_size or max(self.max_workers or 1, 1) * 2
+        while True:
+            leases = queue.lease(lease_size)
+            if not leases:
+                stats = queue.stats()
+                if not (stats.get("leased") or stats.get("ready")):
+                    break
+                time.sleep(QUEUE_POLL_INTERVAL)
                 continue
 
-            parsed_items = self.parse(html)
-            if parsed_items:
-                if isinstance(parsed_items, list):
-                    self.data.extend(parsed_items)
-                else:
-                    self.data.append(parsed_items)
+            results = self._scrape_leases(queue, leases)
+
+            done = []
+            for lease, parsed_items in zip(leases, results):
+                if parsed_items is None:
+                    queue.nack(lease, "fetch failed")
+                    continue
+                self._collect(parsed_items)
+                done.append(lease)
+            if self.sink is not None:
+                self.sink.flush()
+            queue.ack(done)
+        self._finish()
+
+    def _scrape_leases(self, queue, leases) -> list:
+        """
+        Scrape the leased endpoints in order, extending their leases every
+        third of the visibility timeout so a slow batch is not leased again.
+        """
+        interval = queue.visibility_timeout / 3
+        with ThreadPoolExecutor(max_workers=max(self.max_workers or 1, 1)) as executor:
+            futures = [
+                executor.submit(self._scrape_endpoint, lease.payload) for lease in leases
+            ]
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=interval)
+                if pending:
+                    for lease in leases:
+                        queue.extend(lease)
+            return [future.result() for future in futures]
+
+    def _finish(self):
+        if self.sink is not None:
+            self.sink.close()
+            print("Scraping completed. Total items written:", self.sink.written)
+        else:
+            print("Scraping completed. Total items:", len(self.data))
 
-        print("Scraping completed. Total items:", len(self.data))
+        if self.report_path:
+            metrics.write_report(self.report_path, scraper=type(self).__name__)
@@ -0,0 +1,264 @@
+import csv
+import importlib.util
+import io
+import json
+import os
+import shutil
+import time
+import uuid
+from urllib.parse import quote
+
+from src.models.metrics import metrics
+
+
+def _fsync_dir(folder: str):
+    """Persist a rename inside ``folder`` (no-op where unsupported)."""
+    try:
+        fd = os.open(folder or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class AppendOnlyFile:
+    """
+    File that grows one committed batch at a time.
+
+    After each batch is written and fsynced, its end offset is recorded in a
+    ``<path>.commit`` sidecar (replaced atomically). On open, anything past
+    the committed offset is a batch torn by a crash and is truncated, so
+    readers never see half a batch and a crash loses at most one batch.
+    """
+
+    def __init__(self, path: str, append: bool = True):
+        self.path = path
+        self.commit_path = path + ".commit"
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        if not append:
+            open(path, "wb").close()
+            self._write_commit(0)
+        self._repair()
+
+    def _read_commit(self):
+        try:
+            with open(self.commit_path, "r", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (IOError, ValueError):
+            return None
+
+    def _write_commit(self, offset: int):
+        tmp = self.commit_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.commit_path)
+        _fsync_dir(os.path.dirname(self.commit_path))
+
+    def _repair(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        committed = self._read_commit()
+        if committed is None:
+            # Written by something else: trust the whole file
+            self._write_commit(size)
+        elif size > committed:
+            with open(self.path, "r+b") as f:
+                f.truncate(committed)
+
+    def size(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def append(self, data: bytes):
+        """Append ``data`` and commit it as one batch."""
+        if not data:
+            return
+        with open(self.path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            end = f.tell()
+        self._write_commit(end)
+
+
+class JsonlWriter:
+    """Write records as JSON lines."""
+
+    def __init__(self, path: str, append: bool = True):
+        self.file = AppendOnlyFile(path, append=append)
+        self.path = path
+
+    def write_batch(self, records):
+        text = "".join(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in records
+        )
+        self.file.append(text.encode("utf-8"))
+
+
+class CsvWriter:
+    """
+    Write records as CSV rows.
+
+    The column order is taken from the existing header when appending,
+    otherwise from the first record written. The file starts with a UTF-8
+    BOM like the exports produced by pandas with ``utf-8-sig``.
+    """
+
+    def __init__(self, path: str, append: bool = True, fieldnames=None):
+        self.file = AppendOnlyFile(path, append=append)
+        self.path = path
+        self.fieldnames = fieldnames
+        if self.file.size() and not self.fieldnames:
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                self.fieldnames = next(csv.reader(f), None)
+
+    def write_batch(self, records):
+        if not records:
+            return
+        buffer = io.StringIO()
+        prefix = b""
+        is_new = not self.file.size()
+        if is_new and not self.fieldnames:
+            self.fieldnames = list(records[0].keys())
+        writer = csv.DictWriter(
+            buffer, fieldnames=self.fieldnames, extrasaction="ignore",
+            lineterminator="\n",
+        )
+        if is_new:
+            prefix = "\ufeff".encode("utf-8")
+            writer.writeheader()
+        writer.writerows(records)
+        self.file.append(prefix + buffer.getvalue().encode("utf-8"))
+
+
+def parquet_available() -> bool:
+    """True if pyarrow, needed by ParquetWriter, is installed."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class ParquetWriter:
+    """
+    Write records to a Hive-partitioned Parquet dataset.
+
+    ``columns`` is a list of ``(name, arrow_type)`` pairs such as
+    ``("Price", "int64")``; ``convert`` turns each record into a dict of
+    typed values first. Each batch becomes one complete file per partition,
+    ``<root>/<col>=<value>/.../part-<run>-<batch>.parquet``, written under a
+    hidden name and renamed at once, so readers only ever see complete
+    files and a crash loses nothing that was already flushed.
+    """
+
+    def __init__(self, root: str, columns, partition_by=(), convert=None,
+                 append: bool = True):
+        import pyarrow as pa
+
+        self.root = root
+        self.partition_by = list(partition_by)
+        self.convert = convert
+        self.schema = pa.schema([
+            (name, pa.type_for_alias(arrow_type))
+            for name, arrow_type in columns
+            if name not in self.partition_by
+        ])
+        self.run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._batches = 0
+        if not append and os.path.exists(root):
+            shutil.rmtree(root)
+        os.makedirs(root, exist_ok=True)
+
+    def _folder(self, partition) -> str:
+        folder = os.path.join(self.root, *(
+            f"{name}={quote(str(value), safe='')}"
+            for name, value in zip(self.partition_by, partition)
+        ))
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    def write_batch(self, records):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        groups = {}
+        for record in records:
+            row = self.convert(record) if self.convert else record
+            partition = tuple(row.get(name) for name in self.partition_by)
+            groups.setdefault(partition, []).append(row)
+
+        self._batches += 1
+        name = f"part-{self.run_id}-{self._batches:05d}.parquet"
+        for partition, rows in groups.items():
+            folder = self._folder(partition)
+            tmp_path = os.path.join(folder, "." + name)
+            pq.write_table(pa.Table.from_pylist(rows, schema=self.schema), tmp_path)
+            os.replace(tmp_path, os.path.join(folder, name))
+
+    def close(self):
+        """Nothing to finish: every batch is published when it is written."""
+
+
+class FilteredWriter:
+    """Forward only the records accepted by ``predicate`` to ``writer``."""
+
+    def __init__(self, writer, predicate):
+        self.writer = writer
+        self.predicate = predicate
+
+    def write_batch(self, records):
+        selected = [record for record in records if self.predicate(record)]
+        if selected:
+            self.writer.write_batch(selected)
+
+
+class BatchSink:
+    """
+    Buffer records and hand them to every writer in batches.
+
+    A batch is flushed once ``batch_size`` records are pending, on
+    ``flush()`` and on ``close()``. ``on_flush`` is called with each flushed
+    batch after all writers have committed it.
+    """
+
+    def __init__(self, writers, batch_size: int = 1, on_flush=None):
+        self.writers = list(writers)
+        self.batch_size = max(1, batch_size or 1)
+        self.on_flush = on_flush
+        self.pending = []
+        self.written = 0
+
+    def add(self, record):
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        for writer in self.writers:
+            with metrics.timer("export_seconds", writer=type(writer).__name__):
+                writer.write_batch(batch)
+        self.written += len(batch)
+        metrics.inc("records_written_total", len(batch))
+        if self.on_flush is not None:
+            self.on_flush(batch)
+
+    def close(self):
+        """Flush the pending batch and close the writers that need it."""
+        self.flush()
+        for writer in self.writers:
+            close = getattr(writer, "close", None)
+            if close is not None:
+                close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,96 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Connection": "keep-alive",
+}
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 10
+
+
+def accept_encoding() -> str:
+    """Advertise brotli only when urllib3 is able to decode it."""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return "gzip, deflate"
+    return "gzip, deflate, br"
+
+
+def build_retry(
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF,
+    status_forcelist=RETRY_STATUSES,
+) -> Retry:
+    """
+    Retry policy for idempotent requests.
+
+    Retries use exponential backoff and honour the ``Retry-After`` header
+    sent with 429/503 responses. Once retries are exhausted the last
+    response is returned so ``raise_for_status`` reports the real status.
+    """
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def build_session(
+    pool_connections: int = DEFAULT_POOL_SIZE,
+    pool_maxsize: int = DEFAULT_POOL_SIZE,
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF,
+    headers: dict = None,
+) -> requests.Session:
+    """
+    Build a keep-alive session backed by pooled connections.
+
+    ``pool_connections`` is the number of hosts whose pools are kept open and
+    ``pool_maxsize`` the number of reusable connections per host, which should
+    be at least the number of threads fetching from the same host.
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.headers["Accept-Encoding"] = accept_encoding()
+    if headers:
+        session.headers.update(headers)
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=build_retry(retries, backoff_factor),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def retry_count(response) -> int:
+    """Number of retries urllib3 made before ``response`` was returned."""
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    history = getattr(retries, "history", None)
+    return len(history) if history else 0
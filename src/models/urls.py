@@ -0,0 +1,55 @@
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, urljoin, quote
+
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = frozenset((
+    "gclid", "dclid", "gbraid", "wbraid", "fbclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "ref_src", "spm",
+))
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_")
+# Characters left as they are when re-quoting a path (existing escapes stay)
+PATH_SAFE = "/%:@!$&'()*+,;=~"
+_ESCAPE = re.compile(r"%[0-9a-fA-F]{2}")
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str, base: str = None) -> str:
+    """
+    Return a stable form of ``url`` for use as a lookup key.
+
+    Scheme and host are lowercased, ``http`` becomes ``https``, default
+    ports, fragments, tracking parameters (``utm_*``, ``gclid``, ...) and a
+    trailing slash are dropped, the path is percent-encoded consistently and
+    query parameters are sorted, so equivalent URLs share one key. Relative
+    URLs are resolved against ``base`` first.
+    """
+    url = url.strip()
+    if base:
+        url = urljoin(base, url)
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not (
+        (scheme == "http" and port == 80) or (scheme == "https" and port == 443)
+    ):
+        host = f"{host}:{port}"
+    if scheme == "http":
+        scheme = "https"
+
+    path = quote(parts.path or "/", safe=PATH_SAFE)
+    path = _ESCAPE.sub(lambda escape: escape.group(0).upper(), path)
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    query = urlencode(sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking(name)
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
@@ -0,0 +1,115 @@
+import os
+
+from src.models.dedup import SeenSet, SEEN_CAPACITY, SEEN_ERROR_RATE
+from src.models.frontier import Frontier, FRONTIER_MEMORY
+from src.models.metrics import metrics
+from src.models.parse_pool import ParsePool
+from src.models.urls import canonicalize_url
+from src.models.wiki_scraper import WikiScraper
+
+
+CRAWL_FOLDER = os.path.join("data", "wiki_crawl")
+MAX_DEPTH = 2  # Link hops from the seed articles
+MAX_PAGES = 1000  # Articles scraped per crawl
+
+
+class WikiCrawler(WikiScraper):
+    """
+    Crawl outward from seed articles, breadth first.
+
+    ``endpoints`` are the seeds. Every scraped article's links inside
+    ``mw-parser-output`` are pushed onto a Frontier (priority = depth) unless
+    their canonical URL is already in the SeenSet. The crawl stops after
+    ``max_pages`` articles or when nothing within ``max_depth`` is left.
+    Both structures spill to SQLite files in ``state_folder``, so memory
+    stays bounded however many URLs are discovered.
+    """
+
+    def __init__(
+        self,
+        endpoints=None,
+        max_depth: int = MAX_DEPTH,
+        max_pages: int = MAX_PAGES,
+        state_folder: str = CRAWL_FOLDER,
+        frontier_memory: int = FRONTIER_MEMORY,
+        seen_capacity: int = SEEN_CAPACITY,
+        seen_error_rate: float = SEEN_ERROR_RATE,
+        **kwargs
+    ):
+        super().__init__(endpoints=endpoints, **kwargs)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.state_folder = state_folder
+        self.frontier_memory = frontier_memory
+        self.seen_capacity = seen_capacity
+        self.seen_error_rate = seen_error_rate
+        self.pages_crawled = 0
+
+    def parse(self, html: str) -> dict:
+        return self._parse(html, links=True)
+
+    def _discover(self, frontier, seen, endpoint: str, depth: int):
+        if depth > self.max_depth:
+            return
+        if seen.add(canonicalize_url(self.build_url(endpoint))):
+            frontier.push(endpoint, depth)
+            metrics.inc("crawl_urls_discovered_total")
+        else:
+            metrics.inc("crawl_duplicates_total")
+
+    def _scrape_batch(self, endpoints: list, pool=None) -> list:
+        if pool is not None:
+            return list(self._iter_pipeline(endpoints, pool))
+        if self.max_workers and self.max_workers > 1:
+            return list(self._iter_concurrent(endpoints))
+        return [self._scrape_endpoint(endpoint) for endpoint in endpoints]
+
+    def run(self):
+        if not self.endpoints:
+            print("No endpoints defined.")
+            return
+
+        # Results must line up with the batch that produced them
+        self.preserve_order = True
+        batch_size = max(self.max_workers or 1, 1) * 4
+        frontier = Frontier(
+            os.path.join(self.state_folder, "frontier.sqlite"), self.frontier_memory
+        )
+        seen = SeenSet(
+            os.path.join(self.state_folder, "seen.sqlite"),
+            self.seen_capacity, self.seen_error_rate, fresh=True,
+        )
+        # Kept off self: the pool's workers receive a pickled copy of self
+        pool = ParsePool(self, self.parse_workers) if self.parse_workers else None
+        try:
+            for endpoint in self.endpoints:
+                self._discover(frontier, seen, endpoint, 0)
+
+            while self.pages_crawled < self.max_pages and len(frontier):
+                batch = []
+                while (len(batch) < min(batch_size, self.max_pages - self.pages_crawled)
+                       and len(frontier)):
+                    batch.append(frontier.pop())
+
+                results = self._scrape_batch([endpoint for endpoint, _ in batch], pool)
+                for (endpoint, depth), record in zip(batch, results):
+                    if record is None:
+                        continue
+                    self.pages_crawled += 1
+                    for link in record.pop("links", []):
+                        self._discover(frontier, seen, link, depth + 1)
+                    record["url"] = self.build_url(endpoint)
+                    record["depth"] = depth
+                    self._collect(record)
+
+                metrics.set_gauge("crawl_frontier_size", len(frontier))
+                metrics.set_gauge("crawl_seen_urls", len(seen))
+                metrics.set_gauge("crawl_seen_filter_bytes", seen.filter_bytes)
+        finally:
+            if pool is not None:
+                pool.close()
+            frontier.close()
+            seen.close()
+
+        print(f"Crawled {self.pages_crawled} pages; {len(seen)} URLs discovered")
+        self._finish()
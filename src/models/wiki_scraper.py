@@ -1,20 +1,101 @@
+from urllib.parse import unquote
+
+from bs4 import SoupStrainer
+
 from src.models.scraper_base import Scraper
 
 
+# Namespaced pages (files, categories, talk pages, ...) are not articles
+WIKI_NAMESPACES = (
+    "Special", "File", "Image", "Media", "Category", "Template", "Help",
+    "Wikipedia", "Portal", "Talk", "User", "Draft", "Module", "MediaWiki",
+    "TimedText", "Book", "Gadget", "Topic", "WP", "Project",
+)
+
+
+def extract_links(content) -> list:
+    """
+    Article links (``/wiki/<title>``) inside a ``mw-parser-output`` tag, in
+    page order without duplicates; fragments are dropped and namespaced
+    pages skipped.
+    """
+    links = []
+    seen = set()
+    for anchor in content.find_all("a", href=True):
+        href = anchor["href"]
+        if not href.startswith("/wiki/"):
+            continue
+        href = href.split("#", 1)[0]
+        title = unquote(href[len("/wiki/"):])
+        namespace = title.split(":", 1)[0] if ":" in title else ""
+        if not title or namespace.replace(" ", "_").split("_talk")[0] in WIKI_NAMESPACES:
+            continue
+        if href not in seen:
+            seen.add(href)
+            links.append(href)
+    return links
+
+
+class WikiContentStrainer(SoupStrainer):
+    """
+    Only build the article heading and the main content block.
+
+    Navigation, sidebars and footers outside ``div.mw-parser-output`` are
+    tokenized but never turned into tree nodes. Both tag filtering hooks
+    are overridden so this works with old and new BeautifulSoup releases.
+    """
+
+    def _wanted(self, name, attrs) -> bool:
+        attrs = dict(attrs or {})
+        if name == "h1":
+            return attrs.get("id") == "firstHeading"
+        if name == "div":
+            classes = attrs.get("class") or []
+            if isinstance(classes, str):
+                classes = classes.split()
+            return "mw-parser-output" in classes
+        return False
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self._wanted(name, attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return markup_name if self._wanted(markup_name, markup_attrs) else None
+
+
 class WikiScraper(Scraper):
-    def __init__(self, base_url="https://en.wikipedia.org", endpoints=None) -> None:
+    def __init__(
+        self,
+        base_url="https://en.wikipedia.org",
+        endpoints=None,
+        parser=None,
+        partial_parse=True,
+        **kwargs
+    ) -> None:
         super().__init__(
-            base_url=base_url, endpoints=endpoints or ["/wiki/Web_scraping"]
+            base_url=base_url, endpoints=endpoints or ["/wiki/Web_scraping"], **kwargs
         )
+        # HTML parser backend; None uses the process default (see html_parser)
+        self.parser_backend = parser
+        # Only materialize the heading and main content (same output, less memory)
+        self.partial_parse = partial_parse
 
     def parse(self, html: str) -> dict:
-        from bs4 import BeautifulSoup
+        return self._parse(html, links=False)
+
+    def _parse(self, html: str, links: bool) -> dict:
+        """Title and text of an article, plus its article links if ``links``."""
+        from src.models.html_parser import make_soup
 
         if not html:
             return {"title": "", "content": "", "error": "No HTML provided"}
 
         try:
-            soup = BeautifulSoup(html, "html.parser")
+            strainer = WikiContentStrainer() if self.partial_parse else None
+            soup = make_soup(html, self.parser_backend, parse_only=strainer)
             # Title: may not exist on atypical pages
             title_tag = soup.find("h1", {"id": "firstHeading"})
             title = title_tag.text.strip() if title_tag and title_tag.text else ""
@@ -34,7 +115,10 @@ class WikiScraper(Scraper):
             else:
                 text = ""
 
-            return {"title": title, "content": text}
+            record = {"title": title, "content": text}
+            if links:
+                record["links"] = extract_links(content) if content else []
+            return record
         except Exception as e:
             # Return consistent structure and error message for debugging
             return {"title": "", "content": "", "error": str(e)}
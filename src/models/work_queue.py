@@ -0,0 +1,237 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+
+VISIBILITY_TIMEOUT = 300  # Seconds a leased item stays hidden from other workers
+MAX_ATTEMPTS = 5  # Leases per item before it is parked as dead
+RETRY_BACKOFF = 10  # Seconds before a nacked item is retried, doubled per attempt
+BUSY_TIMEOUT = 30  # Seconds to wait for another process's write lock
+
+
+class Lease:
+    """One leased item; pass it back to ``ack()`` or ``nack()``."""
+
+    def __init__(self, item_id: int, payload, attempts: int):
+        self.id = item_id
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"Lease({self.id}, {self.payload!r}, attempts={self.attempts})"
+
+
+class WorkQueue:
+    """
+    Work queue shared by any number of processes through a SQLite file.
+
+    Producers ``enqueue()`` endpoints, URLs or JSON-serializable dicts
+    (duplicates of an item already in the queue are ignored). Workers
+    ``lease()`` items, which hides them from other workers for
+    ``visibility_timeout`` seconds, and ``ack()`` them once the results are
+    saved. An item whose worker died reappears when its lease expires; after
+    ``max_attempts`` leases it is marked ``dead`` instead. A ``nack()``ed
+    item waits ``retry_backoff`` seconds (doubled per attempt, at most the
+    visibility timeout) before it can be leased again.
+
+    Each process should open its own WorkQueue; the connection is not
+    shared between threads.
+    """
+
+    def __init__(self, path: str, name: str = "default",
+                 visibility_timeout: float = VISIBILITY_TIMEOUT,
+                 max_attempts: int = MAX_ATTEMPTS, worker_id: str = None,
+                 retry_backoff: float = RETRY_BACKOFF):
+        self.path = path
+        self.name = name
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        # Autocommit mode; writes use explicit BEGIN IMMEDIATE transactions
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY,
+                queue TEXT NOT NULL,
+                item_key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'ready',
+                lease_until REAL,
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                enqueued_at REAL,
+                updated_at REAL,
+                UNIQUE (queue, item_key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_items_ready
+                ON items (queue, status, lease_until);
+            """
+        )
+
+    def _write(self, statements):
+        """Run ``statements(conn)`` in one immediate (write-locked) transaction."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = statements(self._conn)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        return result
+
+    @staticmethod
+    def _key(item) -> str:
+        return item if isinstance(item, str) else json.dumps(item, sort_keys=True)
+
+    def enqueue(self, items, chunk_size: int = 1000) -> int:
+        """Add ``items`` (any iterable, streamed in chunks); returns how many were new."""
+        added = 0
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                added += self._enqueue_chunk(chunk)
+                chunk = []
+        if chunk:
+            added += self._enqueue_chunk(chunk)
+        return added
+
+    def _enqueue_chunk(self, items: list) -> int:
+        now = time.time()
+        rows = [
+            (self.name, self._key(item), json.dumps(item, ensure_ascii=False), now, now)
+            for item in items
+        ]
+
+        def insert(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO items "
+                "(queue, item_key, payload, enqueued_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            return conn.total_changes - before
+
+        return self._write(insert)
+
+    def lease(self, count: int = 1) -> list:
+        """
+        Lease up to ``count`` items: ready ones whose retry delay has passed
+        first, then ones whose lease expired. Items out of attempts are
+        marked dead on the way.
+        """
+        def take(conn):
+            now = time.time()
+            conn.execute(
+                "UPDATE items SET status = 'dead', updated_at = ?, "
+                "error = COALESCE(error, 'lease expired') "
+                "WHERE queue = ? AND status = 'leased' AND lease_until < ? "
+                "AND attempts >= ?",
+                (now, self.name, now, self.max_attempts),
+            )
+            rows = conn.execute(
+                "SELECT id, payload, attempts FROM items "
+                "WHERE queue = ? AND ((status = 'ready' "
+                "AND (lease_until IS NULL OR lease_until <= ?)) "
+                "OR (status = 'leased' AND lease_until < ?)) "
+                "ORDER BY id LIMIT ?",
+                (self.name, now, now, count),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE items SET status = 'leased', lease_until = ?, worker = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(now + self.visibility_timeout, self.worker_id, now, row[0])
+                 for row in rows],
+            )
+            return [Lease(row[0], json.loads(row[1]), row[2] + 1) for row in rows]
+
+        return self._write(take)
+
+    def extend(self, lease: Lease, seconds: float = None) -> bool:
+        """Keep a long-running item hidden; False if the lease was lost."""
+        until = time.time() + (seconds or self.visibility_timeout)
+        cursor = self._write(lambda conn: conn.execute(
+            "UPDATE items SET lease_until = ? "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (until, lease.id, self.worker_id),
+        ))
+        return cursor.rowcount == 1
+
+    def ack(self, leases) -> int:
+        """Mark leased items done; returns how many were still held by this worker."""
+        now = time.time()
+
+        def done(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE items SET status = 'done', lease_until = NULL, error = NULL, "
+                "updated_at = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                [(now, lease.id, self.worker_id) for lease in leases],
+            )
+            return conn.total_changes - before
+
+        return self._write(done)
+
+    def nack(self, lease: Lease, error: str = None, retry: bool = True):
+        """
+        Give an item back after a failure: ready for another attempt once
+        its retry delay has passed, or dead when ``retry`` is False or its
+        attempts are used up.
+        """
+        now = time.time()
+        if retry and lease.attempts < self.max_attempts:
+            status = "ready"
+            delay = min(self.retry_backoff * 2 ** (lease.attempts - 1),
+                        self.visibility_timeout)
+            retry_at = now + delay
+        else:
+            status, retry_at = "dead", None
+        self._write(lambda conn: conn.execute(
+            "UPDATE items SET status = ?, lease_until = ?, error = ?, updated_at = ? "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (status, retry_at, error, now, lease.id, self.worker_id),
+        ))
+
+    def stats(self) -> dict:
+        """Item counts by status, e.g. ``{"ready": 10, "leased": 2, "done": 5}``."""
+        rows = self._conn.execute(
+            "SELECT status, COUNT(*) FROM items WHERE queue = ? GROUP BY status",
+            (self.name,),
+        ).fetchall()
+        return dict(rows)
+
+    def dead(self, limit: int = 100) -> list:
+        """Payloads and last errors of items that ran out of attempts."""
+        rows = self._conn.execute(
+            "SELECT payload, error, attempts FROM items "
+            "WHERE queue = ? AND status = 'dead' ORDER BY id LIMIT ?",
+            (self.name, limit),
+        ).fetchall()
+        return [
+            {"payload": json.loads(payload), "error": error, "attempts": attempts}
+            for payload, error, attempts in rows
+        ]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.corpus import load_corpus
+from benchmarks.server import StandInServer
+from src.main import main
+from batch import iter_targets, merge_shards, parse_shard, shard_of, shard_path
+
+
+class TestSharding(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/8"), (2, 8))
+        for text in ("8/8", "-1/4", "1/0", "a/b", "3"):
+            with self.assertRaises(ValueError):
+                parse_shard(text)
+
+    def test_shards_split_urls_without_overlap(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "urls.txt")
+            with open(path, "w") as f:
+                f.write("# articles\n\n")
+                f.writelines(f"/wiki/Article_{i}\n" for i in range(200))
+
+            base = "https://en.wikipedia.org"
+            shards = [list(iter_targets(path, base, (i, 3))) for i in range(3)]
+            seen = [target for shard in shards for target in shard]
+            self.assertEqual(sorted(seen), sorted(f"/wiki/Article_{i}" for i in range(200)))
+            self.assertTrue(all(shard for shard in shards))
+            self.assertEqual(shards[1], list(iter_targets(path, base, (1, 3))))
+
+    def test_equivalent_urls_share_a_shard(self):
+        self.assertEqual(
+            shard_of("HTTPS://Example.com:443/a?b=2&a=1#top", 16),
+            shard_of("https://example.com/a?a=1&b=2", 16),
+        )
+
+
+class TestBatchCli(unittest.TestCase):
+    def test_sharded_run_and_merge(self):
+        corpus = load_corpus({"wiki": 3, "listing": 1, "detail": 1})
+        with tempfile.TemporaryDirectory() as td, StandInServer(corpus) as server:
+            urls = os.path.join(td, "urls.txt")
+            with open(urls, "w") as f:
+                f.writelines(f"{server.base_url}/wiki/Page_{i}\n" for i in range(12))
+            output = os.path.join(td, "out", "wiki")
+
+            for index in range(3):
+                main(["run", "wiki", "--urls", urls, "--output", output,
+                      "--shard", f"{index}/3", "--workers", "2"])
+                self.assertTrue(os.path.exists(shard_path(output, (index, 3))))
+
+            main(["merge", "--output", output, "--shards", "3"])
+            with open(output + ".jsonl", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(len(records), 12)
+            self.assertTrue(all(record["title"] for record in records))
+
+    def test_crawler_cannot_be_sharded_or_queued(self):
+        with tempfile.TemporaryDirectory() as td:
+            seeds = os.path.join(td, "seeds.txt")
+            with open(seeds, "w") as f:
+                f.write("/wiki/Seed\n")
+            output = os.path.join(td, "crawl")
+            with self.assertRaises(SystemExit):
+                main(["run", "wikicrawl", "--urls", seeds, "--output", output,
+                      "--shard", "1/2"])
+            with self.assertRaises(SystemExit):
+                main(["work", "wikicrawl", "--queue", os.path.join(td, "q.sqlite"),
+                      "--output", output])
+            self.assertFalse(os.path.exists(output + ".shard-001-of-002.jsonl"))
+
+    def test_merge_refuses_missing_shards(self):
+        with tempfile.TemporaryDirectory() as td:
+            output = os.path.join(td, "wiki")
+            with open(shard_path(output, (0, 2)), "w") as f:
+                f.write('{"title": "a"}\n')
+            with self.assertRaises(ValueError):
+                merge_shards(output, 2)
+            result = merge_shards(output, 2, allow_missing=True)
+            self.assertEqual(result["records"], 1)
+            self.assertEqual(len(result["missing"]), 1)
+
+    def test_merge_single_shard_keeps_its_records(self):
+        with tempfile.TemporaryDirectory() as td:
+            output = os.path.join(td, "wiki")
+            # With one shard the shard output is the merge target itself
+            self.assertEqual(shard_path(output, (0, 1)), output + ".jsonl")
+            with open(output + ".jsonl", "w") as f:
+                f.write('{"title": "a"}\n{"title": "b"}\n')
+            result = merge_shards(output, 1)
+            self.assertEqual(result["records"], 2)
+            with open(output + ".jsonl", encoding="utf-8") as f:
+                self.assertEqual(len(f.readlines()), 2)
+            self.assertFalse(os.path.exists(output + ".jsonl.merging"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from benchmarks.corpus import load_corpus
+from benchmarks.run import compare, percentile, run_all
+from benchmarks.server import StandInServer
+from transport import build_session
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_stand_in_server_routes(self):
+        corpus = load_corpus({"wiki": 1, "listing": 2, "detail": 1})
+        with StandInServer(corpus) as server:
+            session = build_session()
+            wiki = session.get(f"{server.base_url}/wiki/Anything").text
+            self.assertIn("firstHeading", wiki)
+            self.assertIn("property-item", session.get(f"{server.base_url}/search?page=2").text)
+            self.assertNotIn("property-item", session.get(f"{server.base_url}/search?page=3").text)
+            self.assertIn("<dl>", session.get(f"{server.base_url}/casa/7").text)
+
+    def test_scenarios_parse_every_page(self):
+        results = run_all(
+            pages={"wiki": 2, "listing": 2, "detail": 4}, workers=2, isolate=False
+        )
+        self.assertEqual([r["scenario"] for r in results], ["wiki", "listing", "detail"])
+        for result in results:
+            self.assertEqual(result["parsed"], result["pages"])
+            self.assertGreater(result["parse_cpu_s"], 0)
+            self.assertGreater(result["peak_rss_mb"], 0)
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        baseline = [{"scenario": "wiki", "pages_per_sec": 100, "peak_rss_mb": 50}]
+        self.assertEqual(compare([{"scenario": "wiki", "pages_per_sec": 90,
+                                   "peak_rss_mb": 55}], baseline), [])
+        self.assertEqual(len(compare([{"scenario": "wiki", "pages_per_sec": 70,
+                                       "peak_rss_mb": 70}], baseline)), 2)
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
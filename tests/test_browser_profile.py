@@ -0,0 +1,195 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import browser_profile
+import realestate_scraper
+from browser_profile import (
+    IMAGE_PATTERNS, TRACKER_PATTERNS, PageWeightMeter, ScrapeProfile, page_weight_savings,
+    process_tree_rss_mb, resolve_chromedriver,
+)
+from metrics import Metrics
+
+# The registry the code under test records into
+metrics = browser_profile.metrics
+
+
+class FakeDriver:
+    """Records CDP commands and replays a performance log per page."""
+
+    def __init__(self, page_bytes):
+        self.page_bytes = page_bytes
+        self.commands = []
+        self.log = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+    def blocked(self):
+        urls = [p["urls"] for c, p in self.commands if c == "Network.setBlockedURLs"]
+        return bool(urls and urls[-1])
+
+    def load(self):
+        size = self.page_bytes[1] if self.blocked() else self.page_bytes[0]
+        self.log = [
+            {"message": json.dumps({"message": {
+                "method": "Network.loadingFinished",
+                "params": {"encodedDataLength": size},
+            }})},
+            {"message": json.dumps({"message": {
+                "method": "Network.loadingFailed",
+                "params": {"blockedReason": "inspector"},
+            }})},
+        ]
+
+    def get_log(self, kind):
+        log, self.log = self.log, []
+        return log
+
+
+class TestScrapeProfile(unittest.TestCase):
+    def test_default_profile_is_headless_eager_and_blocking(self):
+        profile = ScrapeProfile()
+        options = profile.chrome_options()
+        self.assertIn("--headless=new", options.arguments)
+        self.assertEqual(options.page_load_strategy, "eager")
+        patterns = profile.blocked_patterns()
+        self.assertTrue(set(IMAGE_PATTERNS) <= set(patterns))
+        self.assertTrue(set(TRACKER_PATTERNS) <= set(patterns))
+        # Measurement is opt-in: no performance log, no unblocked samples
+        self.assertNotIn("goog:loggingPrefs", options.to_capabilities())
+        driver = FakeDriver(page_bytes=(2_000_000, 300_000))
+        meter = PageWeightMeter(driver, profile)
+        for _ in range(2 * profile.sample_every):
+            meter.before_page()
+            self.assertTrue(driver.blocked())
+            driver.load()
+            meter.after_page()
+
+    def test_full_profile_restores_previous_behaviour(self):
+        profile = ScrapeProfile.full()
+        options = profile.chrome_options()
+        self.assertNotIn("--headless=new", options.arguments)
+        self.assertIn("--start-maximized", options.arguments)
+        self.assertEqual(options.page_load_strategy, "normal")
+        self.assertEqual(profile.blocked_patterns(), [])
+
+    def test_meter_samples_unblocked_pages_for_savings(self):
+        metrics.reset()
+        driver = FakeDriver(page_bytes=(2_000_000, 300_000))
+        meter = PageWeightMeter(driver, ScrapeProfile(measure=True, sample_every=4))
+        self.assertTrue(driver.blocked())
+
+        for _ in range(8):
+            meter.before_page()
+            driver.load()
+            meter.after_page()
+            self.assertTrue(driver.blocked())
+
+        self.assertEqual(metrics.histogram("page_bytes", mode="baseline").count, 2)
+        self.assertEqual(metrics.histogram("page_bytes", mode="profiled").count, 6)
+        self.assertEqual(metrics.counter("requests_blocked_total"), 8)
+        savings = page_weight_savings()
+        self.assertEqual(savings["bytes_saved_per_page"], 1_700_000)
+        self.assertIsNone(page_weight_savings(Metrics()))
+
+
+class FakeChrome:
+    started = 0
+
+    def __init__(self, service=None, options=None):
+        type(self).started += 1
+        self.quit_called = False
+
+    def execute_script(self, script):
+        pass
+
+    def execute_cdp_cmd(self, command, params):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestDriverStartup(unittest.TestCase):
+    def test_driver_path_is_resolved_once_and_cached_on_disk(self):
+        with tempfile.TemporaryDirectory() as td:
+            driver_path = os.path.join(td, "chromedriver")
+            open(driver_path, "w").close()
+            cache_path = os.path.join(td, "cache", "chromedriver.json")
+            installs = []
+
+            def install():
+                installs.append(1)
+                return driver_path
+
+            self.assertEqual(resolve_chromedriver(cache_path, install=install), driver_path)
+            self.assertEqual(resolve_chromedriver(cache_path, install=install), driver_path)
+            self.assertEqual(len(installs), 1)
+
+            # A new process reads the file; a stale entry is resolved again
+            memo = browser_profile._driver_paths
+            memo.pop(cache_path)
+            self.assertEqual(resolve_chromedriver(cache_path, install=install), driver_path)
+            self.assertEqual(len(installs), 1)
+            memo.pop(cache_path)
+            with open(cache_path, "w") as f:
+                json.dump({"path": driver_path, "resolved_at": time.time() - 10}, f)
+            resolve_chromedriver(cache_path, ttl=5, install=install)
+            self.assertEqual(len(installs), 2)
+
+    def test_process_tree_rss(self):
+        rss = process_tree_rss_mb(os.getpid())
+        if rss is not None:
+            self.assertGreater(rss, 0)
+
+
+class TestBrowserRecycling(unittest.TestCase):
+    def make_controller(self, **profile):
+        profile = ScrapeProfile(measure=False, blocked_url_patterns=(),
+                                block_images=False, block_fonts=False,
+                                block_media=False, **profile)
+        with mock.patch.object(realestate_scraper.webdriver, "Chrome", FakeChrome), \
+                mock.patch.object(realestate_scraper, "resolve_chromedriver", lambda: "x"):
+            ctrl = realestate_scraper.WebDriverController(profile)
+        return ctrl
+
+    def test_browser_restarts_after_page_limit_and_rebinds_scrapers(self):
+        metrics.reset()
+        ctrl = self.make_controller(recycle_after_pages=3, recycle_rss_mb=None)
+        list_scraper = realestate_scraper.PropertyListScraper(None)
+        detail_scraper = realestate_scraper.PropertyDetailScraper(None)
+        ctrl.bind(list_scraper, detail_scraper)
+        first = ctrl.driver
+        self.assertIs(list_scraper.driver, first)
+
+        with mock.patch.object(realestate_scraper.webdriver, "Chrome", FakeChrome), \
+                mock.patch.object(realestate_scraper, "resolve_chromedriver", lambda: "x"):
+            for _ in range(7):
+                ctrl.start_page()
+
+        self.assertTrue(first.quit_called)
+        self.assertIsNot(ctrl.driver, first)
+        self.assertIs(list_scraper.driver, ctrl.driver)
+        self.assertIs(detail_scraper.driver, ctrl.driver)
+        self.assertEqual(ctrl.pages_loaded, 1)
+        self.assertEqual(metrics.counter("browser_recycles_total", reason="pages"), 2)
+
+    def test_browser_restarts_above_memory_limit(self):
+        metrics.reset()
+        ctrl = self.make_controller(recycle_after_pages=None, recycle_rss_mb=100)
+        ctrl.browser_rss_mb = lambda: 250.0
+        first = ctrl.driver
+        with mock.patch.object(realestate_scraper.webdriver, "Chrome", FakeChrome), \
+                mock.patch.object(realestate_scraper, "resolve_chromedriver", lambda: "x"):
+            for _ in range(realestate_scraper.RSS_CHECK_EVERY + 1):
+                ctrl.start_page()
+        self.assertIsNot(ctrl.driver, first)
+        self.assertEqual(metrics.counter("browser_recycles_total", reason="memory"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
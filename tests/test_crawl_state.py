@@ -0,0 +1,196 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import realestate_scraper
+from crawl_state import CrawlStateStore
+from realestate_scraper import PropertyDetailScraper, RealEstateScraper
+
+
+PRICE_CHANGES = {}
+
+
+def listing_html(section, page):
+    cards = "".join(
+        f"<div class='property-item'>"
+        f"<a class='property-link' href='/{section}/{page}/{i}'>Ver</a>"
+        f"<h2>Listing {section} {page} {i}</h2>"
+        f"<span class='price'>{PRICE_CHANGES.get((section, page, i), f'$ {i}00')}</span></div>"
+        for i in range(2)
+    )
+    return f"<html><body>{cards}</body></html>"
+
+
+class FakeDriver:
+    page_source = ""
+    current_url = "https://bogotarealestate.com.co/search"
+
+
+class FakeController:
+    def __init__(self, profile=None):
+        self.driver = FakeDriver()
+
+    def bind(self, *scrapers):
+        pass
+
+    def start_page(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def fake_load_page(driver, url, ready_selector, rate_limiter=None):
+    section = "sale" if "for_sale" in url else "rent"
+    page = int(url.rsplit("page=", 1)[1].split("&")[0])
+    driver.page_source = listing_html(section, page)
+    driver.current_url = url
+    return True
+
+
+class TestCrawlStateStore(unittest.TestCase):
+    def test_batched_updates_are_invisible_until_flush(self):
+        with tempfile.TemporaryDirectory() as td:
+            store = CrawlStateStore(os.path.join(td, "state.sqlite"))
+            self.assertFalse(store.start())
+            store.mark_page("Sales", 1, "u1")
+            store.mark_details([{"URL": "a", "Section": "Sales", "Error": None}])
+            self.assertEqual(store.last_page("Sales"), 0)
+            store.flush()
+            self.assertEqual(store.last_page("Sales"), 1)
+            self.assertEqual(list(store.completed_urls()), ["a"])
+            store.close()
+
+            # Not finished: the next run resumes
+            store = CrawlStateStore(os.path.join(td, "state.sqlite"))
+            self.assertTrue(store.start())
+            store.mark_details([{"URL": "b", "Section": "Sales", "Error": "boom"}])
+            store.finish()
+            self.assertEqual(store.failed_urls(), ["b"])
+            store.close()
+
+            # Finished: the next run starts fresh
+            store = CrawlStateStore(os.path.join(td, "state.sqlite"))
+            self.assertFalse(store.start())
+            self.assertEqual(list(store.completed_urls()), [])
+            store.close()
+
+
+class TestRealEstateResume(unittest.TestCase):
+    def test_interrupted_run_resumes_without_repeating_work(self):
+        opened = []
+        crash = {"at": "/sale/2/1"}
+
+        def fake_extract(self, url, title, price):
+            if crash["at"] and url.endswith(crash["at"]):
+                raise RuntimeError("chrome crashed")
+            opened.append(url)
+            return self.empty_item(url, title, price)
+
+        with tempfile.TemporaryDirectory() as td, \
+                mock.patch.object(realestate_scraper, "DATA_FOLDER", td), \
+                mock.patch.object(realestate_scraper, "MAX_PAGES", 3), \
+                mock.patch.object(realestate_scraper, "WebDriverController", FakeController), \
+                mock.patch.object(realestate_scraper, "load_page", fake_load_page), \
+                mock.patch.object(PropertyDetailScraper, "extract_detail", fake_extract):
+            scraper = RealEstateScraper(save_every=2, http_first=False)
+            with self.assertRaises(RuntimeError):
+                scraper.run()
+            first_run = list(opened)
+            self.assertEqual(len(first_run), 3)
+
+            crash["at"] = None
+            opened.clear()
+            scraper = RealEstateScraper(save_every=2, http_first=False, keep_in_memory=True)
+            scraper.run()
+
+            # Only the unsaved and unvisited listings are opened again
+            self.assertFalse(set(first_run[:2]) & set(opened))
+            self.assertEqual(len(opened), 12 - 2)
+
+            with open(os.path.join(td, "properties_all.json"), encoding="utf-8") as f:
+                urls = [record["URL"] for record in json.load(f)]
+            self.assertEqual(len(urls), 12)
+            self.assertEqual(len(set(urls)), 12)
+
+            # The streamed outputs are final; save_data() must not shrink them
+            scraper.save_data()
+            with open(os.path.join(td, "properties_all.json"), encoding="utf-8") as f:
+                self.assertEqual(len(json.load(f)), 12)
+
+
+class TestListingBrowsers(unittest.TestCase):
+    def test_prefetched_listing_pages_load_in_parallel_browsers(self):
+        # Each load waits until the other is in flight too
+        both_loading = threading.Barrier(2, timeout=5)
+        drivers = set()
+
+        def blocking_load_page(driver, url, ready_selector, rate_limiter=None):
+            drivers.add(id(driver))
+            both_loading.wait()
+            return fake_load_page(driver, url, ready_selector)
+
+        with mock.patch.object(realestate_scraper, "WebDriverController", FakeController), \
+                mock.patch.object(realestate_scraper, "load_page", blocking_load_page):
+            scraper = RealEstateScraper(http_first=False, listing_browsers=2)
+            # The main browser is busy with a detail page meanwhile
+            with scraper._browser_lock:
+                results = []
+                threads = [
+                    threading.Thread(target=lambda page=page: results.append(
+                        scraper._load_listing(
+                            f"https://bogotarealestate.com.co/search?for_sale&page={page}"
+                        )
+                    ))
+                    for page in (1, 2)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            scraper.listing_pool.close()
+
+        self.assertEqual(sorted(len(props) for props in results), [2, 2])
+        self.assertEqual(len(drivers), 2)
+
+
+class TestIncrementalRecrawl(unittest.TestCase):
+    def test_only_changed_listings_are_fetched_again(self):
+        opened = []
+
+        def fake_extract(self, url, title, price):
+            opened.append(url)
+            item = self.empty_item(url, title, price)
+            item["City"] = "Bogota"
+            return item
+
+        with tempfile.TemporaryDirectory() as td, \
+                mock.patch.dict(PRICE_CHANGES, clear=True), \
+                mock.patch.object(realestate_scraper, "DATA_FOLDER", td), \
+                mock.patch.object(realestate_scraper, "MAX_PAGES", 2), \
+                mock.patch.object(realestate_scraper, "WebDriverController", FakeController), \
+                mock.patch.object(realestate_scraper, "load_page", fake_load_page), \
+                mock.patch.object(PropertyDetailScraper, "extract_detail", fake_extract):
+            RealEstateScraper(save_every=3, http_first=False).run()
+            self.assertEqual(len(opened), 8)
+
+            opened.clear()
+            PRICE_CHANGES[("rent", 2, 1)] = "$ 999"
+            scraper = RealEstateScraper(save_every=3, http_first=False)
+            scraper.run()
+
+            self.assertEqual(len(opened), 1)
+            self.assertTrue(opened[0].endswith("/rent/2/1"))
+            self.assertEqual(scraper.carried_forward, 7)
+            with open(os.path.join(td, "properties_all.json"), encoding="utf-8") as f:
+                records = json.load(f)
+            self.assertEqual(len(records), 8)
+            self.assertTrue(all(record["City"] == "Bogota" for record in records))
+            self.assertEqual(records[-1]["Price"], "$ 999")
+
+
+if __name__ == "__main__":
+    unittest.main()
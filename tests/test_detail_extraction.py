@@ -0,0 +1,52 @@
+import unittest
+
+from realestate_scraper import PropertyDetailScraper
+
+
+def parse(html):
+    scraper = PropertyDetailScraper(None)
+    return scraper.parse_detail(html, scraper.empty_item("u", "t", "p"))
+
+
+class TestDetailExtraction(unittest.TestCase):
+    def test_later_strategy_overrides_earlier(self):
+        item = parse(
+            "<dl><dt>Baños</dt><dd>1</dd></dl>"
+            "<table><tr><td>Baños</td><td>2</td></tr></table>"
+            "<ul><li>Baños: 3</li></ul>"
+            "<div class='details'>4 baños</div>"
+        )
+        self.assertEqual(item["Bathrooms"], "4")
+
+    def test_last_match_within_strategy_wins(self):
+        item = parse(
+            "<dl><dt>Estrato</dt><dd>3</dd><dt>Estrato:</dt><dd>4</dd></dl>"
+        )
+        self.assertEqual(item["Stratum"], "4")
+
+    def test_innermost_container_is_visited_last(self):
+        # The nested <dl> is visited again after its parent, so its value wins
+        item = parse(
+            "<dl><dt>Piso</dt><dd>1</dd>"
+            "<dd><dl><dt>Piso</dt><dd>2</dd></dl></dd>"
+            "<dt>Piso</dt><dd>3</dd></dl>"
+        )
+        self.assertEqual(item["Floor"], "2")
+
+    def test_na_value_does_not_override(self):
+        item = parse(
+            "<dl><dt>Ciudad</dt><dd>Bogotá</dd></dl>"
+            "<table><tr><td>Ciudad</td><td>N/A</td></tr></table>"
+        )
+        self.assertEqual(item["City"], "Bogotá")
+
+    def test_match_label_prefers_field_map_order(self):
+        scraper = PropertyDetailScraper(None)
+        self.assertEqual(scraper._match_label("Área Construida:"), "Built Area")
+        self.assertEqual(scraper._match_label("Zona / Barrio"), "Neighborhood")
+        self.assertEqual(scraper._match_label("Estado del inmueble"), "Status")
+        self.assertIsNone(scraper._match_label("Precio"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import time
+import unittest
+from unittest import mock
+
+from realestate_scraper import WebDriverPool, DetailDispatcher, PropertyDetailScraper
+
+
+class FakeController:
+    """Stand-in for WebDriverController that never starts Chrome."""
+
+    started = 0
+
+    def __init__(self):
+        self.driver = None
+        self.closed = False
+        self.setup_driver()
+
+    def setup_driver(self):
+        type(self).started += 1
+        self.driver = object()
+
+    def start_page(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def fake_extract(self, url, title, price):
+    time.sleep(random.uniform(0, 0.01))
+    item = self.empty_item(url, title, price)
+    item["Driver"] = id(self.driver)
+    return item
+
+
+class TestDetailDispatcher(unittest.TestCase):
+    def setUp(self):
+        FakeController.started = 0
+        self.props = [
+            {"URL": f"https://example.com/{i}", "Title": f"T{i}", "Price": "1"}
+            for i in range(20)
+        ]
+
+    def test_results_keep_input_order(self):
+        pool = WebDriverPool(4, controller_factory=FakeController)
+        with mock.patch.object(PropertyDetailScraper, "extract_detail", fake_extract):
+            results = DetailDispatcher(pool).scrape(self.props)
+        self.assertEqual([r["URL"] for r in results], [p["URL"] for p in self.props])
+        self.assertLessEqual(FakeController.started, 4)
+        self.assertGreater(len({r["Driver"] for r in results}), 1)
+        pool.close()
+
+    def test_failed_worker_is_restarted_and_retried(self):
+        failed = set()
+
+        def flaky_extract(self, url, title, price):
+            if url.endswith("/3") and url not in failed:
+                failed.add(url)
+                raise RuntimeError("chrome not reachable")
+            return fake_extract(self, url, title, price)
+
+        pool = WebDriverPool(2, controller_factory=FakeController)
+        with mock.patch.object(PropertyDetailScraper, "extract_detail", flaky_extract):
+            results = DetailDispatcher(pool).scrape(self.props)
+        self.assertEqual(len(results), 20)
+        self.assertIsNone(results[3]["Error"])
+        # Two initial browsers plus one restart of the broken worker
+        self.assertEqual(FakeController.started, 3)
+        pool.close()
+
+    def test_persistent_failure_yields_error_record(self):
+        def broken_extract(self, url, title, price):
+            raise RuntimeError("boom")
+
+        pool = WebDriverPool(2, controller_factory=FakeController)
+        with mock.patch.object(PropertyDetailScraper, "extract_detail", broken_extract):
+            results = DetailDispatcher(pool).scrape(self.props[:3])
+        self.assertEqual([r["URL"] for r in results], [p["URL"] for p in self.props[:3]])
+        for result in results:
+            self.assertIn("boom", result["Error"])
+        pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_cache import ResponseCache
+from scraper_base import Scraper
+from urls import canonicalize_url
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """Serve a fixed page with an ETag and honour If-None-Match."""
+
+    full = 0
+    not_modified = 0
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            type(self).not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        type(self).full += 1
+        body = b'<html>cached page</html>'
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        ETagHandler.full = 0
+        ETagHandler.not_modified = 0
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache.sqlite')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_fresh_entry_skips_network(self):
+        cache = ResponseCache(self.path, ttl=3600)
+        s = Scraper(base_url=self.base, cache=cache)
+        self.assertEqual(s.fetch_html('/a'), '<html>cached page</html>')
+        self.assertEqual(s.fetch_html('/a'), '<html>cached page</html>')
+        self.assertEqual(ETagHandler.full, 1)
+        self.assertEqual(ETagHandler.not_modified, 0)
+        cache.close()
+
+    def test_stale_entry_revalidates_with_304(self):
+        cache = ResponseCache(self.path, ttl=0)
+        s = Scraper(base_url=self.base, cache=cache)
+        s.fetch_html('/a')
+        self.assertEqual(s.fetch_html('/a'), '<html>cached page</html>')
+        self.assertEqual(ETagHandler.full, 1)
+        self.assertEqual(ETagHandler.not_modified, 1)
+        cache.close()
+
+    def test_cache_only_mode(self):
+        cache = ResponseCache(self.path)
+        cache.store(self.base + '/a', 'stored')
+        cache.cache_only = True
+        s = Scraper(base_url=self.base, cache=cache)
+        self.assertEqual(s.fetch_html('/a'), 'stored')
+        self.assertEqual(s.fetch_html('/missing'), '')
+        self.assertEqual(ETagHandler.full, 0)
+        cache.close()
+
+    def test_size_eviction_drops_least_recently_used(self):
+        cache = ResponseCache(self.path, max_bytes=200)
+        cache.store('http://example.com/old', os.urandom(100).hex())
+        cache.store('http://example.com/new', os.urandom(100).hex())
+        self.assertIsNone(cache.get('http://example.com/old'))
+        self.assertIsNotNone(cache.get('http://example.com/new'))
+        cache.close()
+
+    def test_keys_are_canonical(self):
+        self.assertEqual(
+            canonicalize_url('HTTP://Example.com:80/p?b=2&a=1#top'),
+            canonicalize_url('http://example.com/p?a=1&b=2'),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+import requests
+
+from realestate_scraper import HybridDetailFetcher, FetchPathStats
+
+
+DETAIL_HTML = """
+<html><body>
+<dl>
+  <dt>Ciudad:</dt><dd>Bogotá D.C.</dd>
+  <dt>Barrio:</dt><dd>Chicó</dd>
+  <dt>Estrato:</dt><dd>6</dd>
+  <dt>Habitaciones:</dt><dd>3</dd>
+  <dt>Baños:</dt><dd>2</dd>
+</dl>
+</body></html>
+"""
+
+SHELL_HTML = "<html><body><div id='app'></div></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code))
+
+
+class FakeSession:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def get(self, url, timeout=10):
+        self.calls += 1
+        return FakeResponse(self.text)
+
+
+PROP = {"URL": "https://example.com/casa/1", "Title": "Casa", "Price": "$1"}
+
+
+class TestHybridDetailFetcher(unittest.TestCase):
+    def test_server_rendered_page_skips_browser(self):
+        browser_calls = []
+        fetcher = HybridDetailFetcher(session=FakeSession(DETAIL_HTML))
+        item = fetcher.extract(PROP, lambda *args: browser_calls.append(args))
+        self.assertEqual(browser_calls, [])
+        self.assertEqual(item["City"], "Bogotá D.C.")
+        self.assertEqual(item["Bedrooms"], "3")
+        self.assertEqual(item["URL"], PROP["URL"])
+        self.assertEqual(fetcher.stats.domains["example.com"]["http_ok"], 1)
+
+    def test_client_rendered_page_falls_back_to_browser(self):
+        def browser_extract(url, title, price):
+            return {"URL": url, "Error": None, "City": "Bogotá"}
+
+        fetcher = HybridDetailFetcher(session=FakeSession(SHELL_HTML))
+        item = fetcher.extract(PROP, browser_extract)
+        self.assertEqual(item["City"], "Bogotá")
+        stats = fetcher.stats.domains["example.com"]
+        self.assertEqual(stats["http_failed"], 1)
+        self.assertEqual(stats["browser_ok"], 1)
+
+    def test_stats_learn_to_skip_http(self):
+        session = FakeSession(SHELL_HTML)
+        stats = FetchPathStats(min_samples=3, probe_every=100)
+        fetcher = HybridDetailFetcher(session=session, stats=stats)
+        for _ in range(10):
+            fetcher.extract(PROP, lambda url, title, price: {"Error": None})
+        self.assertEqual(session.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+from listing_store import ListingStore
+from realestate_scraper import typed_record
+
+
+def record(url, price, locality="Chapinero", error=None):
+    return {
+        "URL": url, "Title": "Apartamento", "Price": price, "City": "Bogotá",
+        "Locality": locality, "Neighborhood": "Chicó", "Stratum": "6",
+        "Bedrooms": "3", "Extraction Date": "2026-10-18 09:30",
+        "Error": error, "Section": "Sales",
+    }
+
+
+class TestListingStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ListingStore(
+            os.path.join(self.tmp.name, "listings.sqlite"), convert=typed_record
+        )
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_upsert_by_canonical_url_records_price_changes(self):
+        self.store.write_batch([record("https://Example.com/a?y=2&x=1#top", "$ 500.000.000")])
+        self.store.write_batch([
+            record("https://example.com/a?x=1&y=2", "$ 500.000.000"),
+            record("https://example.com/b", "$ 300.000.000"),
+        ])
+        self.store.write_batch([record("https://example.com/a?x=1&y=2", "$ 450.000.000")])
+
+        self.assertEqual(self.store.count(), 2)
+        self.assertEqual(
+            self.store.get("https://example.com/a?y=2&x=1")["Price"], "$ 450.000.000"
+        )
+        history = self.store.price_history("https://example.com/a?x=1&y=2")
+        self.assertEqual(
+            [(price, text) for _, price, text in history],
+            [(500000000, "$ 500.000.000"), (450000000, "$ 450.000.000")],
+        )
+
+    def test_failed_records_do_not_overwrite_stored_data(self):
+        self.store.write_batch([record("https://example.com/a", "$ 1.000")])
+        self.store.write_batch([record("https://example.com/a", "N/A", error="timeout")])
+        self.assertEqual(self.store.get("https://example.com/a")["Price"], "$ 1.000")
+
+    def test_find_filters_use_indexes(self):
+        self.store.write_batch([
+            record("https://example.com/1", "$ 900.000.000"),
+            record("https://example.com/2", "$ 350.000.000"),
+            record("https://example.com/3", "$ 200.000.000", locality="Usaquén"),
+            record("https://example.com/4", "Consultar"),
+        ])
+        found = self.store.find(locality="chapinero", max_price=500000000)
+        self.assertEqual([r["URL"] for r in found], ["https://example.com/2"])
+        self.assertEqual(len(self.store.find(locality="Chapinero")), 3)
+        self.assertEqual(len(self.store.find(stratum=6, min_price=1, limit=2)), 2)
+
+        plan = " ".join(
+            str(row) for row in self.store._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT record FROM listings "
+                "WHERE locality = ? AND price <= ?", ("Chapinero", 1)
+            )
+        )
+        self.assertIn("idx_listings_locality", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import scraper_base
+from metrics import Metrics, start_metrics_server
+from scraper_base import Scraper
+from transport import build_session
+
+# The registry the code under test records into
+metrics = scraper_base.metrics
+
+
+class EchoScraper(Scraper):
+    def parse(self, html):
+        return {"html": html}
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counters_timers_and_report(self):
+        registry = Metrics()
+        registry.inc("fields_found_total", 3, strategy="dl")
+        registry.inc("fields_found_total", strategy="dl")
+        for value in (0.002, 0.02, 0.2, 2.0):
+            registry.observe("parse_seconds", value)
+        with registry.timer("export_seconds", writer="CsvWriter"):
+            pass
+
+        self.assertEqual(registry.counter("fields_found_total", strategy="dl"), 4)
+        self.assertEqual(registry.histogram("parse_seconds").count, 4)
+        self.assertEqual(registry.histogram("parse_seconds").quantile(0.5), 0.025)
+
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "report.json")
+            registry.write_report(path, scraper="Test")
+            with open(path, encoding="utf-8") as f:
+                report = json.load(f)
+        self.assertEqual(report["scraper"], "Test")
+        self.assertEqual(
+            report["counters"]["fields_found_total"],
+            [{"labels": {"strategy": "dl"}, "value": 4}],
+        )
+        self.assertEqual(report["histograms"]["parse_seconds"][0]["value"]["count"], 4)
+
+        text = registry.prometheus_text()
+        self.assertIn('scraper_fields_found_total{strategy="dl"} 4', text)
+        self.assertIn('scraper_parse_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("scraper_parse_seconds_count 4", text)
+
+    def test_scraper_stages_are_recorded(self):
+        metrics.reset()
+        scraper = EchoScraper(base_url="https://example.com", endpoints=["/a", "/b"])
+        with mock.patch.object(scraper, "fetch_html", return_value="<p>x</p>"):
+            scraper.run()
+        self.assertEqual(metrics.counter("pages_total", scraper="EchoScraper"), 2)
+        self.assertEqual(metrics.histogram("parse_seconds", scraper="EchoScraper").count, 2)
+
+    def test_endpoint_serves_prometheus_and_json(self):
+        registry = Metrics()
+        registry.inc("pages_total", 5)
+        server = start_metrics_server(0, registry=registry)
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            session = build_session(retries=0)
+            self.assertIn("scraper_pages_total 5", session.get(base + "/metrics").text)
+            snapshot = session.get(base + "/metrics.json").json()
+            self.assertEqual(snapshot["counters"]["pages_total"][0]["value"], 5)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import random
+import threading
+import time
+import unittest
+
+from pagination import ListingPaginator, ListingLoadError
+
+
+def page_url(page):
+    return f"https://example.com/search?page={page}"
+
+
+def listings(page, count=3):
+    return [{"URL": f"https://example.com/p/{page}/{i}"} for i in range(count)]
+
+
+class TestListingPaginator(unittest.TestCase):
+    def test_pages_arrive_in_order_and_stop_at_empty_page(self):
+        def load(url):
+            page = int(url.rsplit("=", 1)[1])
+            time.sleep(random.uniform(0, 0.01))
+            return listings(page) if page <= 7 else []
+
+        pages = list(ListingPaginator(page_url, load, prefetch=4))
+        self.assertEqual([page for page, _, _ in pages], list(range(1, 8)))
+        self.assertEqual(pages[0][1], page_url(1))
+        self.assertEqual(pages[6][2], listings(7))
+
+    def test_repeated_last_page_ends_section(self):
+        # Out-of-range page numbers serve the last page again
+        def load(url):
+            return listings(min(int(url.rsplit("=", 1)[1]), 3))
+
+        pages = list(ListingPaginator(page_url, load, prefetch=3))
+        self.assertEqual([page for page, _, _ in pages], [1, 2, 3])
+
+    def test_repeated_page_is_detected_despite_tracking_parameters(self):
+        # The repeated page links the same listings with other query strings
+        def load(url):
+            page = int(url.rsplit("=", 1)[1])
+            if page <= 2:
+                return listings(page)
+            return [
+                {"URL": listing["URL"] + "/?utm_source=feed#top"}
+                for listing in listings(2)
+            ]
+
+        pages = list(ListingPaginator(page_url, load, prefetch=2, max_pages=10))
+        self.assertEqual([page for page, _, _ in pages], [1, 2])
+
+    def test_start_page_and_max_pages(self):
+        pages = list(ListingPaginator(
+            page_url, lambda url: listings(int(url.rsplit("=", 1)[1])),
+            start_page=3, max_pages=5,
+        ))
+        self.assertEqual([page for page, _, _ in pages], [3, 4, 5])
+
+    def test_pages_are_loaded_concurrently(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def load(url):
+            with lock:
+                active.append(url)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(url)
+            return listings(int(url.rsplit("=", 1)[1]))
+
+        list(ListingPaginator(page_url, load, prefetch=4, max_pages=12))
+        self.assertEqual(max(peak), 4)
+
+    def test_load_error_is_raised_after_earlier_pages(self):
+        def load(url):
+            if url.endswith("=3"):
+                raise RuntimeError("timeout")
+            return listings(int(url.rsplit("=", 1)[1]))
+
+        seen = []
+        with self.assertRaises(ListingLoadError) as ctx:
+            for page, _, _ in ListingPaginator(page_url, load, prefetch=4):
+                seen.append(page)
+        self.assertEqual(seen, [1, 2])
+        self.assertEqual(ctx.exception.page_url, page_url(3))
+
+    def test_consumer_can_stop_early(self):
+        threads_before = threading.active_count()
+        paginator = ListingPaginator(
+            page_url, lambda url: listings(int(url.rsplit("=", 1)[1])), queue_size=2
+        )
+        for page, _, _ in paginator:
+            if page == 2:
+                break
+        # Unbounded pagination: the producer must be stopped, not left running
+        self.assertEqual(threading.active_count(), threads_before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import realestate_scraper
+from realestate_scraper import (
+    PropertyExporter, parse_area, parse_integer, parse_price, typed_record
+)
+from sinks import parquet_available
+
+
+def record(url, section, price, area="85 m²", bedrooms="3", date="2026-10-18 09:30"):
+    return {
+        "URL": url, "Title": "Apartamento", "Price": price, "City": "Bogotá",
+        "Built Area": area, "Land Area": "N/A", "Bedrooms": bedrooms,
+        "Stratum": "Estrato 4", "Administration Fee": "$ 350.000",
+        "Extraction Date": date, "Error": None, "Section": section,
+    }
+
+
+class TestTypedValues(unittest.TestCase):
+    def test_parse_price(self):
+        self.assertEqual(parse_price("$ 450.000.000"), 450000000)
+        self.assertEqual(parse_price("$ 1.250.000,50"), 1250000)
+        self.assertIsNone(parse_price("N/A"))
+        self.assertIsNone(parse_price("Consultar"))
+
+    def test_parse_price_ranges_take_the_first_amount(self):
+        self.assertEqual(
+            parse_price("Desde $ 300.000.000 hasta $ 500.000.000"), 300000000
+        )
+        self.assertEqual(parse_price("$ 1.200.000.000 / $ 3.500.000.000"), 1200000000)
+        # Beyond int64 it cannot be stored, so it is treated as unknown
+        self.assertIsNone(parse_price("$ " + "9" * 25))
+
+    def test_parse_area(self):
+        self.assertEqual(parse_area("85 m²"), 85.0)
+        self.assertEqual(parse_area("1.250,5 m2"), 1250.5)
+        self.assertEqual(parse_area("1.200 m²"), 1200.0)
+        self.assertEqual(parse_area("72.5 m2"), 72.5)
+        self.assertIsNone(parse_area("N/A"))
+
+    def test_malformed_values_become_none(self):
+        self.assertIsNone(parse_area("10.5.3 m2"))
+        self.assertIsNone(parse_integer("9" * 25))
+        item = record("u", "Sales", "Desde $ 300.000.000 hasta $ 500.000.000")
+        item["Built Area"] = "10.5.3 m2"
+        row = typed_record(item)
+        self.assertEqual(row["Price"], 300000000)
+        self.assertIsNone(row["Built Area"])
+
+    def test_typed_record(self):
+        row = typed_record(record("u", "Sales", "$ 450.000.000"))
+        self.assertEqual(row["Price"], 450000000)
+        self.assertEqual(row["Administration Fee"], 350000)
+        self.assertEqual(row["Built Area"], 85.0)
+        self.assertIsNone(row["Land Area"])
+        self.assertEqual(row["Bedrooms"], 3)
+        self.assertEqual(row["Stratum"], 4)
+        self.assertEqual(parse_integer("N/A"), None)
+        self.assertEqual(row["Extraction Date"], datetime(2026, 10, 18, 9, 30))
+        self.assertEqual(row["extraction_date"], "2026-10-18")
+
+
+@unittest.skipUnless(parquet_available(), "pyarrow is not installed")
+class TestParquetExport(unittest.TestCase):
+    def test_stream_writes_partitioned_typed_dataset(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        with tempfile.TemporaryDirectory() as td, \
+                mock.patch.object(realestate_scraper, "DATA_FOLDER", td):
+            sink = PropertyExporter.open_stream(save_every=2)
+            sink.add(record("a", "Sales", "$ 450.000.000"))
+            sink.add(record("b", "Rentals", "$ 2.500.000"))
+            sink.add(record("c", "Sales", "N/A", date="2026-10-19 08:00"))
+            root = os.path.join(td, realestate_scraper.PARQUET_FOLDER)
+            # The first batch is published as soon as it is flushed
+            self.assertEqual(ds.dataset(root, partitioning="hive").count_rows(), 2)
+            sink.close()
+
+            partitions = sorted(
+                os.path.relpath(folder, root)
+                for folder, _, files in os.walk(root) if files
+            )
+            self.assertEqual(partitions, [
+                os.path.join("Section=Rentals", "extraction_date=2026-10-18"),
+                os.path.join("Section=Sales", "extraction_date=2026-10-18"),
+                os.path.join("Section=Sales", "extraction_date=2026-10-19"),
+            ])
+
+            table = ds.dataset(root, partitioning="hive").to_table()
+            self.assertEqual(table.schema.field("Price").type, pa.int64())
+            self.assertEqual(table.schema.field("Built Area").type, pa.float64())
+            rows = {row["URL"]: row for row in table.to_pylist()}
+            self.assertEqual(rows["a"]["Price"], 450000000)
+            self.assertEqual(rows["a"]["Section"], "Sales")
+            self.assertIsNone(rows["c"]["Price"])
+            self.assertEqual(rows["b"]["Bedrooms"], 3)
+
+    def test_fresh_run_replaces_dataset_and_resume_adds_files(self):
+        import pyarrow.dataset as ds
+
+        with tempfile.TemporaryDirectory() as td, \
+                mock.patch.object(realestate_scraper, "DATA_FOLDER", td):
+            root = os.path.join(td, realestate_scraper.PARQUET_FOLDER)
+            PropertyExporter.save_parquet([record("a", "Sales", "$ 1")])
+            PropertyExporter.save_parquet([record("b", "Sales", "$ 2")])
+            self.assertEqual(ds.dataset(root, partitioning="hive").count_rows(), 1)
+
+            writer = PropertyExporter.open_parquet(append=True)
+            writer.write_batch([record("c", "Sales", "$ 3")])
+            writer.close()
+            urls = ds.dataset(root, partitioning="hive").to_table().column("URL")
+            self.assertEqual(sorted(urls.to_pylist()), ["b", "c"])
+
+    def test_batches_survive_a_crash_before_close(self):
+        import pyarrow.dataset as ds
+
+        with tempfile.TemporaryDirectory() as td, \
+                mock.patch.object(realestate_scraper, "DATA_FOLDER", td):
+            root = os.path.join(td, realestate_scraper.PARQUET_FOLDER)
+            crashed = PropertyExporter.open_parquet(append=False)
+            crashed.write_batch([record("a", "Sales", "$ 1"), record("b", "Rentals", "$ 2")])
+            crashed.write_batch([record("c", "Sales", "$ 3")])
+            # No close(): the process died; the resumed run appends
+            resumed = PropertyExporter.open_parquet(append=True)
+            resumed.write_batch([record("d", "Sales", "$ 4")])
+
+            urls = ds.dataset(root, partitioning="hive").to_table().column("URL")
+            self.assertEqual(sorted(urls.to_pylist()), ["a", "b", "c", "d"])
+            hidden = [name for _, _, files in os.walk(root) for name in files
+                      if name.startswith(".")]
+            self.assertEqual(hidden, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
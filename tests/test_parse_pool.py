@@ -0,0 +1,60 @@
+import pickle
+import threading
+import time
+import unittest
+
+from benchmarks.corpus import load_corpus
+from benchmarks.server import StandInServer
+from parse_pool import ParsePool
+from realestate_scraper import PropertyDetailScraper
+from wiki_scraper import WikiScraper
+
+
+class SlowParser:
+    def parse(self, value):
+        time.sleep(0.2)
+        return value * 2
+
+
+class TestParsePool(unittest.TestCase):
+    def test_submit_blocks_while_the_pool_is_full(self):
+        with ParsePool(SlowParser(), workers=1, max_pending=2) as pool:
+            futures = [pool.submit("parse", 1), pool.submit("parse", 2)]
+            third = []
+            thread = threading.Thread(target=lambda: third.append(pool.submit("parse", 3)))
+            thread.start()
+            thread.join(timeout=0.05)
+            # Both slots are taken until the first job finishes
+            self.assertTrue(thread.is_alive())
+            thread.join(timeout=30)
+            self.assertEqual([f.result() for f in futures + third], [2, 4, 6])
+
+    def test_scrapers_pickle_without_live_resources(self):
+        scraper = pickle.loads(pickle.dumps(WikiScraper(parser="html.parser")))
+        self.assertIsNone(scraper.session)
+        self.assertEqual(scraper.parser_backend, "html.parser")
+
+        detail_scraper = PropertyDetailScraper(object())
+        detail_scraper.parse_pool = object()
+        copy = pickle.loads(pickle.dumps(detail_scraper))
+        self.assertIsNone(copy.driver)
+        self.assertIsNone(copy.parse_pool)
+
+
+class TestParsePipeline(unittest.TestCase):
+    def test_pipeline_matches_in_thread_parsing(self):
+        corpus = load_corpus({"wiki": 4, "listing": 1, "detail": 1})
+        endpoints = [f"/wiki/Article_{i}" for i in range(10)]
+        with StandInServer(corpus) as server:
+            threaded = WikiScraper(base_url=server.base_url, endpoints=endpoints,
+                                   max_workers=3)
+            threaded.run()
+            pooled = WikiScraper(base_url=server.base_url, endpoints=endpoints,
+                                 max_workers=3, parse_workers=2)
+            pooled.run()
+        self.assertEqual(len(pooled.data), 10)
+        self.assertEqual(pooled.data, threaded.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
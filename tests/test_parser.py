@@ -46,6 +46,29 @@ class TestWikiScraperParse(unittest.TestCase):
         self.assertEqual(result.get("title"), "")
         self.assertEqual(result.get("content"), "")
 
+    def test_partial_parse_matches_full_parse(self):
+        html = '''
+        <html><head><script>var x = "<p>not content</p>";</script></head>
+        <body>
+        <div id="mw-navigation"><ul><li><p>Sidebar</p></li></ul></div>
+        <h1 id="firstHeading" class="firstHeading">Big <i>Article</i></h1>
+        <div id="content">
+            <div class="mw-content-ltr mw-parser-output" lang="en">
+                <p>First &amp; <b>bold</b> paragraph.</p>
+                <p>   </p>
+                <div class="navbox"><p>Navbox paragraph.</p></div>
+                <p>Last paragraph.</p>
+            </div>
+        </div>
+        <div id="footer"><p>Footer</p></div>
+        </body></html>
+        '''
+        full = WikiScraper(partial_parse=False).parse(html)
+        partial = self.scraper.parse(html)
+        self.assertEqual(partial, full)
+        self.assertEqual(partial.get("title"), "Big Article")
+        self.assertNotIn("Sidebar", partial.get("content"))
+
 
 if __name__ == "__main__":
     unittest.main()
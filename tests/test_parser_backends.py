@@ -0,0 +1,104 @@
+import unittest
+
+import test_parser
+from html_parser import available_backends, make_soup, resolve_backend
+from realestate_scraper import PropertyDetailScraper, PropertyListScraper
+from wiki_scraper import WikiScraper
+
+
+LISTING_HTML = """
+<html><body>
+<div class="property-item">
+  <a class="property-link" href="/apartamento-venta-chico/1">Ver</a>
+  <h2>Apartamento en Chicó</h2>
+  <span class="price">$ 450.000.000</span>
+</div>
+<div class="listing-card">
+  <a href="https://bogotarealestate.com.co/casa-arriendo-suba/2">Casa amplia en Suba</a>
+  <div class="precio">Consultar</div><div class="value">$ 3.200.000</div>
+</div>
+<div class="card"><p>Sin enlace</p></div>
+</body></html>
+"""
+
+DETAIL_HTML = """
+<html><body>
+<dl>
+  <dt>País:</dt><dd>Colombia</dd>
+  <dt>Ciudad</dt><dd> Bogotá   D.C. </dd>
+  <dt>Zona / Barrio:</dt><dd>Chicó <b>Norte</b></dd>
+</dl>
+<table>
+  <tr><th>Estrato</th><td>6</td></tr>
+  <tr><td>Área construida:</td><td>85 m&sup2;</td></tr>
+  <tr><td>Solo una celda</td></tr>
+</table>
+<ul>
+  <li>Habitaciones: 3</li>
+  <li>Baños: 2</li>
+  <li>Sin separador</li>
+</ul>
+<div class="characteristics">2 garajes y 4 baños</div>
+</body></html>
+"""
+
+
+class FakeDriver:
+    def __init__(self, page_source, current_url):
+        self.page_source = page_source
+        self.current_url = current_url
+
+
+def _wiki_case(backend):
+    class Case(test_parser.TestWikiScraperParse):
+        def setUp(self):
+            self.scraper = WikiScraper(parser=backend)
+
+    Case.__name__ = Case.__qualname__ = (
+        f"TestWikiScraperParse_{backend.replace('.', '_')}"
+    )
+    return Case
+
+
+# Re-run the existing WikiScraper parser tests on every installed backend
+for _backend in available_backends():
+    _case = _wiki_case(_backend)
+    globals()[_case.__name__] = _case
+del _backend, _case
+
+
+class TestBackendConformance(unittest.TestCase):
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            resolve_backend("no-such-parser")
+
+    def test_default_backend_is_pure_python(self):
+        self.assertIn("html.parser", available_backends())
+        self.assertEqual(make_soup("<p>x</p>").builder.NAME, "html.parser")
+
+    def test_listing_extraction_matches_reference(self):
+        driver = FakeDriver(LISTING_HTML, "https://bogotarealestate.com.co/search?page=1")
+        reference = PropertyListScraper(driver, parser="html.parser").extract_links_and_prices()
+        self.assertEqual(len(reference), 2)
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                result = PropertyListScraper(driver, parser=backend).extract_links_and_prices()
+                self.assertEqual(result, reference)
+
+    def test_detail_extraction_matches_reference(self):
+        def parse(backend):
+            scraper = PropertyDetailScraper(None, parser=backend)
+            item = scraper.empty_item("https://example.com/1", "T", "$1")
+            item["Extraction Date"] = "fixed"
+            return scraper.parse_detail(DETAIL_HTML, item)
+
+        reference = parse("html.parser")
+        self.assertEqual(reference["Neighborhood"], "Chicó Norte")
+        self.assertEqual(reference["Garage"], "2")
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(parse(backend), reference)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import time
+import unittest
+
+from rate_limit import TokenBucket, HostRateLimiter
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_is_free_then_rate_limited(self):
+        bucket = TokenBucket(rate=20, burst=3)
+        waits = [bucket.acquire() for _ in range(5)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 0.05, delta=0.02)
+        self.assertGreater(waits[4], 0)
+
+    def test_hosts_are_limited_independently(self):
+        limiter = HostRateLimiter(rate=5, burst=1)
+        start = time.monotonic()
+        limiter.acquire('https://a.example.com/1')
+        limiter.acquire('https://b.example.com/1')
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertGreater(limiter.acquire('https://a.example.com/2'), 0.1)
+
+    def test_zero_rate_disables_limiting(self):
+        limiter = HostRateLimiter(rate=0)
+        self.assertEqual(limiter.acquire('https://a.example.com/'), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
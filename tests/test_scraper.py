@@ -2,6 +2,8 @@ import unittest
 import tempfile
 import os
 import json
+import threading
+import time
 import requests
 
 from scraper_base import Scraper
@@ -78,6 +80,49 @@ class TestScraperBase(unittest.TestCase):
         for item in ds.data:
             self.assertEqual(item, {'ok': True})
 
+    def test_run_concurrent_preserves_input_order(self):
+        class SlowScraper(Scraper):
+            def fetch_html(self, endpoint):
+                # Earlier endpoints finish last
+                time.sleep(0.01 * (5 - int(endpoint[1:])))
+                return endpoint
+
+            def parse(self, html):
+                return {'endpoint': html}
+
+        endpoints = ['/0', '/1', '/2', '/3', '/4']
+        s = SlowScraper(endpoints=endpoints, max_workers=4)
+        s.run()
+        self.assertEqual([item['endpoint'] for item in s.data], endpoints)
+
+    def test_run_concurrent_respects_per_host_limit(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        class CountingScraper(Scraper):
+            def fetch_html(self, endpoint):
+                with lock:
+                    state['active'] += 1
+                    state['peak'] = max(state['peak'], state['active'])
+                time.sleep(0.01)
+                with lock:
+                    state['active'] -= 1
+                return endpoint
+
+            def parse(self, html):
+                return {'endpoint': html}
+
+        s = CountingScraper(
+            base_url='http://example.com',
+            endpoints=[f'/{i}' for i in range(12)],
+            max_workers=6,
+            per_host_limit=2,
+            preserve_order=False,
+        )
+        s.run()
+        self.assertEqual(len(s.data), 12)
+        self.assertLessEqual(state['peak'], 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,68 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from scraper_base import Scraper
+from sinks import AppendOnlyFile, BatchSink, CsvWriter, JsonlWriter
+
+
+class TestSinks(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_batches_are_written_every_batch_size(self):
+        writer = JsonlWriter(self.path('out.jsonl'), append=False)
+        sink = BatchSink([writer], batch_size=2)
+        sink.add({'n': 1})
+        self.assertEqual(os.path.getsize(writer.path), 0)
+        sink.add({'n': 2})
+        sink.add({'n': 3})
+        with open(writer.path, encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)['n'] for line in f], [1, 2])
+        sink.close()
+        with open(writer.path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+    def test_torn_batch_is_discarded_on_reopen(self):
+        path = self.path('out.jsonl')
+        JsonlWriter(path, append=False).write_batch([{'n': 1}])
+        with open(path, 'ab') as f:
+            f.write(b'{"n": 2')  # crash in the middle of a batch
+        AppendOnlyFile(path)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '{"n": 1}\n')
+
+    def test_csv_appends_keep_header_order(self):
+        path = self.path('out.csv')
+        CsvWriter(path, append=False).write_batch([{'b': 1, 'a': 'x'}])
+        CsvWriter(path).write_batch([{'a': 'y', 'b': 2}])
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows, [['b', 'a'], ['1', 'x'], ['2', 'y']])
+
+    def test_scraper_streams_items_to_sink(self):
+        class DummyScraper(Scraper):
+            def fetch_html(self, endpoint):
+                return endpoint
+
+            def parse(self, html):
+                return {'endpoint': html}
+
+        writer = JsonlWriter(self.path('items.jsonl'), append=False)
+        s = DummyScraper(endpoints=['/a', '/b', '/c'], sink=BatchSink([writer], 2))
+        s.run()
+        self.assertEqual(s.data, [])
+        with open(writer.path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
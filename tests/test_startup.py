@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from registry import SCRAPERS, load_scraper
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cold import budget per entry point in seconds, generous for slow CI hosts
+# (measured locally: ~0.15 s for main + wiki, ~0.4 s for realestate)
+IMPORT_BUDGETS = {"main": 1.0, "wiki": 1.5, "realestate": 4.0}
+HEAVY_MODULES = ("selenium", "pandas", "webdriver_manager", "pyarrow")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.main
+from src.models.registry import load_scraper
+main_s = time.perf_counter() - start
+if sys.argv[1] != "main":
+    load_scraper(sys.argv[1])
+print(json.dumps({
+    "main_s": main_s,
+    "total_s": time.perf_counter() - start,
+    "modules": sorted(sys.modules),
+    "handlers": len(__import__("logging").getLogger().handlers),
+}))
+"""
+
+
+def probe(entry: str) -> dict:
+    """Import ``entry`` in a fresh interpreter and report what it cost."""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, entry], cwd=ROOT, check=True,
+        capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+class TestRegistry(unittest.TestCase):
+    def test_registered_scrapers_load(self):
+        self.assertEqual(list(SCRAPERS), ["wiki", "wikicrawl", "realestate"])
+        self.assertEqual(load_scraper("wiki").__name__, "WikiScraper")
+
+    def test_unknown_scraper(self):
+        with self.assertRaises(ValueError):
+            load_scraper("nope")
+
+
+class TestStartup(unittest.TestCase):
+    def test_wiki_run_skips_browser_dependencies(self):
+        result = probe("wiki")
+        loaded = {name.split(".")[0] for name in result["modules"]}
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, loaded)
+        self.assertNotIn("src.models.realestate_scraper", result["modules"])
+
+    def test_import_has_no_logging_side_effects(self):
+        self.assertEqual(probe("realestate")["handlers"], 0)
+
+    def test_import_time_budgets(self):
+        for entry in ("main", "wiki", "realestate"):
+            with self.subTest(entry=entry):
+                result = probe(entry)
+                elapsed = result["main_s"] if entry == "main" else result["total_s"]
+                self.assertLess(elapsed, IMPORT_BUDGETS[entry])
+
+
+if __name__ == "__main__":
+    unittest.main()
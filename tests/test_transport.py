@@ -0,0 +1,69 @@
+import unittest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from transport import build_session, build_retry, DEFAULT_HEADERS
+from scraper_base import Scraper
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answer 503 with Retry-After for the first request, then 200."""
+
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        if type(self).calls == 1:
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = b'<html>ok</html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+    def test_session_carries_default_headers(self):
+        session = build_session()
+        for key, value in DEFAULT_HEADERS.items():
+            self.assertEqual(session.headers[key], value)
+        self.assertIn('gzip', session.headers['Accept-Encoding'])
+
+    def test_adapter_pool_and_retry_configuration(self):
+        session = build_session(pool_maxsize=32, retries=5)
+        adapter = session.get_adapter('https://en.wikipedia.org')
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter.max_retries.total, 5)
+        self.assertIn(429, adapter.max_retries.status_forcelist)
+        self.assertTrue(adapter.max_retries.respect_retry_after_header)
+
+    def test_retry_only_idempotent_methods(self):
+        retry = build_retry()
+        self.assertIn('GET', retry.allowed_methods)
+        self.assertNotIn('POST', retry.allowed_methods)
+
+    def test_fetch_html_retries_after_503(self):
+        FlakyHandler.calls = 0
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            base = f'http://127.0.0.1:{server.server_address[1]}'
+            s = Scraper(base_url=base, backoff_factor=0)
+            self.assertEqual(s.fetch_html('/page'), '<html>ok</html>')
+            self.assertEqual(FlakyHandler.calls, 2)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from crawl_state import CrawlStateStore
+from realestate_scraper import PropertyListScraper, build_page_url_from_template
+from urls import canonicalize_url
+
+
+class TestCanonicalizeUrl(unittest.TestCase):
+    def test_variants_share_one_form(self):
+        canonical = "https://bogotarealestate.com.co/apartamento/123?a=1&b=2"
+        for variant in (
+            "https://bogotarealestate.com.co/apartamento/123?b=2&a=1",
+            "http://BogotaRealEstate.com.co/apartamento/123/?a=1&b=2",
+            "https://bogotarealestate.com.co:443/apartamento/123?a=1&utm_source=x&b=2",
+            "https://bogotarealestate.com.co/apartamento/123?gclid=abc&a=1&b=2#fotos",
+            " https://bogotarealestate.com.co/apartamento/123?fbclid=1&b=2&a=1 ",
+        ):
+            with self.subTest(variant=variant):
+                self.assertEqual(canonicalize_url(variant), canonical)
+
+    def test_root_path_and_relative_links(self):
+        self.assertEqual(canonicalize_url("https://example.com"), "https://example.com/")
+        self.assertEqual(canonicalize_url("https://example.com/?utm_medium=x"),
+                         "https://example.com/")
+        self.assertEqual(
+            canonicalize_url("../casa/7/?ref_src=tw", base="https://example.com/search/list"),
+            "https://example.com/casa/7",
+        )
+
+    def test_path_escapes_are_consistent(self):
+        self.assertEqual(
+            canonicalize_url("https://es.wikipedia.org/wiki/Bogotá"),
+            canonicalize_url("https://es.wikipedia.org/wiki/Bogot%c3%a1"),
+        )
+        # Encoded slashes are not decoded into path separators
+        self.assertIn("%2F", canonicalize_url("https://example.com/a%2fb"))
+
+
+class TestCanonicalListingUrls(unittest.TestCase):
+    def test_listing_links_are_fetched_as_linked(self):
+        html = (
+            "<div class='property-item'><a class='property-link' "
+            "href='/apartamento/1/?utm_campaign=feed'>Ver</a><h2>Uno</h2></div>"
+            "<div class='property-item'><a class='property-link' "
+            "href='http://bogotarealestate.com.co/apartamento/1#mapa'>Ver</a><h2>Uno</h2></div>"
+        )
+        props = PropertyListScraper(None).parse_listing(
+            html, "https://bogotarealestate.com.co/search?page=2"
+        )
+        self.assertEqual([prop["URL"] for prop in props], [
+            "https://bogotarealestate.com.co/apartamento/1/?utm_campaign=feed",
+            "http://bogotarealestate.com.co/apartamento/1#mapa",
+        ])
+        # Both links still dedupe to one key
+        self.assertEqual(
+            {canonicalize_url(prop["URL"]) for prop in props},
+            {"https://bogotarealestate.com.co/apartamento/1"},
+        )
+
+    def test_page_urls_keep_scheme_and_path(self):
+        self.assertEqual(
+            build_page_url_from_template(
+                "http://bogotarealestate.com.co/search/?order_by=created_at&page=1", 3
+            ),
+            "http://bogotarealestate.com.co/search/?order_by=created_at&page=3",
+        )
+
+    def test_crawl_state_keys_are_canonical(self):
+        with tempfile.TemporaryDirectory() as td:
+            state = CrawlStateStore(os.path.join(td, "state.sqlite"))
+            state.start()
+            record = {"URL": "http://bogotarealestate.com.co/casa/9/?utm_source=x"}
+            state.mark_details([record])
+            state.remember_listings([record], lambda record: "card")
+            state.flush()
+            self.assertEqual(
+                list(state.completed_urls()), ["https://bogotarealestate.com.co/casa/9"]
+            )
+            self.assertEqual(
+                state.previous_listing("https://bogotarealestate.com.co/casa/9")[1], record
+            )
+            state.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
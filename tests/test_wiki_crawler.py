@@ -0,0 +1,127 @@
+import os
+import random
+import tempfile
+import unittest
+
+from bs4 import BeautifulSoup
+
+from benchmarks.corpus import load_corpus
+from benchmarks.server import StandInServer
+from dedup import BloomFilter, SeenSet
+from frontier import Frontier
+from wiki_crawler import WikiCrawler
+from wiki_scraper import extract_links
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(10_000, 0.01)
+        for i in range(10_000):
+            bloom.add(f"https://en.wikipedia.org/wiki/A_{i}")
+        self.assertTrue(all(f"https://en.wikipedia.org/wiki/A_{i}" in bloom for i in range(10_000)))
+        false_positives = sum(f"https://en.wikipedia.org/wiki/B_{i}" in bloom for i in range(10_000))
+        self.assertLess(false_positives, 300)
+        self.assertLess(bloom.nbytes, 13_000)
+
+
+class TestSeenSet(unittest.TestCase):
+    def test_exact_across_filter_layers_and_reopen(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "seen.sqlite")
+            with SeenSet(path, capacity=100, error_rate=0.2) as seen:
+                added = [seen.add(f"/wiki/{i}") for i in range(500)]
+                self.assertTrue(all(added))
+                self.assertFalse(any(seen.add(f"/wiki/{i}") for i in range(500)))
+                self.assertEqual(len(seen), 500)
+                self.assertEqual(len(seen._filters), 5)
+            with SeenSet(path) as seen:
+                self.assertIn("/wiki/42", seen)
+                self.assertNotIn("/wiki/500", seen)
+            with SeenSet(path, fresh=True) as seen:
+                self.assertNotIn("/wiki/42", seen)
+
+
+class TestFrontier(unittest.TestCase):
+    def test_pop_order_is_exact_while_spilling(self):
+        rng = random.Random(3)
+        with tempfile.TemporaryDirectory() as td:
+            frontier = Frontier(os.path.join(td, "frontier.sqlite"), memory_limit=16, refill=4)
+            expected = []
+            popped = []
+            for i in range(400):
+                priority = rng.randint(0, 9)
+                frontier.push(f"/wiki/{i}", priority)
+                expected.append((priority, i))
+                if i % 3 == 0:
+                    popped.append(frontier.pop())
+                self.assertLessEqual(len(frontier._heap), 16)
+            while len(frontier):
+                popped.append(frontier.pop())
+            self.assertIsNone(frontier.pop())
+            frontier.close()
+
+        # Replay the same operations against an in-memory reference
+        reference, order = [], []
+        for priority, i in expected:
+            reference.append((priority, i))
+            if i % 3 == 0:
+                reference.sort()
+                order.append(reference.pop(0))
+        order.extend(sorted(reference))
+        self.assertEqual(popped, [(f"/wiki/{i}", p) for p, i in order])
+
+
+class TestWikiCrawler(unittest.TestCase):
+    def test_extract_links_stays_in_article_namespace(self):
+        html = (
+            "<div class='mw-parser-output'>"
+            "<a href='/wiki/Python_(programming_language)#History'>a</a>"
+            "<a href='/wiki/Python_(programming_language)'>b</a>"
+            "<a href='/wiki/Star_Wars:_Episode_IV'>c</a>"
+            "<a href='/wiki/File:Logo.png'>d</a><a href='/wiki/Category_talk:X'>e</a>"
+            "<a href='/wiki/User%20talk:Y'>f</a><a href='#cite'>g</a>"
+            "<a href='https://example.com/'>h</a><a href='/w/index.php?title=X'>i</a>"
+            "</div>"
+        )
+        content = BeautifulSoup(html, "html.parser").div
+        self.assertEqual(extract_links(content), [
+            "/wiki/Python_(programming_language)", "/wiki/Star_Wars:_Episode_IV",
+        ])
+
+    def test_crawl_follows_content_links_within_budget(self):
+        corpus = load_corpus({"wiki": 2, "listing": 1, "detail": 1})
+        with tempfile.TemporaryDirectory() as td, StandInServer(corpus) as server:
+            crawler = WikiCrawler(
+                base_url=server.base_url, endpoints=["/wiki/Seed"], max_depth=1,
+                max_pages=12, max_workers=3, state_folder=td, frontier_memory=32,
+            )
+            crawler.run()
+
+        self.assertEqual(crawler.pages_crawled, 12)
+        self.assertEqual(len(crawler.data), 12)
+        self.assertEqual(crawler.data[0]["url"], f"{server.base_url}/wiki/Seed")
+        self.assertEqual(crawler.data[0]["depth"], 0)
+        urls = [record["url"] for record in crawler.data]
+        self.assertEqual(len(set(urls)), 12)
+        self.assertTrue(all("/wiki/Nav_" in url for url in urls[1:]))
+        self.assertTrue(all(record["depth"] == 1 for record in crawler.data[1:]))
+        self.assertNotIn("links", crawler.data[0])
+
+    def test_crawl_parses_in_process_pool(self):
+        corpus = load_corpus({"wiki": 2, "listing": 1, "detail": 1})
+        with tempfile.TemporaryDirectory() as td, StandInServer(corpus) as server:
+            crawler = WikiCrawler(
+                base_url=server.base_url, endpoints=["/wiki/Seed"], max_depth=1,
+                max_pages=12, max_workers=3, parse_workers=2, state_folder=td,
+            )
+            crawler.run()
+
+        self.assertEqual(crawler.pages_crawled, 12)
+        urls = [record["url"] for record in crawler.data]
+        self.assertEqual(urls[0], f"{server.base_url}/wiki/Seed")
+        self.assertEqual(len(set(urls)), 12)
+        self.assertTrue(all(record["depth"] == 1 for record in crawler.data[1:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
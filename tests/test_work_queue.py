@@ -0,0 +1,179 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from benchmarks.corpus import load_corpus
+from benchmarks.server import StandInServer
+from src.main import main
+from scraper_base import Scraper
+from work_queue import WorkQueue
+
+
+def drain(path, results):
+    """Worker process: lease one item at a time and ack it."""
+    with WorkQueue(path, visibility_timeout=60) as queue:
+        while True:
+            leases = queue.lease(1)
+            if not leases:
+                return
+            results.put(leases[0].payload)
+            queue.ack(leases)
+
+
+class EchoScraper(Scraper):
+    """Fails every endpoint listed in ``failing`` once, parses the rest."""
+
+    def __init__(self, failing=(), **kwargs):
+        super().__init__(**kwargs)
+        self.failing = set(failing)
+
+    def fetch_html(self, endpoint):
+        if endpoint in self.failing:
+            self.failing.discard(endpoint)
+            return ""
+        return endpoint
+
+    def parse(self, html):
+        return {"endpoint": html}
+
+
+class SlowScraper(EchoScraper):
+    def fetch_html(self, endpoint):
+        time.sleep(0.5)
+        return endpoint
+
+
+class TestWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "queue.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_enqueue_ignores_duplicates(self):
+        with WorkQueue(self.path) as queue:
+            self.assertEqual(queue.enqueue(["/a", "/b", "/a"]), 2)
+            self.assertEqual(queue.enqueue([{"URL": "/c", "Title": "C"}, "/b"]), 1)
+            self.assertEqual(queue.stats(), {"ready": 3})
+
+    def test_leased_items_are_hidden_until_acked_or_expired(self):
+        with WorkQueue(self.path, visibility_timeout=0.2, worker_id="w1") as first, \
+                WorkQueue(self.path, visibility_timeout=0.2, worker_id="w2") as second:
+            first.enqueue(["/a", "/b"])
+            leases = first.lease(2)
+            self.assertEqual([lease.payload for lease in leases], ["/a", "/b"])
+            self.assertEqual(second.lease(2), [])
+
+            first.ack(leases[:1])
+            time.sleep(0.3)
+            # w1 "died" holding /b; its lease expired
+            retaken = second.lease(2)
+            self.assertEqual([lease.payload for lease in retaken], ["/b"])
+            self.assertEqual(retaken[0].attempts, 2)
+            # A late ack from the dead worker no longer counts
+            self.assertEqual(first.ack(leases[1:]), 0)
+            self.assertEqual(second.ack(retaken), 1)
+            self.assertEqual(first.stats(), {"done": 2})
+
+    def test_items_die_after_max_attempts(self):
+        with WorkQueue(self.path, max_attempts=2, retry_backoff=0) as queue:
+            queue.enqueue(["/a"])
+            queue.nack(queue.lease()[0], "boom")
+            queue.nack(queue.lease()[0], "boom again")
+            self.assertEqual(queue.lease(), [])
+            self.assertEqual(queue.dead(), [
+                {"payload": "/a", "error": "boom again", "attempts": 2}
+            ])
+
+    def test_nacked_items_back_off_before_retry(self):
+        with WorkQueue(self.path, retry_backoff=0.2) as queue:
+            queue.enqueue(["/a"])
+            queue.nack(queue.lease()[0], "boom")
+            self.assertEqual(queue.lease(), [])
+            time.sleep(0.25)
+            retry = queue.lease()
+            self.assertEqual([lease.attempts for lease in retry], [2])
+            # The delay doubles with each attempt
+            queue.nack(retry[0], "boom again")
+            time.sleep(0.25)
+            self.assertEqual(queue.lease(), [])
+            time.sleep(0.2)
+            self.assertEqual(len(queue.lease()), 1)
+
+    def test_processes_share_the_queue_without_double_leasing(self):
+        with WorkQueue(self.path) as queue:
+            queue.enqueue(f"/wiki/Page_{i}" for i in range(300))
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        workers = [context.Process(target=drain, args=(self.path, results)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        leased = [results.get(timeout=60) for _ in range(300)]
+        for worker in workers:
+            worker.join(timeout=60)
+        self.assertEqual(sorted(leased), sorted(f"/wiki/Page_{i}" for i in range(300)))
+        with WorkQueue(self.path) as queue:
+            self.assertEqual(queue.stats(), {"done": 300})
+
+    def test_scraper_retries_failed_endpoints(self):
+        with WorkQueue(self.path, retry_backoff=0.05) as queue:
+            queue.enqueue(["/a", "/b", "/c"])
+            scraper = EchoScraper(failing=["/b"], max_workers=2)
+            scraper.run_queue(queue)
+            self.assertEqual(
+                sorted(item["endpoint"] for item in scraper.data), ["/a", "/b", "/c"]
+            )
+            self.assertEqual(queue.stats(), {"done": 3})
+
+    def test_slow_batches_keep_their_leases(self):
+        stolen = []
+        stop = threading.Event()
+
+        def other_worker():
+            with WorkQueue(self.path, visibility_timeout=0.3, worker_id="w2") as queue:
+                while not stop.is_set() and not queue.stats().get("leased"):
+                    time.sleep(0.01)
+                while not stop.is_set():
+                    stolen.extend(queue.lease(10))
+                    time.sleep(0.05)
+
+        with WorkQueue(self.path, visibility_timeout=0.3, worker_id="w1") as queue:
+            queue.enqueue(["/a", "/b"])
+            thief = threading.Thread(target=other_worker)
+            thief.start()
+            try:
+                # The batch takes 1 s, over three visibility timeouts
+                SlowScraper(max_workers=1).run_queue(queue, lease_size=2)
+            finally:
+                stop.set()
+                thief.join()
+            self.assertEqual(stolen, [])
+            self.assertEqual(queue.stats(), {"done": 2})
+
+
+class TestQueueCli(unittest.TestCase):
+    def test_enqueue_work_and_merge(self):
+        corpus = load_corpus({"wiki": 3, "listing": 1, "detail": 1})
+        with tempfile.TemporaryDirectory() as td, StandInServer(corpus) as server:
+            urls = os.path.join(td, "urls.txt")
+            with open(urls, "w") as f:
+                f.writelines(f"{server.base_url}/wiki/Page_{i}\n" for i in range(10))
+            queue_path = os.path.join(td, "queue.sqlite")
+            output = os.path.join(td, "wiki")
+
+            main(["enqueue", "--queue", queue_path, "--urls", urls])
+            main(["enqueue", "--queue", queue_path, "--urls", urls])
+            main(["work", "wiki", "--queue", queue_path, "--output", output, "--workers", "2"])
+            main(["merge", "--output", output])
+
+            with open(output + ".jsonl", encoding="utf-8") as f:
+                self.assertEqual(len([json.loads(line) for line in f]), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()